@@ -0,0 +1,100 @@
+# Benchmark da serialização da listagem de participantes (GET /admin/participantes/listar).
+#
+# Compara o custo por linha de:
+#   - padrão: objetos ORM -> ParticipanteSchemaPrivate -> validação do response_model -> json.dumps
+#     (o mesmo caminho percorrido pelo FastAPI ao retornar um dict com modelos pydantic);
+#   - JSON_RAPIDO: linhas (tuplas nomeadas) -> dicts -> bytes (orjson ou pydantic-core).
+#
+# Uso: python benchmarks/bench_serializacao_json.py [quantidade_de_linhas ...]
+
+import json
+import sys
+import timeit
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from qrcheck.schemas.ParticipanteSchema import ParticipanteListSchemaPrivate, ParticipanteSchemaPrivate  # noqa: E402
+from qrcheck.utils import json_utils  # noqa: E402
+
+Linha = namedtuple(
+    "Linha", "id id_public nome sobrenome cpf email data_nasc ocupacao_id data_criacao"
+)
+
+adapter_resposta = TypeAdapter(ParticipanteListSchemaPrivate)
+
+
+def gera_linhas(quantidade: int) -> list:
+    base = datetime(2025, 1, 1, 10, 0, 0, 123456)
+    return [
+        Linha(
+            i, uuid.uuid4(), "Participante", f"Teste {i}", f"{i:011d}", f"participante{i}@teste.com",
+            date(1990, 1, 1), 1, base + timedelta(seconds=i),
+        )
+        for i in range(quantidade)
+    ]
+
+
+def serializa_padrao(linhas: list) -> bytes:
+    participantes = [SimpleNamespace(**linha._asdict(), necessidades_especificas=[]) for linha in linhas]
+    resposta = {
+        "total": len(linhas),
+        "page": 1,
+        "size": len(linhas),
+        "proximo_cursor": None,
+        "participantes": [
+            ParticipanteSchemaPrivate(
+                id=p.id,
+                id_public=p.id_public,
+                nome=p.nome,
+                sobrenome=p.sobrenome,
+                cpf=p.cpf,
+                email=p.email,
+                data_nasc=p.data_nasc,
+                ocupacao_id=p.ocupacao_id,
+                necessidades_especificas=p.necessidades_especificas,
+                data_criacao=p.data_criacao,
+            )
+            for p in participantes
+        ],
+    }
+    # FastAPI: valida pelo response_model, converte para tipos JSON e renderiza com json.dumps
+    conteudo = adapter_resposta.dump_python(adapter_resposta.validate_python(resposta), mode="json")
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def serializa_rapido(linhas: list) -> bytes:
+    participantes = json_utils.linhas_para_dicts(linhas)
+    for participante in participantes:
+        participante["necessidades_especificas"] = []
+    resposta = {"total": len(linhas), "page": 1, "size": len(linhas), "proximo_cursor": None}
+    return json_utils.dumps_json({**resposta, "participantes": participantes})
+
+
+def mede(funcao, linhas: list, repeticoes: int = 5) -> float:
+    numero = max(1, 20000 // len(linhas))
+    melhor = min(timeit.repeat(lambda: funcao(linhas), number=numero, repeat=repeticoes)) / numero
+    return melhor / len(linhas) * 1e6  # microssegundos por linha
+
+
+def main():
+    quantidades = [int(q) for q in sys.argv[1:]] or [100, 1000, 10000]
+    backend = "orjson" if json_utils.orjson is not None else "pydantic-core"
+    print(f"Serializador rápido: {backend}")
+    print(f"{'linhas':>8} | {'padrão (µs/linha)':>17} | {'rápido (µs/linha)':>17} | {'ganho':>6}")
+    for quantidade in quantidades:
+        linhas = gera_linhas(quantidade)
+        assert json.loads(serializa_padrao(linhas)) == json.loads(serializa_rapido(linhas))
+        padrao = mede(serializa_padrao, linhas)
+        rapido = mede(serializa_rapido, linhas)
+        print(f"{quantidade:>8} | {padrao:>17.2f} | {rapido:>17.2f} | {padrao / rapido:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Benchmark da validação de CPFs: validador individual (validar_cpf_util, um CPF por chamada)
+# x validação em lote vetorizada com NumPy (validar_cpfs_em_lote).
+#
+# Os CPFs são gerados com pontuação, metade válidos e metade com o último dígito alterado.
+# Uso: python benchmarks/bench_validacao_cpf.py [quantidade_de_cpfs ...]
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import HTTPException  # noqa: E402
+
+from qrcheck.utils.validators_utils import validar_cpf_util, validar_cpfs_em_lote  # noqa: E402
+
+
+def gera_cpfs(quantidade: int) -> list[str]:
+    aleatorio = random.Random(0)
+    cpfs = []
+    for i in range(quantidade):
+        cpf = "".join(aleatorio.choice("0123456789") for _ in range(9))
+        for peso_inicial in (10, 11):
+            soma = sum(int(d) * p for d, p in zip(cpf, range(peso_inicial, 1, -1)))
+            cpf += str(soma * 10 % 11 % 10)
+        if i % 2:
+            cpf = cpf[:-1] + str((int(cpf[-1]) + 1) % 10)
+        cpfs.append(f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}")
+    return cpfs
+
+
+def valida_individual(cpfs: list[str]) -> list[bool]:
+    resultado = []
+    for cpf in cpfs:
+        try:
+            validar_cpf_util(cpf)
+            resultado.append(True)
+        except HTTPException:
+            resultado.append(False)
+    return resultado
+
+
+def valida_em_lote(cpfs: list[str]) -> list[bool]:
+    mascara, _ = validar_cpfs_em_lote(cpfs)
+    return mascara
+
+
+def mede(funcao, cpfs: list[str], repeticoes: int = 5) -> float:
+    numero = max(1, 200000 // len(cpfs))
+    melhor = min(timeit.repeat(lambda: funcao(cpfs), number=numero, repeat=repeticoes)) / numero
+    return melhor / len(cpfs) * 1e6  # microssegundos por CPF
+
+
+def main():
+    quantidades = [int(q) for q in sys.argv[1:]] or [1000, 100000, 1000000]
+    print(f"{'CPFs':>9} | {'individual (µs/CPF)':>19} | {'lote (µs/CPF)':>13} | {'ganho':>6}")
+    for quantidade in quantidades:
+        cpfs = gera_cpfs(quantidade)
+        assert valida_individual(cpfs) == valida_em_lote(cpfs).tolist()
+        individual = mede(valida_individual, cpfs, repeticoes=3)
+        lote = mede(valida_em_lote, cpfs, repeticoes=3)
+        print(f"{quantidade:>9} | {individual:>19.3f} | {lote:>13.3f} | {individual / lote:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
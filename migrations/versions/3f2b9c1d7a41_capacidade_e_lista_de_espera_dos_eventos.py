@@ -0,0 +1,58 @@
+"""Capacidade e lista de espera dos eventos
+
+Revision ID: 3f2b9c1d7a41
+Revises: 0a50ce8d8fc8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b9c1d7a41'
+down_revision: Union[str, None] = '0a50ce8d8fc8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('eventos', sa.Column('capacidade', sa.Integer(), nullable=True))
+    op.add_column('eventos', sa.Column('vagas_ocupadas', sa.Integer(), server_default='0', nullable=False))
+
+    # Capacidade inicial: soma da capacidade dos espaços do evento (sem espaços = sem limite)
+    op.execute("""
+    UPDATE eventos SET capacidade = e.total
+    FROM (SELECT evento_id, SUM(capacidade) AS total FROM espacos GROUP BY evento_id) AS e
+    WHERE eventos.id_public = e.evento_id;
+    """)
+    # Vagas já ocupadas pelas inscrições existentes
+    op.execute("""
+    UPDATE eventos SET vagas_ocupadas = i.total
+    FROM (SELECT evento_id, COUNT(*) AS total FROM assoc_participante_evento GROUP BY evento_id) AS i
+    WHERE eventos.id = i.evento_id;
+    """)
+    # Eventos que já passaram do limite ficam com a capacidade igual às inscrições existentes
+    op.execute("UPDATE eventos SET capacidade = vagas_ocupadas WHERE capacidade < vagas_ocupadas;")
+
+    op.create_check_constraint(
+        'ck_eventos_vagas_ocupadas', 'eventos', 'capacidade IS NULL OR vagas_ocupadas <= capacidade'
+    )
+
+    op.create_table('lista_espera_evento',
+    sa.Column('participante_id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('data_entrada', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['evento_id'], ['eventos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['participante_id'], ['participantes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('participante_id', 'evento_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('lista_espera_evento')
+    op.drop_constraint('ck_eventos_vagas_ocupadas', 'eventos', type_='check')
+    op.drop_column('eventos', 'vagas_ocupadas')
+    op.drop_column('eventos', 'capacidade')
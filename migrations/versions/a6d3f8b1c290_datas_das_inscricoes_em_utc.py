@@ -0,0 +1,34 @@
+"""Datas das inscrições em UTC
+
+Revision ID: a6d3f8b1c290
+Revises: f5a9c2e7b413
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f8b1c290'
+down_revision: Union[str, None] = 'f5a9c2e7b413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# As datas de inscrição e cancelamento passam a ser gravadas em UTC (sem fuso), o mesmo relógio da
+# versão do snapshot, independente do TimeZone da sessão. As linhas já gravadas não são convertidas.
+def upgrade() -> None:
+    op.alter_column(
+        'assoc_participante_evento', 'data_inscricao', server_default=sa.text("timezone('utc', now())")
+    )
+    op.alter_column(
+        'inscricoes_canceladas_evento', 'data_cancelamento', server_default=sa.text("timezone('utc', now())")
+    )
+
+
+def downgrade() -> None:
+    op.alter_column('inscricoes_canceladas_evento', 'data_cancelamento', server_default=sa.text('now()'))
+    op.alter_column('assoc_participante_evento', 'data_inscricao', server_default=sa.text('now()'))
@@ -0,0 +1,26 @@
+"""Check-in das inscrições
+
+Revision ID: b7c4e2a9f310
+Revises: 3f2b9c1d7a41
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4e2a9f310'
+down_revision: Union[str, None] = '3f2b9c1d7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assoc_participante_evento', sa.Column('data_checkin', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('assoc_participante_evento', 'data_checkin')
@@ -0,0 +1,36 @@
+"""Inscrições canceladas dos eventos
+
+Revision ID: c3d8a1f5e927
+Revises: b7c4e2a9f310
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8a1f5e927'
+down_revision: Union[str, None] = 'b7c4e2a9f310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('inscricoes_canceladas_evento',
+    sa.Column('participante_id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('data_cancelamento', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['evento_id'], ['eventos.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['participante_id'], ['participantes.id'], ondelete='CASCADE')
+    )
+    op.create_index(
+        'ix_inscricoes_canceladas_evento_data', 'inscricoes_canceladas_evento', ['evento_id', 'data_cancelamento']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inscricoes_canceladas_evento_data', table_name='inscricoes_canceladas_evento')
+    op.drop_table('inscricoes_canceladas_evento')
@@ -0,0 +1,52 @@
+"""Índices das consultas frequentes
+
+Revision ID: d4e1b6c8a2f0
+Revises: c3d8a1f5e927
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e1b6c8a2f0'
+down_revision: Union[str, None] = 'c3d8a1f5e927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Criados com CONCURRENTLY (fora da transação da migration) para não bloquear as escritas nas tabelas
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Inscritos de um evento (a chave primária começa por participante_id)
+        op.create_index(
+            'ix_assoc_participante_evento_evento', 'assoc_participante_evento', ['evento_id', 'participante_id'],
+            postgresql_include=['data_inscricao', 'data_checkin'], postgresql_concurrently=True,
+        )
+        # Listagem de participantes do painel admin (keyset por data_criacao, id)
+        op.create_index(
+            'ix_participantes_data_criacao_id', 'participantes', ['data_criacao', 'id'],
+            postgresql_concurrently=True,
+        )
+        # Lista pública de eventos: índice parcial só com os eventos de inscrições abertas
+        op.create_index(
+            'ix_eventos_abertos_data_fim', 'eventos', ['data_fim', 'data_inicio'],
+            postgresql_where=sa.text('inscricoes_abertas'), postgresql_concurrently=True,
+        )
+        # Busca por nome no cadastro de participantes (ocupação padrão ou personalizada).
+        # necessidades_especificas.nome já tem índice (UNIQUE), usado pela busca das necessidades.
+        op.create_index(
+            'ix_ocupacoes_nome_is_custom', 'ocupacoes', ['nome', 'is_custom'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_ocupacoes_nome_is_custom', table_name='ocupacoes', postgresql_concurrently=True)
+        op.drop_index('ix_eventos_abertos_data_fim', table_name='eventos', postgresql_concurrently=True)
+        op.drop_index('ix_participantes_data_criacao_id', table_name='participantes', postgresql_concurrently=True)
+        op.drop_index('ix_assoc_participante_evento_evento', table_name='assoc_participante_evento', postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""Busca de participantes
+
+Revision ID: e8f2a7d3c915
+Revises: d4e1b6c8a2f0
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f2a7d3c915'
+down_revision: Union[str, None] = 'd4e1b6c8a2f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Índices da busca do painel admin, criados com CONCURRENTLY (fora da transação da migration)
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    with op.get_context().autocommit_block():
+        # Nome completo por busca textual (mesma expressão usada na consulta)
+        op.create_index(
+            'ix_participantes_busca_nome', 'participantes',
+            [sa.text("to_tsvector('simple', nome || ' ' || sobrenome)")],
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+        # E-mail contendo o termo (ILIKE '%termo%')
+        op.create_index(
+            'ix_participantes_email_trgm', 'participantes', ['email'],
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True,
+        )
+        # Prefixo do CPF (LIKE 'prefixo%' com qualquer collation)
+        op.create_index(
+            'ix_participantes_cpf_prefixo', 'participantes', ['cpf'],
+            postgresql_ops={'cpf': 'varchar_pattern_ops'}, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_participantes_cpf_prefixo', table_name='participantes', postgresql_concurrently=True)
+        op.drop_index('ix_participantes_email_trgm', table_name='participantes', postgresql_concurrently=True)
+        op.drop_index('ix_participantes_busca_nome', table_name='participantes', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""Idempotência das inscrições
+
+Revision ID: f5a9c2e7b413
+Revises: e8f2a7d3c915
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a9c2e7b413'
+down_revision: Union[str, None] = 'e8f2a7d3c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('inscricoes_idempotentes',
+    sa.Column('participante_id', sa.Integer(), nullable=False),
+    sa.Column('chave', sa.String(length=128), nullable=False),
+    sa.Column('id_evento', sa.UUID(), nullable=False),
+    sa.Column('resposta', sa.JSON(), nullable=True),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['participante_id'], ['participantes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('participante_id', 'chave')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inscricoes_idempotentes')
@@ -1,33 +1,53 @@
 import time
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from jwt import ExpiredSignatureError, PyJWTError, decode
-from user_agents import parse
 
-# from qrcheck.constants import ids_importantes
+from qrcheck.constants import ids_importantes
 from qrcheck.handlers.pydantic_handler import http_exception_handler, request_validation_error_handler
-from qrcheck.log_app import get_logger_acessos
+from qrcheck.log_app import (
+    encerra_logger_acessos,
+    get_logger_acessos,
+    parse_user_agent,
+    registra_acesso,
+    registro_participantes,
+)
 from qrcheck.routers import (
     AdministradoresRouter,
     AdminParticipantesRouter,
     AuthenticateRouter,
+    CheckinRouter,
     EventosRouter,
+    MetricasRouter,
     NecessidadesRouter,
     OcupacoesRouter,
     ParticipantesRouter,
 )
+from qrcheck.security import decodifica_token_requisicao
+from qrcheck.services.hash_service import servico_hash, servico_hash_importacao
 from qrcheck.settings import Settings
 
 settings = Settings()
 
 
-# carregar_ids_importantes()  # Carrega os IDs importantes do banco de dados para o cache.
+# Ciclo de vida da aplicação: executado na inicialização (antes do yield) e no encerramento (depois do yield).
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_logger_acessos()  # Configura o log de acessos (fila + gravação em lotes)
+    await ids_importantes.carregar_ids_inicializacao()  # Carrega os IDs importantes do banco de dados para o cache.
+    yield
+    servico_hash.encerrar()  # Encerra o pool de hash de senhas
+    servico_hash_importacao.encerrar()  # Encerra o pool de hash da importação em lote
+    encerra_logger_acessos()  # Grava as linhas pendentes do log de acessos
+    registro_participantes.encerrar()  # Fecha os arquivos de registro dos participantes
+
 
 app = FastAPI(
     swagger_ui_parameters={"docExpansion": "none"},  # Minimiza as seções das rotas no Swagger
+    lifespan=lifespan,
 )
 app.title = "QRCheck"
 app.version = "0.1.0"
@@ -80,9 +100,15 @@ app.include_router(NecessidadesRouter.router)
 # Rota dos eventos:
 app.include_router(EventosRouter.router)
 
+# Rotas de check-in (QR Code):
+app.include_router(CheckinRouter.router)
+
 # Rotas dos administradores:
 app.include_router(AdministradoresRouter.router)
 
+# Rotas de métricas (Admin):
+app.include_router(MetricasRouter.router)
+
 
 # Middleware para tratamento de exceções e erros de validação
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -96,7 +122,7 @@ app.add_exception_handler(RequestValidationError, request_validation_error_handl
 
 # Middleware para logar as requisições e respostas
 @app.middleware("http")
-async def log_middleware(request: Request, call_next, logger=get_logger_acessos()):
+async def log_middleware(request: Request, call_next):
     start_time = time.time()
 
     ip = request.headers.get("x-forwarded-for", request.client.host)
@@ -104,40 +130,35 @@ async def log_middleware(request: Request, call_next, logger=get_logger_acessos(
     referer = request.headers.get("referer", "")
     query = request.url.query or ""
 
-    # Define o valor padrão para o user_id
-    user_id = "Não registrado"
-    # Verifica se o token está no cookie ou no header Authorization
-    token = request.cookies.get("access_token")
-    if not token:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header[len("Bearer ") :]  # remove o 'Bearer ' e pega só o token
-    # Se o token estiver presente, decodifica-o
-    # e extrai o user_id (sub) do payload
-    if token:
-        try:
-            payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id = payload.get("sub", "Token sem sub")
-        except ExpiredSignatureError:
-            user_id = "Token expirado"
-        except PyJWTError:
-            user_id = "Token inválido"
-
-    # Verifica o user agent e extrai informações do navegador, sistema operacional e dispositivo
-    ua = parse(user_agent_string=user_agent)
-    navegador = f"{ua.browser.family} {ua.browser.version_string}"
-    sistema = f"{ua.os.family} {ua.os.version_string}"
-    dispositivo = "Mobile" if ua.is_mobile else "Tablet" if ua.is_tablet else "PC"
+    # Decodifica o token (cookie ou header Authorization) uma única vez por requisição.
+    # As claims ficam em request.state e são reaproveitadas por get_current_user.
+    decodifica_token_requisicao(request)
+    if request.state.token_payload is not None:
+        user_id = request.state.token_payload.get("sub", "Token sem sub")
+    else:
+        user_id = request.state.token_erro or "Não registrado"
+
+    # Verifica o user agent e extrai informações do navegador, sistema operacional e dispositivo (em cache)
+    navegador, sistema, dispositivo = parse_user_agent(user_agent)
 
     response = await call_next(request)
-    duration = round(time.time() - start_time, 3)
+    duration_ms = round((time.time() - start_time) * 1000, 3)
 
     # Loga o IP, ID do usuário (se tiver), método, rota, status, tempo de resposta, navegador, sistema operacional e dispositivo
-    logger.info(
-        f"IP: {ip} | User: {user_id} | Método: {request.method} | "
-        f"Rota: {request.url.path}?{query} | Status: {response.status_code} | "
-        f"Tempo: {duration}s | Navegador (User-Agent): {navegador} | SO: {sistema} | "
-        f"Dispositivo: {dispositivo} | Referer: {referer}"
-    )
+    # O formato (texto, JSON lines ou msgpack) é definido por LOG_FORMATO.
+    registra_acesso({
+        "ts": round(start_time, 6),
+        "ip": ip,
+        "user": user_id,
+        "method": request.method,
+        "path": request.url.path,
+        "query": query,
+        "status": response.status_code,
+        "duration_ms": duration_ms,
+        "ua_browser": navegador,
+        "ua_os": sistema,
+        "ua_device": dispositivo,
+        "referer": referer,
+    })
 
     return response
@@ -1,61 +1,65 @@
-# # Carrega IDs importantes do banco de dados para o cache.
-# # Isso pode ser útil para evitar consultas repetidas ao banco de dados para obter os mesmos dados.
-# # Aqui ou num módulo separado importado
-# from sqlalchemy import select
+# Carrega IDs importantes do banco de dados para o cache.
+# Isso evita consultas repetidas ao banco de dados para obter os mesmos dados
+# (ex.: a ocupação "Outra" e a necessidade "Outra(s)" em todo cadastro de participante).
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# from qrcheck.database import get_session_sync
-# from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao
+from qrcheck.database import engine_async
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao
 
+NOME_OCUPACAO_OUTRO = "Outra"
+NOME_NECESSIDADE_OUTRO = "Outra(s)"
 
-# class IdsImportantes:
-#     def __init__(self):
-#         self.ID_NECESSIDADE_OUTRO = None
-#         self.ID_OCUPACAO_OUTRO = None
 
-#     def carregar_ids(self):
-#         with get_session_sync() as session:
-#             outro_id_necessidade = session.scalar(
-#                 select(NecessidadeEspecifica.id).where(NecessidadeEspecifica.nome == "Outra(s)")  # <- corrigido aqui
-#             )
-#             if outro_id_necessidade is None:
-#                 raise RuntimeError("A necessidade 'Outro' não foi encontrada no banco de dados.")
-#             self.ID_NECESSIDADE_OUTRO = outro_id_necessidade
+class IdsImportantes:
+    def __init__(self):
+        self.ID_NECESSIDADE_OUTRO = None
+        self.ID_OCUPACAO_OUTRO = None
 
-#             outro_id_ocupacao = session.scalar(
-#                 select(Ocupacao.id).where(Ocupacao.nome == "Outra")  # <- corrigido aqui
-#             )
-#             if outro_id_ocupacao is None:
-#                 raise RuntimeError("A ocupação 'Outro' não foi encontrada no banco de dados.")
-#             self.ID_OCUPACAO_OUTRO = outro_id_ocupacao
+    # Busca os dois IDs em uma única consulta (duas subconsultas escalares).
+    # IDs não encontrados ficam como None e são buscados novamente no próximo acesso,
+    # assim um catálogo populado depois da inicialização é percebido sem reiniciar a aplicação.
+    async def carregar_ids(self, session: AsyncSession):
+        id_necessidade = (
+            select(NecessidadeEspecifica.id)
+            .where(NecessidadeEspecifica.nome == NOME_NECESSIDADE_OUTRO, NecessidadeEspecifica.is_custom == False)  # noqa: E712
+            .scalar_subquery()
+        )
+        id_ocupacao = (
+            select(Ocupacao.id)
+            .where(Ocupacao.nome == NOME_OCUPACAO_OUTRO, Ocupacao.is_custom == False)  # noqa: E712
+            .limit(1)
+            .scalar_subquery()
+        )
+        resultado = (await session.execute(select(id_necessidade, id_ocupacao))).one()
+        self.ID_NECESSIDADE_OUTRO, self.ID_OCUPACAO_OUTRO = resultado
 
+    # Carregamento na inicialização da aplicação (lifespan).
+    # Se o banco não estiver acessível, a aplicação sobe mesmo assim e os IDs são carregados sob demanda.
+    async def carregar_ids_inicializacao(self):
+        try:
+            async with AsyncSession(engine_async) as session:
+                await self.carregar_ids(session)
+        except (SQLAlchemyError, OSError) as erro:
+            logger.warning(f"Não foi possível carregar os IDs importantes na inicialização: {erro}")
 
-# # Criando uma instância global
-# ids_importantes = IdsImportantes()
+    async def get_id_ocupacao_outro(self, session: AsyncSession):
+        if self.ID_OCUPACAO_OUTRO is None:
+            await self.carregar_ids(session)
+        return self.ID_OCUPACAO_OUTRO
 
-# # Inicializando os IDs na inicialização da aplicação
-# ids_importantes.carregar_ids()
+    async def get_id_necessidade_outro(self, session: AsyncSession):
+        if self.ID_NECESSIDADE_OUTRO is None:
+            await self.carregar_ids(session)
+        return self.ID_NECESSIDADE_OUTRO
 
+    # Deve ser chamado sempre que ocupações ou necessidades forem alteradas/excluídas.
+    def invalidar(self):
+        self.ID_NECESSIDADE_OUTRO = None
+        self.ID_OCUPACAO_OUTRO = None
 
-# # CÓDIGO ANTERIOR #####
-# # ID_NECESSIDADE_OUTRO = None
-# # ID_OCUPACAO_OUTRO = None
 
-
-# # def carregar_ids_importantes():
-# #     with get_session_sync() as session:  # Use uma sessão síncrona
-# #         outro_id_necessidade = session.scalar(
-# #             select(NecessidadeEspecifica.id).where(NecessidadeEspecifica.nome == "Outro")
-# #         )
-# #         if outro_id_necessidade is None:
-# #             raise RuntimeError("A necessidade 'Outro' não foi encontrada no banco de dados.")
-
-# #         outro_id_ocupacao = session.scalar(
-# #             select(NecessidadeEspecifica.id).where(NecessidadeEspecifica.nome == "Outro")
-# #         )
-# #         if outro_id_ocupacao is None:
-# #             raise RuntimeError("A ocupação 'Outro' não foi encontrada no banco de dados.")
-
-# #         return outro_id_necessidade, outro_id_ocupacao
-
-# # # Chamando a função no ambiente síncrono
-# # ID_NECESSIDADE_OUTRO, ID_OCUPACAO_OUTRO = carregar_ids_importantes()
+# Criando uma instância global
+ids_importantes = IdsImportantes()
@@ -1,17 +1,24 @@
+import time
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from qrcheck.settings import Settings
+from qrcheck.utils.cache_utils import CacheTTL
+
+settings = Settings()
 
 # ALTERAÇÃO FEITA: Antes a conexão (Session) com o banco de dados era feita de forma síncrona,
 # o que poderia causar problemas de desempenho em aplicações assíncronas.
 # Agora, a conexão é feita de forma assíncrona, permitindo melhor desempenho e escalabilidade.
 
 # Criação da engine síncrona para operações de banco de dados (migration do Alembic).
-engine_sync = create_engine(Settings().DATABASE_URL_SYNC)
+engine_sync = create_engine(settings.DATABASE_URL_SYNC)
 
 
 @contextmanager
@@ -20,13 +27,129 @@ def get_session_sync():
         yield session
 
 
+# Métricas de espera por conexão no pool (tempo para obter uma conexão e timeouts).
+class MetricasPool:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    def registra_espera(self, espera: float):
+        self.checkouts += 1
+        self.espera_total += espera
+        self.espera_max = max(self.espera_max, espera)
+
+    def to_dict(self):
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "espera_media_ms": round(self.espera_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "espera_max_ms": round(self.espera_max * 1000, 3),
+        }
+
+
+# Pool da engine assíncrona que mede quanto tempo cada requisição espera por uma conexão
+# (fila do pool + abertura de novas conexões) e quantas vezes o pool_timeout estourou.
+class PoolComMetricas(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metricas = MetricasPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            self.metricas.timeouts += 1
+            raise
+        self.metricas.registra_espera(time.perf_counter() - inicio)
+        return conexao
+
+
+# Opções da engine assíncrona a partir das configurações (Settings).
+def opcoes_engine_async(url: str) -> dict:
+    opcoes = {
+        "echo": settings.DB_ECHO,
+        "poolclass": PoolComMetricas,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        opcoes["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return opcoes
+
+
 # Criação da engine assíncrona para operações de banco de dados (FastAPI).
 # A engine assíncrona permite que o FastAPI trabalhe de forma não bloqueante com o banco de dados.
-# LEMBRAR: Tornar echo=False em produção para evitar logs excessivos.
-# Criação do AsyncEngine
-engine_async = create_async_engine(Settings().DATABASE_URL_ASYNC)
+# O tamanho do pool, timeouts, recycle, pre-ping e o cache de statements são configuráveis pelo .env.
+engine_async = create_async_engine(settings.DATABASE_URL_ASYNC, **opcoes_engine_async(settings.DATABASE_URL_ASYNC))
+
+# Engine da réplica somente leitura. Sem DATABASE_URL_ASYNC_LEITURA, é a própria engine primária.
+if settings.DATABASE_URL_ASYNC_LEITURA:
+    engine_leitura = create_async_engine(
+        settings.DATABASE_URL_ASYNC_LEITURA, **opcoes_engine_async(settings.DATABASE_URL_ASYNC_LEITURA)
+    )
+else:
+    engine_leitura = engine_async
+
+# Clientes que escreveram no primário recentemente (read-your-writes).
+# Enquanto a chave não expira, as leituras desse cliente também vão para o primário,
+# evitando que ele deixe de ver a própria escrita por causa do atraso de replicação.
+escritas_recentes = CacheTTL(max_itens=10000, ttl_segundos=settings.DB_LEITURA_STICKY_SEGUNDOS)
 
 
-async def get_session_async():
+# Identifica o cliente da requisição: o usuário do token (decodificado pelo middleware) ou o IP.
+def chave_cliente(request: Request) -> str | None:
+    payload = getattr(request.state, "token_payload", None)
+    if payload and payload.get("sub"):
+        return f"user:{payload['sub']}"
+    return f"ip:{request.client.host}" if request.client else None
+
+
+def _usa_sticky(request: Request | None) -> bool:
+    return engine_leitura is not engine_async and settings.DB_LEITURA_STICKY_SEGUNDOS > 0 and request is not None
+
+
+# Sessão de escrita (banco primário).
+async def get_session_async(request: Request = None):
     async with AsyncSession(engine_async, expire_on_commit=False) as session:
+        if _usa_sticky(request) and (chave := chave_cliente(request)):
+            # Marca o cliente assim que a transação é confirmada no primário
+            event.listen(session.sync_session, "after_commit", lambda _: escritas_recentes.set(chave, True))
         yield session
+
+
+# Sessão somente leitura (réplica, se configurada).
+# Clientes que acabaram de escrever continuam lendo do primário durante DB_LEITURA_STICKY_SEGUNDOS.
+async def get_session_leitura_async(request: Request = None):
+    engine = engine_leitura
+    if _usa_sticky(request) and escritas_recentes.get(chave_cliente(request)):
+        engine = engine_async
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+# Estatísticas atuais do pool de uma engine (conexões em uso, livres, overflow e espera).
+def get_estatisticas_pool(engine) -> dict:
+    pool = engine.pool
+    return {
+        "tamanho": pool.size(),
+        "em_uso": pool.checkedout(),
+        "livres": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),  # Negativo enquanto o pool ainda não está cheio
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout": settings.DB_POOL_TIMEOUT,
+        **(pool.metricas.to_dict() if isinstance(pool, PoolComMetricas) else {}),
+    }
+
+
+# Estatísticas dos pools da engine primária e da réplica de leitura (None quando não há réplica).
+def get_estatisticas_pools() -> dict:
+    return {
+        "primario": get_estatisticas_pool(engine_async),
+        "leitura": get_estatisticas_pool(engine_leitura) if engine_leitura is not engine_async else None,
+    }
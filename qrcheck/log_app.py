@@ -1,6 +1,25 @@
+import json
 import os
+import queue
+import struct
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
 
 from loguru import logger
+from user_agents import parse
+
+from qrcheck.settings import Settings
+
+# Dependência opcional: necessária apenas com LOG_FORMATO="msgpack"
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+settings = Settings()
 
 # from qrcheck.handlers.postgresql_handler import get_postgresql_error_message
 
@@ -8,7 +27,152 @@ from loguru import logger
 # logger.add("logs/eventos/{evento.id}/evento_log", rotation="10 MB", level="INFO")
 
 
+# Marcador usado para pedir ao escritor que grave o que falta e encerre
+_FIM = object()
+
+
+# Escritor de log assíncrono: as linhas são colocadas em uma fila limitada em memória
+# e gravadas em lotes por uma thread em segundo plano, fora do caminho da requisição.
+# O lote é gravado quando atinge tamanho_lote linhas ou a cada intervalo_flush segundos.
+# Com a fila cheia a linha é descartada (e contada): o sink roda dentro do event loop (middleware),
+# então esperar por espaço na fila travaria todas as requisições.
+# O arquivo é rotacionado na virada do dia (acessos.log -> acessos.<data_hora>.log).
+# Com binario=True as mensagens são bytes e o arquivo é aberto em modo binário.
+class EscritorLogAssincrono:
+    def __init__(
+        self,
+        caminho: str,
+        max_fila: int = 10000,
+        tamanho_lote: int = 256,
+        intervalo_flush: float = 1.0,
+        binario: bool = False,
+    ):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_flush = intervalo_flush
+        self.binario = binario
+        self.escritas = 0
+        self.descartadas = 0
+        self.lotes = 0
+        self._fila = queue.Queue(maxsize=max_fila)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._arquivo = None
+        self._data_arquivo = None
+
+    # Sink do loguru: apenas enfileira a linha já formatada (não toca no disco)
+    def escreve(self, mensagem):
+        self._garante_thread()
+        if not self.binario:
+            mensagem = str(mensagem)
+        try:
+            self._fila.put_nowait(mensagem)
+        except queue.Full:
+            self.descartadas += 1
+
+    # A thread é (re)iniciada no primeiro uso, inclusive depois de um encerrar()
+    def _garante_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._executa, name="escritor-log", daemon=True)
+                    self._thread.start()
+
+    def _executa(self):
+        lote = []
+        ultimo_flush = time.monotonic()
+        while True:
+            espera = max(0.0, self.intervalo_flush - (time.monotonic() - ultimo_flush))
+            try:
+                linha = self._fila.get(timeout=espera)
+            except queue.Empty:
+                linha = None
+
+            if linha is _FIM:
+                self._grava(lote)
+                self._fecha_arquivo()
+                return
+            if linha is not None:
+                lote.append(linha)
+
+            if len(lote) >= self.tamanho_lote or time.monotonic() - ultimo_flush >= self.intervalo_flush:
+                self._grava(lote)
+                lote = []
+                ultimo_flush = time.monotonic()
+
+    def _grava(self, lote):
+        if not lote:
+            return
+        try:
+            self._rotaciona_se_necessario()
+            self._arquivo.write((b"" if self.binario else "").join(lote))
+            self._arquivo.flush()
+            self.escritas += len(lote)
+            self.lotes += 1
+        except OSError:
+            self.descartadas += len(lote)
+            self._fecha_arquivo()
+
+    def _rotaciona_se_necessario(self):
+        hoje = date.today()
+        if self._arquivo is None:
+            if os.path.exists(self.caminho):
+                self._data_arquivo = date.fromtimestamp(os.path.getmtime(self.caminho))
+            else:
+                self._data_arquivo = hoje
+            self._arquivo = self._abre_arquivo()
+
+        if self._data_arquivo != hoje:
+            self._fecha_arquivo()
+            base, extensao = os.path.splitext(self.caminho)
+            os.replace(self.caminho, f"{base}.{datetime.now():%Y-%m-%d_%H-%M-%S_%f}{extensao}")
+            self._data_arquivo = hoje
+            self._arquivo = self._abre_arquivo()
+
+    def _abre_arquivo(self):
+        if self.binario:
+            return open(self.caminho, "ab")  # noqa: SIM115
+        return open(self.caminho, "a", encoding="utf-8")  # noqa: SIM115
+
+    def _fecha_arquivo(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    # Grava tudo o que está na fila e encerra a thread (chamado no encerramento da aplicação)
+    def encerrar(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._fila.put(_FIM)
+            self._thread.join()
+        self._thread = None
+
+    def get_metricas(self):
+        return {
+            "fila": self._fila.qsize(),
+            "max_fila": self._fila.maxsize,
+            "escritas": self.escritas,
+            "descartadas": self.descartadas,
+            "lotes": self.lotes,
+        }
+
+
+escritor_acessos = None
+escritor_estruturado = None
+
+
+def _cria_escritor(caminho, binario=False):
+    return EscritorLogAssincrono(
+        caminho,
+        max_fila=settings.LOG_MAX_FILA,
+        tamanho_lote=settings.LOG_TAMANHO_LOTE,
+        intervalo_flush=settings.LOG_INTERVALO_FLUSH,
+        binario=binario,
+    )
+
+
 def get_logger_acessos():
+    global escritor_acessos, escritor_estruturado  # noqa: PLW0603
+
     # Define o caminho para o diretório de logs do sistema
     # e cria o diretório se ele não existir
     log_dir = "logs/acessos"
@@ -21,30 +185,155 @@ def get_logger_acessos():
 
     # Remove qualquer configuração anterior (evita logs duplicados)
     logger.remove()
+    encerra_logger_acessos()
 
-    # Adiciona um novo destino de log com rotação
-    logger.add(log_file, rotation="1 day", level="INFO")
+    # Adiciona um novo destino de log assíncrono (fila + gravação em lotes, com rotação diária)
+    escritor_acessos = _cria_escritor(log_file)
+    logger.add(escritor_acessos.escreve, level="INFO")
+
+    # Formatos estruturados: os registros de acesso vão para um arquivo próprio (acessos.jsonl ou acessos.msgpack)
+    # e o acessos.log continua recebendo as demais mensagens da aplicação.
+    escritor_estruturado = None
+    if settings.LOG_FORMATO == "json":
+        escritor_estruturado = _cria_escritor(os.path.join(log_dir, "acessos.jsonl"))
+    elif settings.LOG_FORMATO == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("LOG_FORMATO='msgpack' requer o pacote 'msgpack' instalado.")
+        escritor_estruturado = _cria_escritor(os.path.join(log_dir, "acessos.msgpack"), binario=True)
 
     return logger
 
 
-def get_logger_participante(participante_id):
-    # Define o caminho para o diretório de logs dos participantes
-    log_dir = "logs/participantes"
+# Grava as linhas pendentes do log de acessos (chamado no encerramento da aplicação)
+def encerra_logger_acessos():
+    for escritor in (escritor_acessos, escritor_estruturado):
+        if escritor is not None:
+            escritor.encerrar()
 
-    # Cria o diretório se ele não existir
-    os.makedirs(log_dir, exist_ok=True)
 
-    # Define o caminho do arquivo de log
-    log_file = os.path.join(log_dir, f"participante_{participante_id}_registry.log")
+# Serializa um registro de acesso como uma linha JSON (JSON lines)
+def serializa_registro_json(registro: dict) -> str:
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
 
-    # Remove qualquer configuração anterior (evita logs duplicados)
-    logger.remove()
 
-    # Adiciona um novo destino de log com rotação
-    logger.add(log_file, level="INFO")
+# Serializa um registro de acesso em msgpack, prefixado pelo tamanho (4 bytes, big-endian)
+def serializa_registro_msgpack(registro: dict) -> bytes:
+    dados = msgpack.packb(registro, use_bin_type=True)
+    return struct.pack(">I", len(dados)) + dados
 
-    return logger
+
+_TAMANHO_PREFIXO = struct.calcsize(">I")
+
+
+# Lê um arquivo de registros msgpack prefixados pelo tamanho (para análises offline e o coletor de logs).
+# Um último registro incompleto (processo encerrado no meio da gravação) é ignorado.
+def le_registros_msgpack(caminho: str):
+    with open(caminho, "rb") as arquivo:
+        while len(cabecalho := arquivo.read(_TAMANHO_PREFIXO)) == _TAMANHO_PREFIXO:
+            (tamanho,) = struct.unpack(">I", cabecalho)
+            dados = arquivo.read(tamanho)
+            if len(dados) < tamanho:
+                return
+            yield msgpack.unpackb(dados, raw=False)
+
+
+# Registra um acesso no formato configurado em LOG_FORMATO.
+# registro: ts, ip, user, method, path, query, status, duration_ms, ua_browser, ua_os, ua_device, referer
+def registra_acesso(registro: dict):
+    if escritor_estruturado is not None:
+        if escritor_estruturado.binario:
+            escritor_estruturado.escreve(serializa_registro_msgpack(registro))
+        else:
+            escritor_estruturado.escreve(serializa_registro_json(registro))
+        return
+
+    # Formato texto (padrão). depth=1 mantém o middleware como origem da mensagem no log.
+    logger.opt(depth=1).info(
+        f"IP: {registro['ip']} | User: {registro['user']} | Método: {registro['method']} | "
+        f"Rota: {registro['path']}?{registro['query']} | Status: {registro['status']} | "
+        f"Tempo: {round(registro['duration_ms'] / 1000, 3)}s | Navegador (User-Agent): {registro['ua_browser']} | "
+        f"SO: {registro['ua_os']} | Dispositivo: {registro['ua_device']} | Referer: {registro['referer']}"
+    )
+
+
+# Extrai navegador, sistema operacional e dispositivo do User-Agent.
+# O parse é uma cascata de expressões regulares (caro), mas a quantidade de User-Agents distintos é pequena
+# comparada ao volume de requisições, então o resultado é memorizado em um cache LRU limitado.
+# Hits/misses: parse_user_agent.cache_info()
+@lru_cache(maxsize=2048)
+def parse_user_agent(user_agent: str) -> tuple[str, str, str]:
+    ua = parse(user_agent_string=user_agent)
+    navegador = f"{ua.browser.family} {ua.browser.version_string}"
+    sistema = f"{ua.os.family} {ua.os.version_string}"
+    dispositivo = "Mobile" if ua.is_mobile else "Tablet" if ua.is_tablet else "PC"
+    return navegador, sistema, dispositivo
+
+
+# Registro (auditoria) por participante: um arquivo participante_{id}_registry.log para cada participante.
+# Os arquivos abertos ficam em um cache LRU limitado (max_arquivos), então escrever não custa mais
+# um open() nem a troca de sinks do loguru a cada chamada, e o sink global do log de acessos não é afetado.
+# O lock garante que requisições concorrentes não intercalem nem fechem o arquivo umas das outras.
+class RegistroParticipantes:
+    def __init__(self, log_dir: str = "logs/participantes", max_arquivos: int = 256):
+        self.log_dir = log_dir
+        self.max_arquivos = max_arquivos
+        self._arquivos: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_arquivo(self, participante_id):
+        arquivo = self._arquivos.get(participante_id)
+        if arquivo is not None:
+            self._arquivos.move_to_end(participante_id)
+            return arquivo
+
+        # Cria o diretório se ele não existir
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_file = os.path.join(self.log_dir, f"participante_{participante_id}_registry.log")
+        arquivo = open(log_file, "a", encoding="utf-8")  # noqa: SIM115
+        self._arquivos[participante_id] = arquivo
+
+        # Fecha o arquivo usado há mais tempo quando o limite é atingido
+        while len(self._arquivos) > self.max_arquivos:
+            _, antigo = self._arquivos.popitem(last=False)
+            antigo.close()
+        return arquivo
+
+    def registra(self, participante_id, mensagem: str, nivel: str = "INFO"):
+        linha = f"{datetime.now():%Y-%m-%d %H:%M:%S.%f}"[:-3] + f" | {nivel:<8} | {mensagem}\n"
+        with self._lock:
+            arquivo = self._get_arquivo(participante_id)
+            arquivo.write(linha)
+            arquivo.flush()
+
+    def encerrar(self):
+        with self._lock:
+            for arquivo in self._arquivos.values():
+                arquivo.close()
+            self._arquivos.clear()
+
+
+# Logger de um participante (mesma interface básica do loguru: info/warning/error)
+class LoggerParticipante:
+    def __init__(self, registro: RegistroParticipantes, participante_id):
+        self.registro = registro
+        self.participante_id = participante_id
+
+    def info(self, mensagem: str):
+        self.registro.registra(self.participante_id, mensagem, "INFO")
+
+    def warning(self, mensagem: str):
+        self.registro.registra(self.participante_id, mensagem, "WARNING")
+
+    def error(self, mensagem: str):
+        self.registro.registra(self.participante_id, mensagem, "ERROR")
+
+
+# Criando uma instância global
+registro_participantes = RegistroParticipantes()
+
+
+def get_logger_participante(participante_id):
+    return LoggerParticipante(registro_participantes, participante_id)
 
 
 # # Função para logar erro de banco de dados (geral)
@@ -1,30 +1,96 @@
 from datetime import date
 
 from sqlalchemy import (
+    JSON,
     Boolean,
+    CheckConstraint,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Sequence,
     String,
     Table,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 # Import do Registry para mapeamento
 from qrcheck.models.EntityModels import table_registry
 
+
+# Horário atual do banco em UTC, sem fuso. As datas das inscrições são comparadas com horários enviados
+# pelos leitores (check-in offline, versão do snapshot): com now() elas ficariam no fuso da sessão do banco.
+class agora_utc(FunctionElement):
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(agora_utc, "postgresql")
+def _agora_utc_postgresql(elemento, compilador, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(agora_utc)
+def _agora_utc(elemento, compilador, **kw):
+    return "CURRENT_TIMESTAMP"  # SQLite: já em UTC
+
+
 # Tabela de associação entre Participante e Evento
 assoc_participante_evento = Table(
     "assoc_participante_evento",
     table_registry.metadata,
     Column("participante_id", Integer, ForeignKey("participantes.id", ondelete="CASCADE"), primary_key=True),
     Column("evento_id", Integer, ForeignKey("eventos.id", ondelete="CASCADE"), primary_key=True),
-    Column("data_inscricao", DateTime, server_default=func.now(), nullable=False),
+    Column("data_inscricao", DateTime, server_default=agora_utc(), nullable=False),  # UTC
+    Column("data_checkin", DateTime, nullable=True),  # Presença registrada na entrada do evento (QR Code, UTC)
+    # A chave primária começa por participante_id: as consultas de inscritos de um evento usam este índice
+    # (no PostgreSQL inclui as datas, permitindo index-only scan no check-in e no snapshot)
+    Index(
+        "ix_assoc_participante_evento_evento",
+        "evento_id",
+        "participante_id",
+        postgresql_include=["data_inscricao", "data_checkin"],
+    ),
+)
+
+# Lista de espera dos eventos lotados (ordem de chegada por data_entrada)
+lista_espera_evento = Table(
+    "lista_espera_evento",
+    table_registry.metadata,
+    Column("participante_id", Integer, ForeignKey("participantes.id", ondelete="CASCADE"), primary_key=True),
+    Column("evento_id", Integer, ForeignKey("eventos.id", ondelete="CASCADE"), primary_key=True),
+    Column("data_entrada", DateTime, server_default=func.now(), nullable=False),
+)
+
+# Inscrições canceladas (usadas pelo snapshot incremental dos leitores de QR Code para remover
+# participantes que já tinham sido baixados). Uma linha por cancelamento, sem chave primária.
+inscricoes_canceladas_evento = Table(
+    "inscricoes_canceladas_evento",
+    table_registry.metadata,
+    Column("participante_id", Integer, ForeignKey("participantes.id", ondelete="CASCADE"), nullable=False),
+    Column("evento_id", Integer, ForeignKey("eventos.id", ondelete="CASCADE"), nullable=False),
+    Column("data_cancelamento", DateTime, server_default=agora_utc(), nullable=False),  # UTC
+    Index("ix_inscricoes_canceladas_evento_data", "evento_id", "data_cancelamento"),
+)
+
+# Respostas das inscrições enviadas com Idempotency-Key, por participante e chave. Ficam no banco
+# (e não na memória do processo) para que o reenvio receba a mesma resposta em qualquer worker.
+# resposta NULL = primeira tentativa em andamento; expira_em é gravado pela aplicação (UTC).
+inscricoes_idempotentes = Table(
+    "inscricoes_idempotentes",
+    table_registry.metadata,
+    Column("participante_id", Integer, ForeignKey("participantes.id", ondelete="CASCADE"), primary_key=True),
+    Column("chave", String(128), primary_key=True),
+    Column("id_evento", UUID(as_uuid=True), nullable=False),
+    Column("resposta", JSON, nullable=True),
+    Column("expira_em", DateTime, nullable=False),
 )
 
 # Definindo a sequência de maneira explícita
@@ -55,6 +121,23 @@ class Evento:
 
     inscricoes_abertas: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
+    # Limite de inscrições (None = sem limite) e contador de vagas ocupadas.
+    # O contador é atualizado com um UPDATE condicional atômico (ver inscricao_service).
+    capacidade: Mapped[int | None] = mapped_column(Integer, nullable=True, default=None)
+    vagas_ocupadas: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        CheckConstraint("capacidade IS NULL OR vagas_ocupadas <= capacidade", name="ck_eventos_vagas_ocupadas"),
+        # Lista pública (inscrições abertas e data_fim >= hoje): índice parcial só com os eventos abertos
+        Index(
+            "ix_eventos_abertos_data_fim",
+            "data_fim",
+            "data_inicio",
+            postgresql_where=text("inscricoes_abertas"),
+            sqlite_where=text("inscricoes_abertas IS 1"),
+        ),
+    )
+
 
 @table_registry.mapped_as_dataclass
 class Endereco:
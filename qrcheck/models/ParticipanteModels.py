@@ -7,11 +7,13 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Sequence,
     String,
     Table,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -28,6 +30,10 @@ assoc_participante_necessidade = Table(
     Column("necessidade_especifica_id", Integer, ForeignKey("necessidades_especificas.id"), primary_key=True),
 )
 
+# Documento de busca textual do nome completo (PostgreSQL). A busca usa exatamente esta expressão,
+# para que o planner use o índice GIN ix_participantes_busca_nome.
+DOCUMENTO_BUSCA_NOME = "to_tsvector('simple', nome || ' ' || sobrenome)"
+
 # Definindo a sequência de maneira explícita
 id_public_seq = Sequence("id_public_seq", start=0, increment=1, schema="public")
 
@@ -56,6 +62,22 @@ class Participante:
     # Corrigido: relação 0:N com Evento
     eventos = relationship("Evento", secondary=assoc_participante_evento, back_populates="participantes")
 
+    __table_args__ = (
+        # Ordenação da listagem de participantes do painel admin (keyset por data_criacao, id)
+        Index("ix_participantes_data_criacao_id", "data_criacao", "id"),
+        # Busca do painel admin (somente PostgreSQL): nome por texto, e-mail por trigramas (pg_trgm)
+        # e CPF por prefixo (varchar_pattern_ops permite LIKE 'prefixo%' com qualquer collation)
+        Index("ix_participantes_busca_nome", text(DOCUMENTO_BUSCA_NOME), postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        Index(
+            "ix_participantes_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_participantes_cpf_prefixo", "cpf", postgresql_ops={"cpf": "varchar_pattern_ops"}).ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
 
 @table_registry.mapped_as_dataclass
 class Ocupacao:
@@ -68,6 +90,9 @@ class Ocupacao:
     # Corrigido: relação com Participante
     participantes = relationship("Participante", back_populates="ocupacao")
 
+    # Busca por nome no cadastro (ocupação padrão ou personalizada)
+    __table_args__ = (Index("ix_ocupacoes_nome_is_custom", "nome", "is_custom"),)
+
 
 @table_registry.mapped_as_dataclass
 class NecessidadeEspecifica:
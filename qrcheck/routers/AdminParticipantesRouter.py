@@ -1,60 +1,151 @@
+import uuid
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from qrcheck.database import get_session_async
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.AdministradorModels import Administrador
-from qrcheck.models.ParticipanteModels import Participante
+from qrcheck.models.ParticipanteModels import Participante, assoc_participante_necessidade
 from qrcheck.schemas.ParticipanteSchema import (
+    ParticipanteBuscaSchemaPrivate,
     ParticipanteListSchemaPrivate,
     ParticipanteSchemaCreate,
     ParticipanteSchemaPrivate,
     ParticipanteSchemaPublic,
 )
 from qrcheck.security import (
+    T_Admin,
     get_current_user,
+    invalida_principal,
 )
+from qrcheck.services.busca_participante_service import buscar_participantes
+from qrcheck.services.exportacao_service import FORMATO_CSV, TIPOS_CONTEUDO, exporta_inscritos
+from qrcheck.services.importacao_service import formato_importacao, importa_participantes
 from qrcheck.services.participante_service import (
     criar_participante,
 )
+from qrcheck.settings import Settings
+from qrcheck.utils.json_utils import linhas_para_dicts, resposta_json_rapida
+from qrcheck.utils.paginacao_utils import codificar_cursor, decodificar_cursor
+
+settings = Settings()
 
 router = APIRouter(prefix="/admin/participantes", tags=["👶 Participantes [Admin]"])
 
 
 # Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.  # noqa: E501
 T_Session = Annotated[AsyncSession, Depends(get_session_async)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
 T_CurrentParticipante = Annotated[Participante, Depends(get_current_user)]
 T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
 
+TAMANHO_MAXIMO_PAGINA = 100
+
+# Colunas da listagem no modo JSON_RAPIDO (mesmos campos do ParticipanteSchemaPrivate)
+COLUNAS_LISTAGEM = (
+    Participante.id,
+    Participante.id_public,
+    Participante.nome,
+    Participante.sobrenome,
+    Participante.cpf,
+    Participante.email,
+    Participante.data_nasc,
+    Participante.ocupacao_id,
+    Participante.data_criacao,
+)
+
+
+# IDs das necessidades específicas de cada participante da página (uma única consulta).
+async def carrega_necessidades_por_participante(session: AsyncSession, ids: list[int]) -> dict[int, list[int]]:
+    result = await session.execute(
+        select(
+            assoc_participante_necessidade.c.participante_id,
+            assoc_participante_necessidade.c.necessidade_especifica_id,
+        ).where(assoc_participante_necessidade.c.participante_id.in_(ids))
+    )
+    necessidades: dict[int, list[int]] = {}
+    for participante_id, necessidade_id in result.all():
+        necessidades.setdefault(participante_id, []).append(necessidade_id)
+    return necessidades
+
 # - ADMIN - #####################################################
 
 
-# Criado o GET (Perfil) de participante pro Admin.
-# Essa página permite o admin acessar as informações de um participante.
-@router.get(
-    "/{id_participante}",
-    status_code=HTTPStatus.OK,
-    response_model=ParticipanteSchemaPublic,
-    tags=["👶 Participantes [Admin]"],
-)
-async def acessa_perfil_participante(id_participante: int, session: T_Session, current_admin= T_CurrentAdmin):
+# Criado o GET (LISTAR) de todos os participantes.
+# Essa página permite o admin acessar as informações de todos os participantes.
+# A paginação é feita no banco (LIMIT/OFFSET) e, para páginas profundas, pode ser usado o
+# modo cursor (keyset) ordenado por (data_criacao, id), que mantém o custo constante por página.
+# O total é uma consulta separada (COUNT) e pode ser desligado com incluir_total=false.
+@router.get("/listar", status_code=HTTPStatus.OK, response_model=ParticipanteListSchemaPrivate, tags=["👶 Participantes [Admin]"])
+async def lista_participantes_admin(  # noqa: PLR0913, PLR0917
+    current_admin: T_CurrentAdmin,
+    session: T_ReadSession,
+    page: Annotated[int, Query(ge=1)] = 1,
+    size: Annotated[int, Query(ge=1, le=TAMANHO_MAXIMO_PAGINA)] = 20,
+    cursor: str | None = None,
+    incluir_total: bool = True,
+):
+    # Modo JSON_RAPIDO: seleciona só as colunas da resposta (tuplas), sem carregar os objetos ORM
+    if settings.JSON_RAPIDO:
+        query = select(*COLUNAS_LISTAGEM)
+    else:
+        query = select(Participante).options(selectinload(Participante.necessidades_especificas))
+    query = query.order_by(Participante.data_criacao.desc(), Participante.id.desc())
 
-    participante = await session.scalar(
-    select(Participante)
-    .where(Participante.id == id_participante)
-    .options(selectinload(Participante.necessidades_especificas))
-)
-    if not participante:
+    # Modo cursor: busca as linhas "depois" da última linha da página anterior
+    if cursor:
+        cursor_data_criacao, cursor_id = decodificar_cursor(cursor)
+        query = query.where(
+            tuple_(Participante.data_criacao, Participante.id) < tuple_(cursor_data_criacao, cursor_id)
+        )
+    # Modo página: LIMIT/OFFSET
+    else:
+        query = query.offset((page - 1) * size)
+
+    # Busca uma linha a mais para saber se existe próxima página
+    resultado = await session.execute(query.limit(size + 1))
+    participantes_page = resultado.all() if settings.JSON_RAPIDO else resultado.scalars().all()
+    tem_proxima = len(participantes_page) > size
+    participantes_page = participantes_page[:size]
+
+    if not participantes_page:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
-            detail="Participante não encontrado.",
+            detail="Nenhum participante encontrado.",
         )
 
-    return ParticipanteSchemaPrivate(
+    total = None
+    if incluir_total:
+        total = await session.scalar(select(func.count()).select_from(Participante))
+
+    proximo_cursor = None
+    if tem_proxima:
+        ultimo = participantes_page[-1]
+        proximo_cursor = codificar_cursor(ultimo.data_criacao, ultimo.id)
+
+    resposta = {
+        "total": total,
+        "page": None if cursor else page,
+        "size": size,
+        "proximo_cursor": proximo_cursor,
+    }
+
+    if settings.JSON_RAPIDO:
+        necessidades = await carrega_necessidades_por_participante(session, [linha.id for linha in participantes_page])
+        participantes = linhas_para_dicts(participantes_page)
+        for participante in participantes:
+            participante["necessidades_especificas"] = necessidades.get(participante["id"], [])
+        return resposta_json_rapida({**resposta, "participantes": participantes})
+
+    return {
+        **resposta,
+        "participantes": [
+            ParticipanteSchemaPrivate(
             id=participante.id,
             id_public=participante.id_public,
             nome=participante.nome,
@@ -66,37 +157,67 @@ async def acessa_perfil_participante(id_participante: int, session: T_Session, c
             necessidades_especificas=[n.id for n in participante.necessidades_especificas],
             data_criacao=participante.data_criacao,
         )
+            for participante in participantes_page
+        ],
+    }
 
 
-# Criado o GET (LISTAR) de todos os participantes.
-# Essa página permite o admin acessar as informações de todos os participantes.
-@router.get("/listar", status_code=HTTPStatus.OK, response_model=ParticipanteListSchemaPrivate, tags=["👶 Participantes [Admin]"])
-async def lista_participantes_admin(current_admin: T_CurrentAdmin, session: T_Session, page: int = 1, size: int = 20):
+# Busca de participantes no credenciamento: nome (parcial), prefixo do CPF ou e-mail.
+# Os resultados vêm ordenados por relevância (ver busca_participante_service).
+@router.get(
+    "/buscar",
+    status_code=HTTPStatus.OK,
+    response_model=list[ParticipanteBuscaSchemaPrivate],
+    tags=["👶 Participantes [Admin]"],
+)
+async def busca_participantes_admin(
+    current_admin: T_Admin,
+    session: T_ReadSession,
+    q: Annotated[str, Query(min_length=2, max_length=100)],
+    limite: Annotated[int, Query(ge=1, le=TAMANHO_MAXIMO_PAGINA)] = 20,
+):
+    return await buscar_participantes(session, q, limite)
 
-    lista_participantes = await session.scalars(
-        select(Participante)
-        .options(selectinload(Participante.necessidades_especificas))
-        .order_by(Participante.data_criacao.desc())
+
+# Exportação dos inscritos de um evento em CSV ou Parquet, gerada em streaming.
+# A memória usada não depende do número de inscritos (cursor do lado do servidor, lotes convertidos e enviados).
+@router.get("/evento/{id_evento}/exportar", status_code=HTTPStatus.OK, tags=["👶 Participantes [Admin]"])
+async def exporta_inscritos_evento(
+    id_evento: uuid.UUID,
+    current_admin: T_Admin,
+    session: T_ReadSession,
+    formato: Literal["csv", "parquet"] = FORMATO_CSV,
+):
+    linhas = await exporta_inscritos(session, id_evento, formato)
+    return StreamingResponse(
+        linhas,
+        media_type=TIPOS_CONTEUDO[formato],
+        headers={"Content-Disposition": f'attachment; filename="inscritos_{id_evento}.{formato}"'},
     )
 
-    lista_participantes = lista_participantes.all()
-    total = len(lista_participantes)
-    start = (page - 1) * size
-    end = start + size
-    participantes_page = lista_participantes[start:end]
 
-    if not participantes_page:
+# Criado o GET (Perfil) de participante pro Admin.
+# Essa página permite o admin acessar as informações de um participante.
+@router.get(
+    "/{id_participante}",
+    status_code=HTTPStatus.OK,
+    response_model=ParticipanteSchemaPublic,
+    tags=["👶 Participantes [Admin]"],
+)
+async def acessa_perfil_participante(id_participante: int, session: T_Session, current_admin= T_CurrentAdmin):
+
+    participante = await session.scalar(
+    select(Participante)
+    .where(Participante.id == id_participante)
+    .options(selectinload(Participante.necessidades_especificas))
+)
+    if not participante:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
-            detail="Nenhum participante encontrado.",
+            detail="Participante não encontrado.",
         )
 
-    return {
-        "total": total,
-        "page": page,
-        "size": size,
-        "participantes": [
-            ParticipanteSchemaPrivate(
+    return ParticipanteSchemaPrivate(
             id=participante.id,
             id_public=participante.id_public,
             nome=participante.nome,
@@ -108,9 +229,6 @@ async def lista_participantes_admin(current_admin: T_CurrentAdmin, session: T_Se
             necessidades_especificas=[n.id for n in participante.necessidades_especificas],
             data_criacao=participante.data_criacao,
         )
-            for participante in participantes_page
-        ],
-    }
 
 
 @router.post(
@@ -134,6 +252,13 @@ async def admin_cadastra_participante(participante: ParticipanteSchemaCreate, se
     return participante_schema
 
 
+# Importação de participantes em lote (planilha CSV ou XLSX, uma linha por participante, com as
+# mesmas colunas do cadastro; listas separadas por ";"). Responde com o total importado e os erros por linha.
+@router.post("/importar", status_code=HTTPStatus.OK, tags=["👶 Participantes [Admin]"])
+async def importa_participantes_admin(arquivo: UploadFile, current_admin: T_Admin, session: T_Session):
+    return await importa_participantes(session, arquivo.file, formato_importacao(arquivo.filename))
+
+
 @router.delete(
     "/deletar/{id_participante}",
     status_code=HTTPStatus.NO_CONTENT,
@@ -163,3 +288,4 @@ async def admin_deleta_participante(
     # Exclui o participante
     await session.delete(db_participante)
     await session.commit()
+    invalida_principal(db_participante.id_public)  # Tokens ainda válidos não podem mais autenticar
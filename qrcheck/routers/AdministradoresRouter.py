@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from qrcheck.database import get_session_async
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.ParticipanteModels import Participante
 from qrcheck.schemas.AdministradoresSchema import (
@@ -15,20 +15,32 @@ from qrcheck.schemas.AdministradoresSchema import (
 )
 from qrcheck.security import (
     get_current_user,
-    get_senha_hash,
+    get_senha_hash_async,
 )
+from qrcheck.settings import Settings
+from qrcheck.utils.json_utils import linhas_para_dicts, resposta_json_rapida
+
+settings = Settings()
 
 router = APIRouter(prefix="/admin", tags=["🧙‍♂️ Administradores"])
 
 
 # Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.  # noqa: E501
 T_Session = Annotated[AsyncSession, Depends(get_session_async)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
 T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
 
 
 # Criado o GET (Listagem) de administrador.
 @router.get("/administradores", status_code=HTTPStatus.OK, response_model=List[AdministradorSchemaPublic])
-async def lista_administradores(session: T_Session, current_admin: T_CurrentAdmin):
+async def lista_administradores(session: T_ReadSession, current_admin: T_CurrentAdmin):
+    # Modo JSON_RAPIDO: só as colunas do AdministradorSchemaPublic, serializadas direto das linhas
+    if settings.JSON_RAPIDO:
+        result = await session.execute(
+            select(Administrador.id, Administrador.nome, Administrador.email, Administrador.data_criacao)
+        )
+        return resposta_json_rapida(linhas_para_dicts(result.all()))
+
     result = await session.execute(select(Administrador))  # Aguarde a execução da consulta
     lista_administradores = result.scalars().all()  # Não precisa de 'await' aqui, pois 'scalars()' já resolve o resultado
     return lista_administradores
@@ -80,7 +92,7 @@ async def cadastra_administrador(administrador: AdministradorSchema, session: T_
         id=uuid.uuid4(),  # Gera um UUID
         nome=administrador.nome,
         email=administrador.email,
-        senha=get_senha_hash(administrador.senha),  # Gera o hash da senha
+        senha=await get_senha_hash_async(administrador.senha),  # Gera o hash da senha (fora do event loop)
         data_criacao=None,
     )
 
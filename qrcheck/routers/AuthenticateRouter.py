@@ -14,7 +14,7 @@ from qrcheck.security import (
     cria_token_acesso,
     get_current_user,
     refresh_token_acesso,
-    verifica_senha,
+    verifica_senha_async,
 )
 
 router = APIRouter(prefix="/auth", tags=["🔑 Autenticação"])
@@ -38,7 +38,7 @@ async def login_de_acesso_token(
     admin = await session.scalar(select(Administrador).where(Administrador.email == form_data.username))
 
     # Se encontrar um admin, autentica com a senha dele e RETORNA
-    if admin and verifica_senha(form_data.password, admin.senha):
+    if admin and await verifica_senha_async(form_data.password, admin.senha):
         access_token = cria_token_acesso(
             data={
                 "sub": str(admin.id),
@@ -58,7 +58,7 @@ async def login_de_acesso_token(
     )
 
     # Se `participante` for None ou a senha for inválida, retorna erro
-    if not participante or not verifica_senha(form_data.password, participante.senha):
+    if not participante or not await verifica_senha_async(form_data.password, participante.senha):
         raise HTTPException(status_code=401, detail="CPF/Email ou senha incorretos.")
 
     # 3️⃣ Cria token de participante
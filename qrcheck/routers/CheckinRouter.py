@@ -0,0 +1,81 @@
+import uuid
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.database import get_session_async, get_session_leitura_async
+from qrcheck.models.ParticipanteModels import Participante
+from qrcheck.schemas.CheckinSchema import CheckinLoteSchema, CheckinSchema
+from qrcheck.security import T_Admin, get_current_user
+from qrcheck.services.checkin_service import (
+    PRIMEIRO_CHECKIN,
+    emite_token_checkin,
+    registra_checkin,
+    registra_checkins_em_lote,
+    verifica_token_checkin,
+)
+from qrcheck.services.snapshot_service import snapshot_inscritos
+from qrcheck.utils.http_utils import comprime_gzip
+
+router = APIRouter(prefix="/checkin", tags=["📲 Check-in"])
+
+# Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.
+T_Session = Annotated[AsyncSession, Depends(get_session_async)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
+T_CurrentParticipante = Annotated[Participante, Depends(get_current_user)]
+
+
+# QR Code de check-in do participante (conteúdo a ser exibido como QR Code no app).
+@router.get("/{id_evento}/qrcode", status_code=HTTPStatus.OK, tags=["👶 Participantes [Usuário]"])
+async def qrcode_checkin(id_evento: uuid.UUID, session: T_Session, current_participante: T_CurrentParticipante):
+    if not isinstance(current_participante, Participante):
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Somente participantes possuem QR Code de check-in.")
+    return await emite_token_checkin(session, current_participante, id_evento)
+
+
+# Check-in na portaria: o leitor envia o token lido do QR Code.
+# A assinatura é conferida sem acesso ao banco; a presença é gravada com um único UPDATE.
+@router.post("/{id_evento}", status_code=HTTPStatus.OK)
+async def realiza_checkin(id_evento: uuid.UUID, checkin: CheckinSchema, session: T_Session, current_admin: T_Admin):
+    participante_id, evento_id = verifica_token_checkin(checkin.token)
+    if evento_id != id_evento:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail="QR Code de outro evento.")
+    return await registra_checkin(session, participante_id, evento_id)
+
+
+# Check-in em lote: leitores sem conexão acumulam as leituras e enviam tudo quando a rede volta.
+# Os tokens são verificados e deduplicados em memória e as presenças gravadas com um único comando;
+# a resposta traz o status de cada leitura (na mesma ordem do envio).
+@router.post("/{id_evento}/lote", status_code=HTTPStatus.OK)
+async def realiza_checkin_em_lote(
+    id_evento: uuid.UUID, lote: CheckinLoteSchema, session: T_Session, current_admin: T_Admin
+):
+    resultados = await registra_checkins_em_lote(
+        session, id_evento, [(leitura.token, leitura.lido_em) for leitura in lote.leituras]
+    )
+    return {
+        "total": len(resultados),
+        "registrados": sum(1 for resultado in resultados if resultado["status"] == PRIMEIRO_CHECKIN),
+        "itens": resultados,
+    }
+
+
+# Snapshot dos inscritos para os leitores (NDJSON comprimido em gzip, gerado em streaming).
+# Sem desde: snapshot completo. Com desde (versão recebida no snapshot anterior): só as inscrições e
+# cancelamentos posteriores. A versão gerada vai no cabeçalho X-Snapshot-Versao e na primeira linha.
+@router.get("/{id_evento}/snapshot", status_code=HTTPStatus.OK)
+async def snapshot_checkin(
+    id_evento: uuid.UUID,
+    session: T_ReadSession,
+    current_admin: T_Admin,
+    desde: Annotated[int | None, Query(ge=0)] = None,
+):
+    versao, linhas = await snapshot_inscritos(session, id_evento, desde)
+    return StreamingResponse(
+        comprime_gzip(linhas),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "gzip", "Cache-Control": "no-store", "X-Snapshot-Versao": str(versao)},
+    )
@@ -3,25 +3,44 @@ from datetime import date
 from http import HTTPStatus
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from qrcheck.database import get_session_async
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.EventoModels import Evento, assoc_participante_evento
 from qrcheck.models.ParticipanteModels import Participante
 from qrcheck.schemas.EventoSchema import EventosSchemaPublic
 from qrcheck.security import get_current_user
+from qrcheck.services.evento_service import CACHE_CONTROL_EVENTOS, obter_eventos_abertos
+from qrcheck.settings import Settings
+from qrcheck.utils.http_utils import resposta_json_com_etag
+from qrcheck.utils.json_utils import linhas_para_dicts, resposta_json_rapida
+
+settings = Settings()
 
 router = APIRouter(prefix="/eventos", tags=["🎉 Eventos"])
 
 # Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.
 T_Session = Annotated[AsyncSession, Depends(get_session_async)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
 T_CurrentParticipante = Annotated[Participante, Depends(get_current_user)]
 T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
 
+# Colunas do EventosSchemaPublic (listagens no modo JSON_RAPIDO)
+COLUNAS_EVENTO_PUBLICO = (
+    Evento.id_public,
+    Evento.nome,
+    Evento.categoria,
+    Evento.subcategoria,
+    Evento.descricao,
+    Evento.data_inicio,
+    Evento.data_fim,
+    Evento.inscricoes_abertas,
+)
+
 
 # Listar todos os eventos disponíveis (futuros e em andamento)
 @router.get(
@@ -30,19 +49,11 @@ T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
     response_model=List[EventosSchemaPublic],
     tags=["🎉 Eventos [Público]"]
 )
-async def listar_eventos(session: T_Session):
+async def listar_eventos(request: Request, session: T_ReadSession):
     """Lista todos os eventos disponíveis (futuros e em andamento)"""
-    hoje = date.today()
-    result = await session.execute(
-        select(Evento)
-        .where(
-            Evento.inscricoes_abertas == True,
-            Evento.data_fim >= hoje  # Eventos que ainda não terminaram
-        )
-        .order_by(Evento.data_inicio)
-    )
-    eventos = result.scalars().all()
-    return eventos
+    # Resposta pré-renderizada em cache (ver evento_service); com o ETag atual o cliente recebe 304
+    corpo, etag = await obter_eventos_abertos(session)
+    return resposta_json_com_etag(request, corpo, etag, CACHE_CONTROL_EVENTOS)
 
 
 # Listar eventos que o participante está inscrito (futuros e em andamento)
@@ -77,14 +88,18 @@ async def listar_meus_eventos(session: T_Session, current_participante: T_Curren
 )
 async def listar_todas_inscricoes(session: T_Session, current_participante: T_CurrentParticipante):
     """Lista TODOS os eventos em que o participante está inscrito (incluindo passados)"""
+    # Modo JSON_RAPIDO: seleciona só as colunas do EventosSchemaPublic e serializa as linhas direto
+    colunas = COLUNAS_EVENTO_PUBLICO if settings.JSON_RAPIDO else (Evento,)
     result = await session.execute(
-        select(Evento)
+        select(*colunas)
         .join(assoc_participante_evento, Evento.id == assoc_participante_evento.c.evento_id)
         .where(
             assoc_participante_evento.c.participante_id == current_participante.id
         )
         .order_by(Evento.data_inicio.desc())  # Ordena por data mais recente primeiro
     )
+    if settings.JSON_RAPIDO:
+        return resposta_json_rapida(linhas_para_dicts(result.all()))
     eventos = result.scalars().all()
     return eventos
 
@@ -131,7 +146,7 @@ async def verificar_inscricao(
     response_model=EventosSchemaPublic,
     tags=["🎉 Eventos [Público]"]
 )
-async def obter_evento(id_evento: uuid.UUID, session: T_Session):
+async def obter_evento(id_evento: uuid.UUID, session: T_ReadSession):
     """Obtém os detalhes de um evento específico"""
     evento = await session.scalar(select(Evento).where(Evento.id_public == id_evento))
     if not evento:
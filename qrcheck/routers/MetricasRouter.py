@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter
+
+from qrcheck import log_app
+from qrcheck.database import get_estatisticas_pools
+from qrcheck.log_app import parse_user_agent
+from qrcheck.security import T_Admin
+from qrcheck.services.catalogo_service import cache_catalogos
+from qrcheck.services.hash_service import servico_hash
+
+router = APIRouter(prefix="/admin/metricas", tags=["📊 Métricas"])
+
+
+# Métricas do serviço de hash de senhas (fila, espera e latência do Argon2).
+@router.get("/hash", status_code=HTTPStatus.OK)
+async def metricas_hash(current_admin: T_Admin):
+    return servico_hash.get_metricas()
+
+
+# Métricas do cache de User-Agents do middleware de log.
+@router.get("/user-agents", status_code=HTTPStatus.OK)
+async def metricas_user_agents(current_admin: T_Admin):
+    info = parse_user_agent.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "itens": info.currsize, "max_itens": info.maxsize}
+
+
+# Métricas da fila do log de acessos (linhas gravadas, descartadas e pendentes).
+@router.get("/logs", status_code=HTTPStatus.OK)
+async def metricas_logs(current_admin: T_Admin):
+    return {
+        "acessos": log_app.escritor_acessos.get_metricas() if log_app.escritor_acessos else None,
+        "estruturado": log_app.escritor_estruturado.get_metricas() if log_app.escritor_estruturado else None,
+    }
+
+
+# Estatísticas dos pools de conexões do primário e da réplica (em uso, overflow e tempo de espera).
+@router.get("/banco", status_code=HTTPStatus.OK)
+async def metricas_banco(current_admin: T_Admin):
+    return get_estatisticas_pools()
+
+
+# Métricas do cache dos catálogos públicos (ocupações e necessidades).
+@router.get("/catalogos", status_code=HTTPStatus.OK)
+async def metricas_catalogos(current_admin: T_Admin):
+    return cache_catalogos.get_metricas()
@@ -1,36 +1,39 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from psycopg2 import IntegrityError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from qrcheck.database import get_session_async
-from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.constants import ids_importantes
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.ParticipanteModels import NecessidadeEspecifica
 from qrcheck.schemas.NecessidadesSchema import NecessidadeCreate, NecessidadeSchemaPrivate, NecessidadeSchemaPublic
-from qrcheck.security import get_current_user
+from qrcheck.security import T_Admin
+from qrcheck.services.catalogo_service import CACHE_CONTROL_CATALOGO, CATALOGO_NECESSIDADES, invalidar_catalogo, obter_catalogo
+from qrcheck.utils.http_utils import resposta_json_com_etag
 
 router = APIRouter(prefix="/necessidades", tags=["♿ Necessidades Específicas"])
 
 
 # Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.
 T_Session = Annotated[AsyncSession, Depends(get_session_async)]
-T_CurrentUser = Annotated[Administrador, Depends(get_current_user)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
 
 
 # Necessidades Específicas: #####
 # Criado o GET (Lista) de Necessidades Específicas.
+# A lista (somente itens padrão, is_custom=False) vem do cache de catálogos, já serializada,
+# com ETag e Cache-Control: clientes com a versão atual recebem 304 sem corpo.
 @router.get(
     "/listar",
     status_code=HTTPStatus.OK,
     response_model=list[NecessidadeSchemaPublic],
 )
-async def lista_necessidades_especificas(session: T_Session):
-    result = await session.execute(select(NecessidadeEspecifica).where(NecessidadeEspecifica.is_custom.is_(False)))
-    lista_necessidades = result.scalars().all()
-    return lista_necessidades
+async def lista_necessidades_especificas(request: Request, session: T_ReadSession):
+    corpo, etag = await obter_catalogo(session, CATALOGO_NECESSIDADES)
+    return resposta_json_com_etag(request, corpo, etag, CACHE_CONTROL_CATALOGO)
 
 
 # Criado o GET (Acessa) de Necessidades Específicas.
@@ -48,11 +51,7 @@ async def acessa_necessidade(id: int, session: T_Session):
     status_code=HTTPStatus.CREATED,
     response_model=NecessidadeSchemaPublic,
 )
-async def cadastra_necessidade_especifica(necessidade: NecessidadeCreate, session: T_Session, current_admin: T_CurrentUser):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
+async def cadastra_necessidade_especifica(necessidade: NecessidadeCreate, session: T_Session, current_admin: T_Admin):
     # Se for uma lista de ocupações
     if isinstance(necessidade.nome, list):
         for nome in necessidade.nome:
@@ -68,6 +67,8 @@ async def cadastra_necessidade_especifica(necessidade: NecessidadeCreate, sessio
                 session.add(db_necessidade)
                 await session.commit()
                 await session.refresh(db_necessidade)
+                ids_importantes.invalidar()
+                invalidar_catalogo(CATALOGO_NECESSIDADES)
 
             except IntegrityError:
                 await session.rollback()
@@ -89,6 +90,8 @@ async def cadastra_necessidade_especifica(necessidade: NecessidadeCreate, sessio
         session.add(db_necessidade)
         await session.commit()
         await session.refresh(db_necessidade)
+        ids_importantes.invalidar()
+        invalidar_catalogo(CATALOGO_NECESSIDADES)
 
         return db_necessidade
 
@@ -107,12 +110,8 @@ async def atualiza_cadastro_necessidade_especifica(
     id: int,  # ID da ocupação a ser atualizada
     necessidade: NecessidadeCreate,  # Dados a serem atualizados
     session: T_Session,
-    current_admin: T_CurrentUser,  # Usuário autenticado
+    current_admin: T_Admin,  # Usuário autenticado
 ):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
     db_necessidade = await session.scalar(select(NecessidadeEspecifica).where(NecessidadeEspecifica.id == id))
 
     if not db_necessidade:
@@ -127,10 +126,12 @@ async def atualiza_cadastro_necessidade_especifica(
         raise HTTPException(status_code=HTTPStatus.CONFLICT, detail="Já existe uma necessidade específica com esse nome.")
 
     try:
-        db_necessidade.nome = db_necessidade.nome
+        db_necessidade.nome = necessidade.nome
 
         await session.commit()
         await session.refresh(db_necessidade)
+        ids_importantes.invalidar()  # O catálogo mudou: IDs em cache podem estar desatualizados
+        invalidar_catalogo(CATALOGO_NECESSIDADES)
 
         return db_necessidade
 
@@ -148,12 +149,8 @@ async def atualiza_cadastro_necessidade_especifica(
 async def deleta_necessidade_especifica(
     id: int,
     session: T_Session,
-    current_admin: T_CurrentUser,
+    current_admin: T_Admin,
 ):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
     db_necessidade = await session.scalar(select(NecessidadeEspecifica).where(NecessidadeEspecifica.id == id))
 
     if not db_necessidade:
@@ -161,3 +158,5 @@ async def deleta_necessidade_especifica(
 
     await session.delete(db_necessidade)
     await session.commit()
+    ids_importantes.invalidar()
+    invalidar_catalogo(CATALOGO_NECESSIDADES)
@@ -1,37 +1,39 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from psycopg2 import IntegrityError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from qrcheck.database import get_session_async
-from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.constants import ids_importantes
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.ParticipanteModels import Ocupacao
 from qrcheck.schemas.OcupacaoSchema import OcupacaoCreate, OcupacaoSchemaPrivate, OcupacaoSchemaPublic
-from qrcheck.security import get_current_user
+from qrcheck.security import T_Admin
+from qrcheck.services.catalogo_service import CACHE_CONTROL_CATALOGO, CATALOGO_OCUPACOES, invalidar_catalogo, obter_catalogo
+from qrcheck.utils.http_utils import resposta_json_com_etag
 
 router = APIRouter(prefix="/ocupacoes", tags=["💼 Ocupações"])
 
 
 # Annotated é uma classe usada para adicionar metadados (ou atributos) a tipos de dados.  # noqa: E501
 T_Session = Annotated[AsyncSession, Depends(get_session_async)]
-T_CurrentUser = Annotated[Administrador, Depends(get_current_user)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_session_leitura_async)]
 
 
 # Ocupações: #####
 # Criado o GET (Lista) de Ocupações.
+# A lista (somente itens padrão, is_custom=False) vem do cache de catálogos, já serializada,
+# com ETag e Cache-Control: clientes com a versão atual recebem 304 sem corpo.
 @router.get(
     "/listar",
     status_code=HTTPStatus.OK,
     response_model=list[OcupacaoSchemaPublic],
 )
-async def lista_ocupacoes(session: T_Session):
-    # Filtra ocupações onde is_custom é False
-    result = await session.execute(select(Ocupacao).where(Ocupacao.is_custom.is_(False)))  # noqa: E712
-    lista_ocupacoes = result.scalars().all()
-    return lista_ocupacoes
+async def lista_ocupacoes(request: Request, session: T_ReadSession):
+    corpo, etag = await obter_catalogo(session, CATALOGO_OCUPACOES)
+    return resposta_json_com_etag(request, corpo, etag, CACHE_CONTROL_CATALOGO)
 
 
 # Criado o GET (Acessa) de Ocupações.
@@ -49,11 +51,7 @@ async def acessa_ocupacao(id: int, session: T_Session):
     status_code=HTTPStatus.CREATED,
     response_model=OcupacaoSchemaPrivate,
 )
-async def cadastra_ocupacao(ocupacao: OcupacaoCreate, session: T_Session, current_admin: T_CurrentUser):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
+async def cadastra_ocupacao(ocupacao: OcupacaoCreate, session: T_Session, current_admin: T_Admin):
     # Se for uma lista de ocupações
     if isinstance(ocupacao.nome, list):
         for nome in ocupacao.nome:
@@ -68,6 +66,8 @@ async def cadastra_ocupacao(ocupacao: OcupacaoCreate, session: T_Session, curren
                 session.add(db_ocupacao)
                 await session.commit()
                 await session.refresh(db_ocupacao)
+                ids_importantes.invalidar()
+                invalidar_catalogo(CATALOGO_OCUPACOES)
 
             except IntegrityError:
                 await session.rollback()
@@ -88,6 +88,8 @@ async def cadastra_ocupacao(ocupacao: OcupacaoCreate, session: T_Session, curren
         session.add(db_ocupacao)
         await session.commit()
         await session.refresh(db_ocupacao)
+        ids_importantes.invalidar()
+        invalidar_catalogo(CATALOGO_OCUPACOES)
 
         return db_ocupacao
 
@@ -106,12 +108,8 @@ async def atualiza_cadastro_ocupacao(
     id: int,  # ID da ocupação a ser atualizada
     ocupacoes: OcupacaoCreate,  # Dados a serem atualizados
     session: T_Session,
-    current_admin: T_CurrentUser,  # Usuário autenticado
+    current_admin: T_Admin,  # Usuário autenticado
 ):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
     db_ocupacao = await session.scalar(select(Ocupacao).where(Ocupacao.id == id))
 
     if not db_ocupacao:
@@ -128,6 +126,8 @@ async def atualiza_cadastro_ocupacao(
 
         await session.commit()
         await session.refresh(db_ocupacao)
+        ids_importantes.invalidar()  # O catálogo mudou: IDs em cache podem estar desatualizados
+        invalidar_catalogo(CATALOGO_OCUPACOES)
 
         return db_ocupacao
 
@@ -144,12 +144,8 @@ async def atualiza_cadastro_ocupacao(
 async def deleta_ocupacao(
     id: int,
     session: T_Session,
-    current_admin: T_CurrentUser,
+    current_admin: T_Admin,
 ):
-    # Verifica se o usuário é um administrador
-    if not isinstance(current_admin, Administrador):
-        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
-
     db_ocupacao = await session.scalar(select(Ocupacao).where(Ocupacao.id == id))
 
     if not db_ocupacao:
@@ -157,3 +153,5 @@ async def deleta_ocupacao(
 
     await session.delete(db_ocupacao)
     await session.commit()
+    ids_importantes.invalidar()
+    invalidar_catalogo(CATALOGO_OCUPACOES)
@@ -2,7 +2,7 @@ import uuid
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,10 +12,7 @@ from qrcheck.database import get_session_async
 
 # from qrcheck.log_app import get_logger_participante
 from qrcheck.models.AdministradorModels import Administrador
-from qrcheck.models.EventoModels import (
-    Evento,
-    assoc_participante_evento,
-)
+from qrcheck.models.EventoModels import Evento
 from qrcheck.models.ParticipanteModels import (
     NecessidadeEspecifica,
     Participante,
@@ -29,6 +26,14 @@ from qrcheck.schemas.ParticipanteSchema import (
 )
 from qrcheck.security import (
     get_current_user,
+    invalida_principal,
+)
+from qrcheck.services.inscricao_service import (
+    INSCRITO,
+    JA_INSCRITO,
+    LISTA_ESPERA,
+    cancelar_inscricao,
+    inscrever_idempotente,
 )
 from qrcheck.services.participante_service import criar_participante
 
@@ -40,6 +45,13 @@ T_Session = Annotated[AsyncSession, Depends(get_session_async)]
 T_CurrentParticipante = Annotated[Participante, Depends(get_current_user)]
 T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
 
+# Status HTTP de cada resultado da inscrição em evento
+STATUS_INSCRICAO = {
+    INSCRITO: HTTPStatus.CREATED,
+    JA_INSCRITO: HTTPStatus.OK,
+    LISTA_ESPERA: HTTPStatus.ACCEPTED,
+}
+
 
 # Participantes: #####
 
@@ -51,9 +63,7 @@ T_CurrentAdmin = Annotated[Administrador, Depends(get_current_user)]
     "/meu-perfil", status_code=HTTPStatus.OK, response_model=ParticipanteSchemaPublic, tags=["👶 Participantes [Usuário]"]
 )
 async def acessa_perfil(session: T_Session, request: Request, response: Response, current_participante: T_CurrentParticipante):
-    # get_logger_participante(
-    #     participante_id=current_participante.id, request=request, response=response, mensagem="Acesso ao perfil"
-    # )
+    # get_logger_participante(current_participante.id).info("Acesso ao perfil")
     participante = await session.scalar(
     select(Participante)
     .where(Participante.id_public == current_participante.id_public)
@@ -112,6 +122,9 @@ async def cadastra_participante(session: T_Session, participante: ParticipanteSc
 
 # Associando o participante ao evento (Se inscrevendo no evento).
 # Deve ser chamado após o cadastro do participante.
+# Respeita a capacidade do evento: sem vagas, o participante entra na lista de espera.
+# Respostas: 201 (inscrito), 200 (já estava inscrito) ou 202 (lista de espera).
+# O header Idempotency-Key permite reenviar a requisição e receber a mesma resposta (guardada no banco).
 @router.post(
     "/inscricao-evento/{id_evento}",
     status_code=HTTPStatus.OK,
@@ -120,36 +133,28 @@ async def cadastra_participante(session: T_Session, participante: ParticipanteSc
 async def associar_participante_evento(
     id_evento: uuid.UUID,
     session: T_Session,
+    response: Response,
     current_participante: T_CurrentParticipante,  # Usuário autenticado
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key", max_length=128)] = None,
 ):
-    # Verifica se o evento existe
-    evento = await session.scalar(select(Evento).where(Evento.id_public == id_evento))
-    if not evento:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail="Evento não encontrado.",
-        )
-
-    # Verifica se o participante já está associado ao evento
-    participante_evento = await session.scalar(
-        select(assoc_participante_evento).where(
-            assoc_participante_evento.c.participante_id == current_participante.id,
-            assoc_participante_evento.c.evento_id == evento.id,
-        )
-    )
+    resultado = await inscrever_idempotente(session, id_evento, current_participante.id, idempotency_key)
+    response.status_code = STATUS_INSCRICAO[resultado["status"]]
+    return resultado
 
-    if participante_evento:
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT,
-            detail="Participante já está associado a este evento.",
-        )
-
-    # Associa o participante ao evento
-    db_inscricao = assoc_participante_evento.insert().values(participante_id=current_participante.id, evento_id=evento.id)
-    await session.execute(db_inscricao)
-    await session.commit()
 
-    return {"detail": "Participante associado ao evento com sucesso."}
+# Cancelando a inscrição no evento (ou saindo da lista de espera).
+# A vaga liberada é repassada ao primeiro participante da lista de espera.
+@router.delete(
+    "/inscricao-evento/{id_evento}",
+    status_code=HTTPStatus.OK,
+    tags=["👶 Participantes [Usuário]"]
+    )
+async def cancelar_participante_evento(
+    id_evento: uuid.UUID,
+    session: T_Session,
+    current_participante: T_CurrentParticipante,  # Usuário autenticado
+):
+    return await cancelar_inscricao(session, id_evento, current_participante.id)
 
 
 # Criado o PUT (ATUALIZAR) de participante.
@@ -187,6 +192,7 @@ async def atualiza_cadastro_participante(
 
         await session.commit()
         await session.refresh(db_participante)
+        invalida_principal(db_participante.id_public)  # O usuário em cache está desatualizado
 
         return db_participante
 
@@ -220,3 +226,4 @@ async def deleta_cadastro_participante(session: T_Session, current_participante:
 
     await session.delete(db_participante)
     await session.commit()
+    invalida_principal(db_participante.id_public)  # Tokens ainda válidos não podem mais autenticar
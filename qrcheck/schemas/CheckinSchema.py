@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+TAMANHO_MAXIMO_LOTE = 5000
+
+
+class CheckinSchema(BaseModel):
+    token: str = Field(max_length=128)
+
+
+class CheckinLeituraSchema(BaseModel):
+    token: str = Field(max_length=128)
+    lido_em: datetime | None = None  # Momento da leitura no leitor (offline); sem ele, vale o horário do servidor
+
+
+class CheckinLoteSchema(BaseModel):
+    leituras: list[CheckinLeituraSchema] = Field(min_length=1, max_length=TAMANHO_MAXIMO_LOTE)
@@ -139,9 +139,21 @@ class ParticipanteSchemaPrivate(BaseModel):
 
 
 class ParticipanteListSchemaPrivate(BaseModel):
-    total: int
-    page: int
+    total: int | None = None  # Só é calculado quando solicitado (incluir_total=True)
+    page: int | None = None  # Ausente no modo cursor (keyset)
     size: int
+    proximo_cursor: str | None = None  # Cursor para a próxima página (None quando não há mais páginas)
     participantes: List[ParticipanteSchemaPrivate]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ParticipanteBuscaSchemaPrivate(BaseModel):
+    id: int
+    id_public: UUID4
+    nome: str
+    sobrenome: str
+    cpf: str
+    email: str
+
+    model_config = ConfigDict(from_attributes=True)
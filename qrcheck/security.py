@@ -1,22 +1,24 @@
 from datetime import datetime, timedelta
 from http import HTTPStatus
 from typing import Annotated, Union
+from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
-from pwdlib import PasswordHash
-from sqlalchemy import select
+from jwt import ExpiredSignatureError, PyJWTError, decode, encode
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from qrcheck.database import get_session_async
 from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.ParticipanteModels import Participante
 from qrcheck.schemas.TokenSchema import TokenData
+from qrcheck.services.hash_service import pwd_context, servico_hash
 from qrcheck.settings import Settings
+from qrcheck.utils.cache_utils import CacheTTL
 
-pwd_context = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 settings = Settings()
 
@@ -56,8 +58,87 @@ def verifica_senha(plain_senha: str, hashed_senha: str):
     return pwd_context.verify(plain_senha, hashed_senha)
 
 
+# Versões assíncronas para uso nas rotas: o Argon2 roda no pool do servico_hash, sem bloquear o event loop.
+async def get_senha_hash_async(senha: str):
+    return await servico_hash.gera_hash(senha)
+
+
+async def verifica_senha_async(plain_senha: str, hashed_senha: str):
+    return await servico_hash.verifica_senha(plain_senha, hashed_senha)
+
+
+# Cache por processo dos usuários autenticados (chave: sub + is_admin do token).
+# Evita uma consulta ao banco em toda requisição autenticada. O cache guarda só os valores das colunas:
+# cada requisição recebe o seu próprio objeto (desvinculado de sessões), sem compartilhar instâncias ORM.
+# O TTL curto limita o tempo em que alterações feitas por outros processos ficam invisíveis; alterações
+# e exclusões feitas pelo ORM neste processo (participantes e administradores) invalidam a entrada.
+cache_principais = CacheTTL(max_itens=settings.PRINCIPAL_CACHE_MAX, ttl_segundos=settings.PRINCIPAL_CACHE_TTL_SEGUNDOS)
+
+
+# Remove do cache o usuário do token com esse sub (ex.: participante atualizado ou excluído).
+def invalida_principal(user_id):
+    cache_principais.remove((str(user_id), False))
+    cache_principais.remove((str(user_id), True))
+
+
+@event.listens_for(Participante, "after_update")
+@event.listens_for(Participante, "after_delete")
+def _invalida_participante(mapper, connection, participante):
+    invalida_principal(participante.id_public)
+
+
+@event.listens_for(Administrador, "after_update")
+@event.listens_for(Administrador, "after_delete")
+def _invalida_administrador(mapper, connection, administrador):
+    invalida_principal(administrador.id)
+
+
+# Valores das colunas do usuário (o que é guardado no cache).
+def _colunas_principal(user) -> tuple[type, dict]:
+    mapper = inspect(user).mapper
+    return mapper.class_, {coluna.key: getattr(user, coluna.key) for coluna in mapper.column_attrs}
+
+
+# Novo objeto desvinculado (detached) a partir das colunas guardadas, como se carregado por uma consulta.
+def _restaura_principal(classe: type, colunas: dict):
+    user = inspect(classe).class_manager.new_instance()
+    for chave, valor in colunas.items():
+        setattr(user, chave, valor)
+    make_transient_to_detached(user)
+    return user
+
+
+# Extrai o token da requisição: primeiro do cookie, depois do header Authorization (Bearer).
+def extrai_token(request: Request) -> str | None:
+    token = request.cookies.get("access_token")
+    if not token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header[len("Bearer ") :]  # remove o 'Bearer ' e pega só o token
+    return token
+
+
+# Decodifica e verifica o token uma única vez por requisição (chamado pelo middleware de log).
+# O resultado fica em request.state e é reaproveitado por get_current_user, evitando decodificar duas vezes.
+def decodifica_token_requisicao(request: Request) -> None:
+    token = extrai_token(request)
+    payload = None
+    erro = None
+    if token:
+        try:
+            payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except ExpiredSignatureError:
+            erro = "Token expirado"
+        except PyJWTError:
+            erro = "Token inválido"
+
+    request.state.token = token
+    request.state.token_payload = payload
+    request.state.token_erro = erro
+
+
 async def get_current_user(
-    session: T_Session, token: str = Depends(oauth2_scheme)
+    request: Request, session: T_Session, token: str = Depends(oauth2_scheme)
 ) -> Union[Participante, Administrador]:
     credentials_exception = HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
@@ -66,32 +147,61 @@ async def get_current_user(
     )
 
     # Método de validação do token
-    # Verifica se o token é válido e não expirou
-    try:
-        payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        is_admin: bool = payload.get("is_admin", False)
-        exp: int = payload.get("exp")
-
-        if not user_id:
+    # Verifica se o token é válido e não expirou.
+    # Se o middleware já decodificou este mesmo token, reaproveita o resultado.
+    if getattr(request.state, "token", None) == token:
+        payload = request.state.token_payload
+        if payload is None:
             raise credentials_exception
+    else:
+        try:
+            payload = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except PyJWTError:
+            raise credentials_exception
+
+    user_id: str = payload.get("sub")
+    is_admin: bool = payload.get("is_admin", False)
+    exp: int = payload.get("exp")
+
+    if not user_id:
+        raise credentials_exception
 
-        token_data = TokenData(user_id=user_id, is_admin=is_admin, exp=exp)
+    token_data = TokenData(user_id=user_id, is_admin=is_admin, exp=exp)
 
-        # Primeiro tenta buscar como Participante
-        user = await session.scalar(select(Participante).where(Participante.id_public == token_data.user_id))
+    chave = (token_data.user_id, bool(token_data.is_admin))
+    em_cache = cache_principais.get(chave)
+    if em_cache is not None:
+        return _restaura_principal(*em_cache)
 
-        # Se não encontrar como Participante, tenta como Administrador
-        if not user:
-            user = await session.scalar(select(Administrador).where(Administrador.id == token_data.user_id))
+    # O sub dos tokens é sempre um UUID (Administrador.id ou Participante.id_public)
+    try:
+        user_uuid = UUID(token_data.user_id)
+    except ValueError:
+        raise credentials_exception
 
-            # Se o usuário for encontrado e for admin, retorna como admin
-            if user and token_data.is_admin:
-                return user
-            else:
-                raise credentials_exception
+    # O claim is_admin define direto em qual tabela buscar (sem consulta desperdiçada em Participante)
+    if token_data.is_admin:
+        user = await session.scalar(select(Administrador).where(Administrador.id == user_uuid))
+    else:
+        user = await session.scalar(select(Participante).where(Participante.id_public == user_uuid))
 
-    except (DecodeError, ExpiredSignatureError):
+    if not user:
         raise credentials_exception
 
+    # Desvincula o objeto da sessão da requisição (mesmo comportamento dos objetos vindos do cache)
+    cache_principais.set(chave, _colunas_principal(user))
+    session.expunge(user)
+
     return user
+
+
+# Dependência das rotas administrativas: o usuário autenticado precisa ser um administrador.
+async def get_current_admin(
+    current_user: Annotated[Union[Participante, Administrador], Depends(get_current_user)],
+) -> Administrador:
+    if not isinstance(current_user, Administrador):
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Requer privilégios de administrador.")
+    return current_user
+
+
+T_Admin = Annotated[Administrador, Depends(get_current_admin)]
@@ -0,0 +1,99 @@
+# Busca de participantes do painel admin (balcão de credenciamento).
+# O termo é classificado antes da consulta, e cada tipo usa o seu índice:
+#   - só dígitos (pontuação de CPF é ignorada): prefixo do CPF, com LIKE 'prefixo%' no índice
+#     varchar_pattern_ops (11 dígitos = CPF exato, pelo índice UNIQUE);
+#   - com "@": e-mail contendo o termo, com ILIKE no índice de trigramas (pg_trgm), ordenado por similaridade;
+#   - demais: nome e sobrenome por busca textual (tsvector), cada palavra como prefixo, ordenado por ts_rank.
+# Em outros bancos (SQLite nos testes) o nome e o e-mail são buscados com LIKE, sem ranking.
+
+import re
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.ParticipanteModels import DOCUMENTO_BUSCA_NOME, Participante
+from qrcheck.utils.json_utils import linhas_para_dicts
+
+TAMANHO_CPF = 11
+MINIMO_DIGITOS_CPF = 3
+
+_SO_DIGITOS_CPF = re.compile(r"[\d.\-\s]+")
+_PALAVRAS = re.compile(r"\w+")
+
+COLUNAS_BUSCA = (
+    Participante.id,
+    Participante.id_public,
+    Participante.nome,
+    Participante.sobrenome,
+    Participante.cpf,
+    Participante.email,
+)
+
+
+# Consulta por prefixo do CPF (termo só com dígitos).
+def _consulta_cpf(digitos: str):
+    consulta = select(*COLUNAS_BUSCA)
+    if len(digitos) == TAMANHO_CPF:
+        return consulta.where(Participante.cpf == digitos)
+    # Padrão montado aqui (um único parâmetro): o planner deriva a faixa do índice a partir do prefixo
+    return consulta.where(Participante.cpf.like(digitos + "%")).order_by(Participante.cpf)
+
+
+# Consulta por e-mail contendo o termo.
+def _consulta_email(termo: str, dialeto: str):
+    if dialeto == "postgresql":
+        # ILIKE (e não lower() LIKE) para usar o índice de trigramas
+        padrao = "%" + termo.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        return (
+            select(*COLUNAS_BUSCA)
+            .where(Participante.email.ilike(padrao, escape="/"))
+            .order_by(func.similarity(Participante.email, termo).desc(), Participante.email)
+        )
+    return (
+        select(*COLUNAS_BUSCA)
+        .where(Participante.email.icontains(termo, autoescape=True))
+        .order_by(Participante.email)
+    )
+
+
+# Consulta por nome: todas as palavras do termo precisam aparecer (como prefixo) no nome completo.
+def _consulta_nome(palavras: list[str], dialeto: str):
+    if dialeto == "postgresql":
+        documento = literal_column(DOCUMENTO_BUSCA_NOME)
+        consulta_texto = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{p}:*" for p in palavras))
+        return (
+            select(*COLUNAS_BUSCA)
+            .where(documento.op("@@")(consulta_texto))
+            .order_by(func.ts_rank(documento, consulta_texto).desc(), Participante.nome, Participante.sobrenome)
+        )
+
+    nome_completo = Participante.nome + " " + Participante.sobrenome
+    return (
+        select(*COLUNAS_BUSCA)
+        .where(*(nome_completo.icontains(palavra, autoescape=True) for palavra in palavras))
+        .order_by(Participante.nome, Participante.sobrenome)
+    )
+
+
+# Monta a consulta de busca para o termo (None se o termo não tem o que buscar).
+def consulta_busca(termo: str, dialeto: str):
+    termo = termo.strip()
+    if _SO_DIGITOS_CPF.fullmatch(termo):
+        digitos = re.sub(r"\D", "", termo)
+        if len(digitos) >= MINIMO_DIGITOS_CPF:
+            return _consulta_cpf(digitos)
+    if "@" in termo:
+        return _consulta_email(termo.lower(), dialeto)
+
+    palavras = [palavra.lower() for palavra in _PALAVRAS.findall(termo)]
+    if not palavras:
+        return None
+    return _consulta_nome(palavras, dialeto)
+
+
+# Busca participantes por nome, prefixo de CPF ou e-mail (resultados ordenados por relevância).
+async def buscar_participantes(session: AsyncSession, termo: str, limite: int) -> list[dict]:
+    consulta = consulta_busca(termo, session.get_bind().dialect.name)
+    if consulta is None:
+        return []
+    return linhas_para_dicts(await session.execute(consulta.limit(limite)))
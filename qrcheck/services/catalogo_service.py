@@ -0,0 +1,46 @@
+# Serviço dos catálogos públicos (ocupações e necessidades específicas).
+# As listas são lidas em toda abertura do formulário de cadastro e mudam raramente, então a resposta
+# fica em memória já serializada (JSON + ETag). As rotas de escrita dos mesmos routers invalidam
+# o catálogo após o commit; o TTL limita a defasagem dos outros workers.
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao
+from qrcheck.settings import Settings
+from qrcheck.utils.cache_utils import CacheVersionado
+from qrcheck.utils.json_utils import dumps_json, linhas_para_dicts
+
+settings = Settings()
+
+CATALOGO_OCUPACOES = "ocupacoes"
+CATALOGO_NECESSIDADES = "necessidades"
+
+CACHE_CONTROL_CATALOGO = f"public, max-age={settings.CATALOGO_MAX_AGE_SEGUNDOS}"
+
+# Modelo de cada catálogo (somente itens padrão, is_custom=False).
+_CATALOGOS = {
+    CATALOGO_OCUPACOES: Ocupacao,
+    CATALOGO_NECESSIDADES: NecessidadeEspecifica,
+}
+
+cache_catalogos = CacheVersionado(ttl_segundos=settings.CATALOGO_CACHE_TTL_SEGUNDOS)
+
+
+# Retorna (corpo JSON, etag) do catálogo, consultando o banco apenas se não estiver em cache.
+async def obter_catalogo(session: AsyncSession, nome: str) -> tuple[bytes, str]:
+    cache = cache_catalogos.get(nome)
+    if cache is not None:
+        return cache
+
+    versao = cache_catalogos.versao(nome)
+    modelo = _CATALOGOS[nome]
+    # Colunas do schema público (id, nome) serializadas direto das linhas
+    result = await session.execute(
+        select(modelo.id, modelo.nome).where(modelo.is_custom.is_(False)).order_by(modelo.id)
+    )
+    return cache_catalogos.set(nome, versao, dumps_json(linhas_para_dicts(result.all())))
+
+
+def invalidar_catalogo(nome: str):
+    cache_catalogos.invalidar(nome)
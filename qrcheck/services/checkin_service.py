@@ -0,0 +1,250 @@
+# Serviço de check-in por QR Code.
+# Cada inscrição recebe um token compacto e assinado (HMAC-SHA256 com a SECRET_KEY) contendo o
+# id_public do participante, o id_public do evento e a expiração. O leitor da portaria envia o token
+# e a assinatura é conferida em memória, sem consulta ao banco; a presença é registrada com um único
+# UPDATE na inscrição.
+#
+# Formato (base64url, sem padding, ~71 caracteres): versão (1 byte) + participante (16 bytes)
+# + evento (16 bytes) + expiração em segundos Unix (4 bytes) + assinatura truncada (16 bytes).
+
+import base64
+import hashlib
+import hmac
+import struct
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, column, func, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.EventoModels import Evento, agora_utc, assoc_participante_evento
+from qrcheck.models.ParticipanteModels import Participante
+from qrcheck.settings import Settings
+
+settings = Settings()
+
+VERSAO_TOKEN = 1
+_FORMATO_DADOS = ">B16s16sI"
+_TAMANHO_DADOS = struct.calcsize(_FORMATO_DADOS)
+_TAMANHO_ASSINATURA = 16
+
+# Chave própria dos tokens de check-in, derivada da SECRET_KEY (não se confunde com outros usos da chave)
+_CHAVE_CHECKIN = hmac.new(settings.SECRET_KEY.encode(), b"qrcheck:checkin", hashlib.sha256).digest()
+
+# Situação de cada check-in (também usada por item no envio em lote)
+PRIMEIRO_CHECKIN = "registrado"
+CHECKIN_REPETIDO = "ja_registrado"
+NAO_INSCRITO = "nao_inscrito"
+TOKEN_INVALIDO = "invalido"
+TOKEN_EXPIRADO = "expirado"
+OUTRO_EVENTO = "outro_evento"
+DUPLICADO_NO_LOTE = "duplicado"
+
+
+def _assina(dados: bytes) -> bytes:
+    return hmac.new(_CHAVE_CHECKIN, dados, hashlib.sha256).digest()[:_TAMANHO_ASSINATURA]
+
+
+# Expiração do token: fim do último dia do evento (UTC) mais a margem configurada.
+def expiracao_token(data_fim) -> datetime:
+    fim_do_evento = datetime.combine(data_fim + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return fim_do_evento + timedelta(hours=settings.CHECKIN_TOKEN_MARGEM_HORAS)
+
+
+def gera_token_checkin(participante_id: uuid.UUID, evento_id: uuid.UUID, expira_em: datetime) -> str:
+    dados = struct.pack(_FORMATO_DADOS, VERSAO_TOKEN, participante_id.bytes, evento_id.bytes, int(expira_em.timestamp()))
+    return base64.urlsafe_b64encode(dados + _assina(dados)).rstrip(b"=").decode()
+
+
+# Decodifica o token conferindo assinatura e expiração (somente em memória).
+# Retorna (participante_id, evento_id) ou o motivo da recusa (TOKEN_INVALIDO / TOKEN_EXPIRADO).
+# agora: instante de referência para a expiração (ex.: momento da leitura em check-ins offline).
+def decodifica_token_checkin(token: str, agora: float | None = None) -> tuple[uuid.UUID, uuid.UUID] | str:
+    try:
+        bruto = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return TOKEN_INVALIDO
+    if len(bruto) != _TAMANHO_DADOS + _TAMANHO_ASSINATURA:
+        return TOKEN_INVALIDO
+
+    dados, assinatura = bruto[:_TAMANHO_DADOS], bruto[_TAMANHO_DADOS:]
+    if not hmac.compare_digest(assinatura, _assina(dados)):
+        return TOKEN_INVALIDO
+
+    versao, participante, evento, expira_em = struct.unpack(_FORMATO_DADOS, dados)
+    if versao != VERSAO_TOKEN:
+        return TOKEN_INVALIDO
+    if expira_em < (time.time() if agora is None else agora):
+        return TOKEN_EXPIRADO
+    return uuid.UUID(bytes=participante), uuid.UUID(bytes=evento)
+
+
+# Confere o token e levanta 401 para tokens inválidos ou expirados.
+def verifica_token_checkin(token: str) -> tuple[uuid.UUID, uuid.UUID]:
+    resultado = decodifica_token_checkin(token)
+    if resultado == TOKEN_EXPIRADO:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail="QR Code expirado.")
+    if isinstance(resultado, str):
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail="QR Code inválido.")
+    return resultado
+
+
+# Emite o token de check-in de uma inscrição (o participante precisa estar inscrito no evento).
+async def emite_token_checkin(session: AsyncSession, participante: Participante, id_evento: uuid.UUID) -> dict:
+    data_fim = await session.scalar(
+        select(Evento.data_fim)
+        .join(assoc_participante_evento, assoc_participante_evento.c.evento_id == Evento.id)
+        .where(Evento.id_public == id_evento, assoc_participante_evento.c.participante_id == participante.id)
+    )
+    if data_fim is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Inscrição não encontrada.")
+
+    expira_em = expiracao_token(data_fim)
+    return {"token": gera_token_checkin(participante.id_public, id_evento, expira_em), "expira_em": expira_em}
+
+
+# Registra a presença com um único UPDATE (somente o primeiro check-in grava a data).
+# Só quando nada é atualizado é feita uma leitura, para diferenciar check-in repetido de inscrição inexistente.
+async def registra_checkin(session: AsyncSession, participante_id: uuid.UUID, evento_id: uuid.UUID) -> dict:
+    id_participante = select(Participante.id).where(Participante.id_public == participante_id).scalar_subquery()
+    id_evento = select(Evento.id).where(Evento.id_public == evento_id).scalar_subquery()
+    filtro_inscricao = (
+        assoc_participante_evento.c.participante_id == id_participante,
+        assoc_participante_evento.c.evento_id == id_evento,
+    )
+
+    data_checkin = await session.scalar(
+        update(assoc_participante_evento)
+        .where(*filtro_inscricao, assoc_participante_evento.c.data_checkin.is_(None))
+        .values(data_checkin=agora_utc())
+        .returning(assoc_participante_evento.c.data_checkin)
+    )
+    if data_checkin is not None:
+        await session.commit()
+        return {"status": PRIMEIRO_CHECKIN, "participante": participante_id, "data_checkin": data_checkin}
+
+    # Nada gravado: não há o que confirmar (a transação termina com a sessão)
+    data_checkin = await session.scalar(select(assoc_participante_evento.c.data_checkin).where(*filtro_inscricao))
+    if data_checkin is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Inscrição não encontrada.")
+    return {"status": CHECKIN_REPETIDO, "participante": participante_id, "data_checkin": data_checkin}
+
+
+# Check-in em lote (leitores offline): verifica e deduplica os tokens em memória e grava todas as
+# presenças com um único UPDATE ... FROM (VALUES ...). Só quando algum item não é gravado é feita
+# uma leitura (também em lote) para diferenciar check-in repetido de inscrição inexistente.
+# itens: lista de (token, lido_em); lido_em (momento da leitura no leitor) é usado como data do
+# check-in e como referência da expiração. Retorna o status de cada item, na ordem recebida.
+# lido_em é informado pelo leitor e por isso limitado: leituras no futuro (relógio adiantado) valem
+# como feitas agora, e leituras anteriores ao início do evento (menos a margem dos tokens) são
+# recusadas como expiradas (evita que tokens vencidos sejam aceitos com datas retroativas).
+async def registra_checkins_em_lote(session: AsyncSession, evento_id: uuid.UUID, itens: list) -> list[dict]:
+    inicio_leituras, fim_leituras = await _janela_leituras(session, evento_id, itens)
+
+    resultados: list[dict] = []
+    pendentes: dict[uuid.UUID, int] = {}  # participante -> índice do item a gravar
+    for indice, (token, lido) in enumerate(itens):
+        lido_em = _normaliza_data(lido)
+        lido_em = min(lido_em, fim_leituras) if lido_em is not None else None
+        referencia = lido_em.replace(tzinfo=timezone.utc).timestamp() if lido_em else None
+        decodificado = decodifica_token_checkin(token, agora=referencia)
+        resultado = {"indice": indice, "status": None, "participante": None}
+        resultados.append(resultado)
+
+        if isinstance(decodificado, str):
+            resultado["status"] = decodificado
+            continue
+        participante_id, evento_token = decodificado
+        resultado["participante"] = participante_id
+        if evento_token != evento_id:
+            resultado["status"] = OUTRO_EVENTO
+        elif lido_em is not None and inicio_leituras is not None and lido_em < inicio_leituras:
+            resultado["status"] = TOKEN_EXPIRADO
+        elif participante_id in pendentes:
+            resultado["status"] = DUPLICADO_NO_LOTE
+        else:
+            pendentes[participante_id] = indice
+            resultado["lido_em"] = lido_em
+
+    if not pendentes:
+        return _limpa_resultados(resultados)
+
+    lote = (
+        values(
+            column("participante", Participante.id_public.type),
+            column("lido_em", DateTime()),
+            name="lote",
+        )
+        .data([(participante, resultados[indice]["lido_em"]) for participante, indice in pendentes.items()])
+        .cte("lote")
+    )
+    id_evento = select(Evento.id).where(Evento.id_public == evento_id).scalar_subquery()
+    gravados = set(
+        (
+            await session.scalars(
+                update(assoc_participante_evento)
+                .where(
+                    Participante.id_public == lote.c.participante,
+                    assoc_participante_evento.c.participante_id == Participante.id,
+                    assoc_participante_evento.c.evento_id == id_evento,
+                    assoc_participante_evento.c.data_checkin.is_(None),
+                )
+                .values(data_checkin=func.coalesce(lote.c.lido_em, agora_utc()))
+                .returning(assoc_participante_evento.c.participante_id)
+            )
+        ).all()
+    )
+    await session.commit()
+
+    # Tudo gravado: nenhuma outra consulta
+    if len(gravados) == len(pendentes):
+        for indice in pendentes.values():
+            resultados[indice]["status"] = PRIMEIRO_CHECKIN
+        return _limpa_resultados(resultados)
+
+    situacao = await session.execute(
+        select(Participante.id_public, Participante.id, assoc_participante_evento.c.participante_id.is_not(None))
+        .outerjoin(
+            assoc_participante_evento,
+            (assoc_participante_evento.c.participante_id == Participante.id)
+            & (assoc_participante_evento.c.evento_id == id_evento),
+        )
+        .where(Participante.id_public.in_(list(pendentes)))
+    )
+    status_por_participante = {
+        participante: PRIMEIRO_CHECKIN if id_interno in gravados else CHECKIN_REPETIDO if inscrito else NAO_INSCRITO
+        for participante, id_interno, inscrito in situacao.all()
+    }
+    for participante, indice in pendentes.items():
+        resultados[indice]["status"] = status_por_participante.get(participante, NAO_INSCRITO)
+    return _limpa_resultados(resultados)
+
+
+# Janela aceita para o lido_em das leituras, em UTC sem fuso: do início do evento (menos a margem dos
+# tokens) até agora. O início só é consultado se alguma leitura tem lido_em (None: evento inexistente).
+async def _janela_leituras(session: AsyncSession, evento_id: uuid.UUID, itens: list) -> tuple[datetime | None, datetime]:
+    agora = _normaliza_data(datetime.now(timezone.utc))
+    if all(lido is None for _, lido in itens):
+        return None, agora
+    data_inicio = await session.scalar(select(Evento.data_inicio).where(Evento.id_public == evento_id))
+    if data_inicio is None:
+        return None, agora
+    margem = timedelta(hours=settings.CHECKIN_TOKEN_MARGEM_HORAS)
+    return datetime.combine(data_inicio, datetime.min.time()) - margem, agora
+
+
+# Datas com fuso são convertidas para UTC sem fuso (mesmo relógio da coluna data_checkin, ver agora_utc);
+# datas sem fuso são consideradas UTC.
+def _normaliza_data(data: datetime | None) -> datetime | None:
+    if data is not None and data.tzinfo is not None:
+        return data.astimezone(timezone.utc).replace(tzinfo=None)
+    return data
+
+
+def _limpa_resultados(resultados: list[dict]) -> list[dict]:
+    for resultado in resultados:
+        resultado.pop("lido_em", None)
+    return resultados
@@ -0,0 +1,82 @@
+# Serviço de eventos.
+# A lista pública de eventos (inscrições abertas e ainda não terminados) é a mesma para todos os
+# visitantes, então fica em memória já serializada (JSON + ETag). Na requisição em cache não há
+# acesso ao banco nem serialização pelo pydantic.
+# O cache é renovado quando:
+#   - uma transação que insere, altera ou remove um Evento é confirmada (eventos do SQLAlchemy);
+#   - a data passa do data_fim do primeiro evento da lista a terminar;
+#   - o TTL expira (alterações feitas por outros processos ou direto no banco).
+
+from datetime import date
+
+from pydantic import TypeAdapter
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from qrcheck.models.EventoModels import Evento
+from qrcheck.schemas.EventoSchema import EventosSchemaPublic
+from qrcheck.settings import Settings
+from qrcheck.utils.cache_utils import CacheVersionado
+
+settings = Settings()
+
+CHAVE_EVENTOS_ABERTOS = "eventos_abertos"
+CACHE_CONTROL_EVENTOS = f"public, max-age={settings.EVENTOS_MAX_AGE_SEGUNDOS}"
+
+cache_eventos = CacheVersionado(ttl_segundos=settings.EVENTOS_CACHE_TTL_SEGUNDOS)
+_adapter_eventos = TypeAdapter(list[EventosSchemaPublic])
+
+
+# Retorna (corpo JSON, etag) da lista pública de eventos, consultando o banco apenas se necessário.
+async def obter_eventos_abertos(session: AsyncSession) -> tuple[bytes, str]:
+    cache = cache_eventos.get(CHAVE_EVENTOS_ABERTOS)
+    if cache is not None:
+        return cache
+
+    versao = cache_eventos.versao(CHAVE_EVENTOS_ABERTOS)
+    hoje = date.today()
+    result = await session.execute(
+        select(Evento)
+        .where(
+            Evento.inscricoes_abertas.is_(True),
+            Evento.data_fim >= hoje,  # Eventos que ainda não terminaram
+        )
+        .order_by(Evento.data_inicio)
+    )
+    eventos = _adapter_eventos.validate_python(result.scalars().all(), from_attributes=True)
+
+    # A lista continua correta até o dia em que o primeiro desses eventos termina
+    valido_ate = min((evento.data_fim for evento in eventos), default=None)
+    return cache_eventos.set(CHAVE_EVENTOS_ABERTOS, versao, _adapter_eventos.dump_json(eventos), valido_ate)
+
+
+def invalidar_eventos():
+    cache_eventos.invalidar(CHAVE_EVENTOS_ABERTOS)
+
+
+# Marca a sessão quando um flush grava alterações em eventos...
+@event.listens_for(Session, "after_flush")
+def _marca_alteracao_eventos(session, flush_context):
+    if any(isinstance(obj, Evento) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["eventos_alterados"] = True
+
+
+# ...e também em UPDATE/DELETE em massa (update(Evento) / delete(Evento)).
+@event.listens_for(Session, "do_orm_execute")
+def _marca_alteracao_eventos_em_massa(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is Evento.__mapper__:
+        orm_execute_state.session.info["eventos_alterados"] = True
+
+
+# A invalidação acontece só depois do commit, para que uma leitura concorrente não
+# guarde no cache o estado anterior à transação.
+@event.listens_for(Session, "after_commit")
+def _invalida_apos_commit(session):
+    if session.info.pop("eventos_alterados", False):
+        invalidar_eventos()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descarta_marca(session):
+    session.info.pop("eventos_alterados", None)
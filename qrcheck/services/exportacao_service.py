@@ -0,0 +1,196 @@
+# Serviço de exportação dos inscritos de um evento (CSV ou Parquet).
+# As linhas são lidas com cursor do lado do servidor (yield_per) e convertidas lote a lote, então a
+# memória usada não depende do número de inscritos: cada lote vira um pedaço do CSV ou um row group
+# do Parquet, enviado ao cliente assim que fica pronto (StreamingResponse).
+# O streaming usa uma sessão própria: a sessão da requisição (dependência com yield) pode ser fechada
+# pelo FastAPI antes de o corpo da resposta ser gerado.
+
+import csv
+import io
+import uuid
+from http import HTTPStatus
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from qrcheck.models.EventoModels import Evento, assoc_participante_evento
+from qrcheck.models.ParticipanteModels import (
+    NecessidadeEspecifica,
+    Ocupacao,
+    Participante,
+    assoc_participante_necessidade,
+)
+
+# Dependência opcional: necessária apenas para a exportação em Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = pq = None
+
+FORMATO_CSV = "csv"
+FORMATO_PARQUET = "parquet"
+TIPOS_CONTEUDO = {FORMATO_CSV: "text/csv; charset=utf-8", FORMATO_PARQUET: "application/vnd.apache.parquet"}
+
+# Linhas buscadas do banco (e convertidas) por vez
+LINHAS_POR_LOTE = 5000
+
+COLUNAS_EXPORTACAO = [
+    "participante",
+    "nome",
+    "sobrenome",
+    "cpf",
+    "email",
+    "data_nasc",
+    "ocupacao",
+    "necessidades",
+    "data_inscricao",
+    "data_checkin",
+]
+
+SEPARADOR_NECESSIDADES = "; "
+
+# Início de célula que o Excel interpreta como fórmula (CSV injection): o texto vindo dos participantes
+# (nome, e-mail, ocupação "outro"...) recebe um apóstrofo na frente e é exibido como texto
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _esquema_parquet():
+    return pa.schema(
+        [
+            ("participante", pa.string()),
+            ("nome", pa.string()),
+            ("sobrenome", pa.string()),
+            ("cpf", pa.string()),
+            ("email", pa.string()),
+            ("data_nasc", pa.date32()),
+            ("ocupacao", pa.string()),
+            ("necessidades", pa.string()),
+            ("data_inscricao", pa.timestamp("us")),
+            ("data_checkin", pa.timestamp("us")),
+        ]
+    )
+
+
+# Consulta dos inscritos: uma linha por participante, com os nomes das necessidades específicas agregados.
+def consulta_inscritos(evento_id: int):
+    return (
+        select(
+            Participante.id_public,
+            Participante.nome,
+            Participante.sobrenome,
+            Participante.cpf,
+            Participante.email,
+            Participante.data_nasc,
+            Ocupacao.nome,
+            func.aggregate_strings(NecessidadeEspecifica.nome, SEPARADOR_NECESSIDADES),
+            assoc_participante_evento.c.data_inscricao,
+            assoc_participante_evento.c.data_checkin,
+        )
+        .join(assoc_participante_evento, assoc_participante_evento.c.participante_id == Participante.id)
+        .join(Ocupacao, Ocupacao.id == Participante.ocupacao_id)
+        .outerjoin(assoc_participante_necessidade, assoc_participante_necessidade.c.participante_id == Participante.id)
+        .outerjoin(
+            NecessidadeEspecifica,
+            NecessidadeEspecifica.id == assoc_participante_necessidade.c.necessidade_especifica_id,
+        )
+        .where(assoc_participante_evento.c.evento_id == evento_id)
+        .group_by(
+            Participante.id,
+            Ocupacao.nome,
+            assoc_participante_evento.c.data_inscricao,
+            assoc_participante_evento.c.data_checkin,
+        )
+        .order_by(Participante.id)
+        .execution_options(yield_per=LINHAS_POR_LOTE)
+    )
+
+
+# Prepara a exportação: confere o formato e o evento antes do streaming (erros ainda podem ser enviados).
+async def exporta_inscritos(session: AsyncSession, id_evento: uuid.UUID, formato: str) -> AsyncIterator[bytes]:
+    if formato == FORMATO_PARQUET and pa is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_IMPLEMENTED,
+            detail="A exportação em Parquet requer o pacote 'pyarrow' instalado.",
+        )
+    evento_id = await session.scalar(select(Evento.id).where(Evento.id_public == id_evento))
+    if evento_id is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Evento não encontrado.")
+
+    # Mesma engine da sessão da requisição (réplica ou primário); a conexão dela é devolvida ao pool já aqui
+    engine = session.bind
+    await session.close()
+    if formato == FORMATO_PARQUET:
+        return _gera_parquet(engine, evento_id)
+    return _gera_csv(engine, evento_id)
+
+
+async def _lotes(engine: AsyncEngine, evento_id: int):
+    session = AsyncSession(engine)
+    try:
+        resultado = await session.stream(consulta_inscritos(evento_id))
+        async for lote in resultado.partitions():
+            yield lote
+    finally:
+        await session.close()
+
+
+async def _gera_csv(engine: AsyncEngine, evento_id: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM: o Excel reconhece o arquivo como UTF-8 (acentos nos nomes)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+    async for lote in _lotes(engine, evento_id):
+        escritor.writerows([_neutraliza_formula(valor) for valor in linha] for linha in lote)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _neutraliza_formula(valor):
+    if isinstance(valor, str) and valor.startswith(_INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+# Destino do ParquetWriter que acumula os bytes escritos até serem enviados ao cliente.
+class _SaidaEmPartes(io.RawIOBase):
+    def __init__(self):
+        self._partes: list[bytes] = []
+        self._posicao = 0
+
+    def writable(self) -> bool:  # noqa: PLR6301
+        return True
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def retira(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+async def _gera_parquet(engine: AsyncEngine, evento_id: int) -> AsyncIterator[bytes]:
+    esquema = _esquema_parquet()
+    saida = _SaidaEmPartes()
+    escritor = pq.ParquetWriter(saida, esquema, compression="zstd")
+    try:
+        async for lote in _lotes(engine, evento_id):
+            colunas = list(zip(*lote))
+            colunas[0] = [str(participante) for participante in colunas[0]]
+            escritor.write_batch(pa.record_batch(colunas, schema=esquema))  # Um row group por lote
+            if dados := saida.retira():
+                yield dados
+    finally:
+        escritor.close()  # Grava o rodapé (metadados) do arquivo
+    yield saida.retira()
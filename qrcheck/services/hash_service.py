@@ -0,0 +1,146 @@
+# Serviço de hash de senhas.
+# O Argon2 é propositalmente lento (dezenas de ms por chamada) e, se executado direto nas rotas
+# assíncronas, bloqueia o event loop inteiro do uvicorn. Aqui o hash e a verificação são enviados
+# para um pool de threads ou de processos, com um limite de requisições pendentes e métricas
+# de latência (tempo de hash) e de espera na fila.
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from pwdlib import PasswordHash
+
+from qrcheck.settings import Settings
+
+pwd_context = PasswordHash.recommended()
+
+
+# As funções executadas no pool ficam no nível do módulo para poderem ser usadas pelo ProcessPoolExecutor.
+# Retornam também o tempo de espera na fila e a duração do hash (em segundos).
+def _gera_hash(senha: str, enviado_em: float):
+    inicio = time.time()
+    senha_hash = pwd_context.hash(senha)
+    return senha_hash, inicio - enviado_em, time.time() - inicio
+
+
+def _verifica_senha(plain_senha: str, hashed_senha: str, enviado_em: float):
+    inicio = time.time()
+    valida = pwd_context.verify(plain_senha, hashed_senha)
+    return valida, inicio - enviado_em, time.time() - inicio
+
+
+class MetricasHash:
+    def __init__(self):
+        self.total = 0
+        self.rejeitadas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.duracao_total = 0.0
+        self.duracao_max = 0.0
+
+    def registra(self, espera: float, duracao: float):
+        self.total += 1
+        self.espera_total += espera
+        self.espera_max = max(self.espera_max, espera)
+        self.duracao_total += duracao
+        self.duracao_max = max(self.duracao_max, duracao)
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "rejeitadas": self.rejeitadas,
+            "espera_media_ms": round(self.espera_total / self.total * 1000, 3) if self.total else 0.0,
+            "espera_max_ms": round(self.espera_max * 1000, 3),
+            "duracao_media_ms": round(self.duracao_total / self.total * 1000, 3) if self.total else 0.0,
+            "duracao_max_ms": round(self.duracao_max * 1000, 3),
+        }
+
+
+MENSAGEM_FILA_CHEIA = "Muitas autenticações em andamento. Tente novamente em instantes."
+
+
+class ServicoHash:
+    def __init__(
+        self,
+        tipo_executor: str = "thread",
+        max_workers: int = 4,
+        max_fila: int = 64,
+        mensagem_fila_cheia: str = MENSAGEM_FILA_CHEIA,
+    ):
+        self.tipo_executor = tipo_executor
+        self.max_workers = max_workers
+        self.max_fila = max_fila
+        self.mensagem_fila_cheia = mensagem_fila_cheia
+        self.pendentes = 0
+        self.metricas = MetricasHash()
+        self._executor: Executor | None = None
+
+    # O pool é criado no primeiro uso (evita criar processos só por importar o módulo)
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.tipo_executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hash")
+        return self._executor
+
+    async def _executa(self, funcao, *args):
+        # Recusa a requisição se a fila estiver cheia, em vez de acumular espera indefinidamente
+        if self.pendentes >= self.max_fila:
+            self.metricas.rejeitadas += 1
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=self.mensagem_fila_cheia,
+            )
+
+        self.pendentes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            resultado, espera, duracao = await loop.run_in_executor(self._get_executor(), funcao, *args, time.time())
+        finally:
+            self.pendentes -= 1
+
+        self.metricas.registra(espera, duracao)
+        return resultado
+
+    async def gera_hash(self, senha: str) -> str:
+        return await self._executa(_gera_hash, senha)
+
+    async def verifica_senha(self, plain_senha: str, hashed_senha: str) -> bool:
+        return await self._executa(_verifica_senha, plain_senha, hashed_senha)
+
+    def get_metricas(self):
+        return {
+            "executor": self.tipo_executor,
+            "max_workers": self.max_workers,
+            "max_fila": self.max_fila,
+            "pendentes": self.pendentes,
+            **self.metricas.to_dict(),
+        }
+
+    # Encerra o pool (chamado no encerramento da aplicação)
+    def encerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+settings = Settings()
+
+# Criando uma instância global
+servico_hash = ServicoHash(
+    tipo_executor=settings.HASH_EXECUTOR,
+    max_workers=settings.HASH_MAX_WORKERS,
+    max_fila=settings.HASH_MAX_FILA,
+)
+
+# Pool da importação de participantes em lote: um lote inteiro de senhas é enviado de uma vez
+# (um lote por vez, ver importacao_service)
+servico_hash_importacao = ServicoHash(
+    tipo_executor=settings.IMPORTACAO_HASH_EXECUTOR,
+    max_workers=settings.IMPORTACAO_HASH_WORKERS,
+    max_fila=settings.IMPORTACAO_LOTE,
+    mensagem_fila_cheia="Muitas importações em andamento. Tente novamente em instantes.",
+)
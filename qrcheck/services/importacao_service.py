@@ -0,0 +1,318 @@
+# Serviço de importação de participantes em lote (planilhas CSV/XLSX enviadas por instituições parceiras).
+# As linhas são lidas do arquivo sob demanda (em uma thread, fora do event loop) e processadas em lotes
+# de IMPORTACAO_LOTE:
+#   1. validação de cada linha pelo ParticipanteSchemaCreate (mesmos validadores do cadastro);
+#   2. duplicidades no próprio arquivo (conjuntos em memória) e no banco (uma consulta por lote, CPF/e-mail);
+#   3. ocupações e necessidades do lote conferidas com uma consulta cada (as linhas com "Outra" ou com
+#      itens personalizados passam pelas mesmas regras do cadastro individual);
+#   4. hash das senhas em paralelo, no pool de processos da importação (um lote por vez no processo);
+#   5. INSERT de várias linhas por comando (ON CONFLICT DO NOTHING: cadastros concorrentes viram erro da linha).
+# Cada lote é confirmado separadamente; a resposta traz o total importado e os erros de cada linha recusada.
+
+import asyncio
+import csv
+import io
+import itertools
+import re
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+from typing import Iterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.constants import ids_importantes
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.models.ParticipanteModels import (
+    NecessidadeEspecifica,
+    Ocupacao,
+    Participante,
+    assoc_participante_necessidade,
+)
+from qrcheck.schemas.ParticipanteSchema import ParticipanteSchemaCreate
+from qrcheck.services.hash_service import servico_hash_importacao
+from qrcheck.services.participante_service import processa_necessidades_especificas, processa_ocupacao
+from qrcheck.settings import Settings
+
+# Dependência opcional: necessária apenas para importar planilhas XLSX
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover
+    openpyxl = None
+
+settings = Settings()
+
+FORMATO_CSV = "csv"
+FORMATO_XLSX = "xlsx"
+
+# Colunas com listas (ids ou nomes separados por ";")
+COLUNAS_LISTA = ("necessidades_especificas", "necessidades_personalizadas")
+SEPARADOR_LISTA = ";"
+
+_DATA_BR = re.compile(r"(\d{2})/(\d{2})/(\d{4})")
+
+_INSERTS_ON_CONFLICT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+# O pool de hash da importação aceita exatamente um lote pendente: importações simultâneas
+# enviam as senhas um lote por vez, em vez de serem recusadas (503) no meio do arquivo
+_hash_em_andamento = asyncio.Lock()
+
+
+# Formato do arquivo enviado, pela extensão (XLSX ou, por padrão, CSV).
+def formato_importacao(nome_arquivo: str | None) -> str:
+    return FORMATO_XLSX if (nome_arquivo or "").lower().endswith(".xlsx") else FORMATO_CSV
+
+
+# Linhas de um CSV (separador "," ou ";", detectado pelo cabeçalho) como (número da linha, dict).
+# O número é o da linha do arquivo (linhas em branco são puladas e campos entre aspas podem ocupar
+# várias linhas): em registros com mais de uma linha, é a última.
+def _linhas_csv(arquivo) -> Iterator[tuple[int, dict]]:
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    cabecalho = texto.readline()
+    separador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+    leitor = csv.DictReader(itertools.chain([cabecalho], texto), delimiter=separador)
+    for linha in leitor:
+        yield leitor.line_num, linha
+
+
+# Linhas da primeira aba de um XLSX como (número da linha na planilha, dict); linhas vazias são puladas
+# (modo read_only: a planilha não é carregada inteira).
+def _linhas_xlsx(arquivo) -> Iterator[tuple[int, dict]]:
+    planilha = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = enumerate(planilha.active.iter_rows(values_only=True), start=1)
+        _, cabecalho = next(linhas, (1, ()))
+        cabecalho = [str(coluna).strip() if coluna is not None else "" for coluna in cabecalho]
+        for numero, valores in linhas:
+            if any(valor is not None for valor in valores):
+                yield numero, dict(zip(cabecalho, valores))
+    finally:
+        planilha.close()
+
+
+# Converte os valores da planilha para a entrada do ParticipanteSchemaCreate.
+def _normaliza_linha(linha: dict) -> dict:
+    dados = {}
+    for chave, bruto in linha.items():
+        coluna = (chave or "").strip().lower()
+        valor = bruto.strip() if isinstance(bruto, str) else bruto
+        if not coluna or valor in {None, ""}:
+            continue
+        if coluna in COLUNAS_LISTA:
+            valor = [item.strip() for item in str(valor).split(SEPARADOR_LISTA) if item.strip()]
+        elif coluna == "cpf" and isinstance(valor, int):
+            valor = f"{valor:011d}"  # CPF numérico na planilha perde os zeros à esquerda
+        elif coluna == "data_nasc" and isinstance(valor, datetime):
+            valor = valor.date()
+        elif coluna == "data_nasc" and isinstance(valor, str) and (data_br := _DATA_BR.fullmatch(valor)):
+            dia, mes, ano = data_br.groups()
+            valor = f"{ano}-{mes}-{dia}"
+        elif isinstance(valor, (int, float)) and coluna != "ocupacao_id":
+            valor = str(valor)
+        dados[coluna] = valor
+    return dados
+
+
+# Mensagens de erro de validação de uma linha (validadores levantam HTTPException ou ValidationError).
+def _mensagens_erro(erro: Exception) -> list[str]:
+    if isinstance(erro, HTTPException):
+        return [str(erro.detail)]
+    return [f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}" for e in erro.errors()]
+
+
+# Valida as linhas sob demanda: gera (número da linha, participante validado ou lista de erros).
+def _valida_linhas(linhas: Iterator[tuple[int, dict]]) -> Iterator[tuple[int, ParticipanteSchemaCreate | list[str]]]:
+    for numero, linha in linhas:
+        try:
+            yield numero, ParticipanteSchemaCreate.model_validate(_normaliza_linha(linha))
+        except (ValidationError, HTTPException) as erro:
+            yield numero, _mensagens_erro(erro)
+
+
+# Lê e valida as próximas linhas do arquivo (executado fora do event loop: a leitura da planilha e a
+# validação de milhares de linhas não podem travar as demais requisições).
+def _proximas(validadas: Iterator, quantidade: int) -> list:
+    return list(itertools.islice(validadas, quantidade))
+
+
+# CPFs e e-mails do lote que já estão cadastrados (participantes e administradores), em uma consulta.
+async def _cadastrados(session: AsyncSession, cpfs: list[str], emails: list[str]) -> tuple[set, set]:
+    resultado = await session.execute(
+        union_all(
+            select(Participante.cpf, Participante.email).where(
+                or_(Participante.cpf.in_(cpfs), Participante.email.in_(emails))
+            ),
+            select(literal(None), Administrador.email).where(Administrador.email.in_(emails)),
+        )
+    )
+    cpfs_cadastrados, emails_cadastrados = set(), set()
+    for cpf, email in resultado.all():
+        cpfs_cadastrados.add(cpf)
+        emails_cadastrados.add(email)
+    return cpfs_cadastrados, emails_cadastrados
+
+
+# Confere ocupações e necessidades do lote. Retorna {número da linha: (ocupacao_id, necessidades_ids)}.
+# Erros de catálogo são adicionados a erros.
+async def _resolve_catalogos(session: AsyncSession, lote: list[tuple[int, ParticipanteSchemaCreate]], erros: dict):
+    outra_ocupacao = await ids_importantes.get_id_ocupacao_outro(session)
+    outra_necessidade = await ids_importantes.get_id_necessidade_outro(session)
+
+    def personalizada(p: ParticipanteSchemaCreate) -> bool:
+        return bool(
+            p.ocupacao_id == outra_ocupacao
+            or p.necessidades_personalizadas
+            or outra_necessidade in (p.necessidades_especificas or [])
+        )
+
+    padrao = [(numero, p) for numero, p in lote if not personalizada(p)]
+    ocupacoes = set(
+        await session.scalars(select(Ocupacao.id).where(Ocupacao.id.in_(list({p.ocupacao_id for _, p in padrao}))))
+    )
+    necessidades = set(
+        await session.scalars(
+            select(NecessidadeEspecifica.id).where(
+                NecessidadeEspecifica.id.in_(list({n for _, p in padrao for n in p.necessidades_especificas or []}))
+            )
+        )
+    )
+
+    resolvidos = {}
+    for numero, participante in lote:
+        if personalizada(participante):
+            # Mesmas regras do cadastro individual (cria as ocupações/necessidades personalizadas)
+            try:
+                resolvidos[numero] = (
+                    await processa_ocupacao(participante, session),
+                    await processa_necessidades_especificas(participante, session),
+                )
+            except HTTPException as erro:
+                erros[numero] = [str(erro.detail)]
+            continue
+
+        ids_necessidades = list(dict.fromkeys(participante.necessidades_especificas or []))
+        if participante.ocupacao_id not in ocupacoes:
+            erros[numero] = ["O ID da ocupação não existe."]
+        elif not necessidades.issuperset(ids_necessidades):
+            erros[numero] = ["O ID da necessidade não existe."]
+        else:
+            resolvidos[numero] = (participante.ocupacao_id, ids_necessidades)
+    return resolvidos
+
+
+# Processa um lote de linhas válidas (sem repetições no arquivo). Retorna o número de participantes importados.
+async def _importa_lote(session: AsyncSession, lote: list[tuple[int, ParticipanteSchemaCreate]], erros: dict) -> int:
+    cpfs_cadastrados, emails_cadastrados = await _cadastrados(
+        session, [p.cpf for _, p in lote], [p.email for _, p in lote]
+    )
+    novos = []
+    for numero, participante in lote:
+        if participante.cpf in cpfs_cadastrados:
+            erros[numero] = ["CPF já cadastrado."]
+        elif participante.email in emails_cadastrados:
+            erros[numero] = ["Email já cadastrado."]
+        else:
+            novos.append((numero, participante))
+
+    resolvidos = await _resolve_catalogos(session, novos, erros)
+    novos = [(numero, participante) for numero, participante in novos if numero in resolvidos]
+    if not novos:
+        await session.commit()  # Ocupações/necessidades personalizadas já criadas
+        return 0
+
+    async with _hash_em_andamento:
+        senhas = await asyncio.gather(*(servico_hash_importacao.gera_hash(p.senha) for _, p in novos))
+
+    comando = insert(Participante)
+    if (dialeto := session.get_bind().dialect.name) in _INSERTS_ON_CONFLICT:
+        comando = _INSERTS_ON_CONFLICT[dialeto](Participante).on_conflict_do_nothing()
+    inseridos = await session.execute(
+        comando.returning(Participante.cpf, Participante.id),
+        [
+            {
+                "id_public": uuid.uuid4(),
+                "nome": participante.nome,
+                "sobrenome": participante.sobrenome,
+                "cpf": participante.cpf,
+                "email": participante.email,
+                "senha": senha,
+                "data_nasc": participante.data_nasc,
+                "ocupacao_id": resolvidos[numero][0],
+            }
+            for (numero, participante), senha in zip(novos, senhas)
+        ],
+    )
+    ids_por_cpf = dict(inseridos.all())
+
+    necessidades = []
+    for numero, participante in novos:
+        participante_id = ids_por_cpf.get(participante.cpf)
+        if participante_id is None:
+            erros[numero] = ["CPF ou email já cadastrado."]  # Cadastrado por outra requisição durante a importação
+            continue
+        necessidades.extend(
+            {"participante_id": participante_id, "necessidade_especifica_id": necessidade_id}
+            for necessidade_id in resolvidos[numero][1]
+        )
+    if necessidades:
+        await session.execute(insert(assoc_participante_necessidade), necessidades)
+    await session.commit()
+    return len(ids_por_cpf)
+
+
+# Importa os participantes de um arquivo CSV ou XLSX.
+async def importa_participantes(session: AsyncSession, arquivo, formato: str) -> dict:
+    if formato == FORMATO_XLSX:
+        if openpyxl is None:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_IMPLEMENTED,
+                detail="A importação de planilhas XLSX requer o pacote 'openpyxl' instalado.",
+            )
+        linhas = _linhas_xlsx(arquivo)
+    else:
+        linhas = _linhas_csv(arquivo)
+
+    erros: dict[int, list[str]] = {}
+    cpfs_no_arquivo, emails_no_arquivo = set(), set()
+    total = importados = 0
+    numero_limite = None  # Primeira linha além do limite
+    lote = []
+    validadas = _valida_linhas(linhas)
+    while numero_limite is None and (bloco := await asyncio.to_thread(_proximas, validadas, settings.IMPORTACAO_LOTE)):
+        for numero, participante in bloco:
+            if total == settings.IMPORTACAO_MAX_LINHAS:
+                numero_limite = numero
+                erros[numero] = [
+                    f"Limite de {settings.IMPORTACAO_MAX_LINHAS} linhas atingido: as demais não foram lidas."
+                ]
+                break
+            total += 1
+            if isinstance(participante, list):
+                erros[numero] = participante
+                continue
+            if participante.cpf in cpfs_no_arquivo:
+                erros[numero] = ["CPF repetido no arquivo."]
+                continue
+            if participante.email in emails_no_arquivo:
+                erros[numero] = ["Email repetido no arquivo."]
+                continue
+            cpfs_no_arquivo.add(participante.cpf)
+            emails_no_arquivo.add(participante.email)
+
+            lote.append((numero, participante))
+            if len(lote) >= settings.IMPORTACAO_LOTE:
+                importados += await _importa_lote(session, lote, erros)
+                lote = []
+    if lote:
+        importados += await _importa_lote(session, lote, erros)
+
+    return {
+        "total": total,
+        "importados": importados,
+        "erros": [{"linha": numero, "erros": mensagens} for numero, mensagens in sorted(erros.items())],
+    }
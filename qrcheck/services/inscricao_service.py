@@ -0,0 +1,408 @@
+# Serviço de inscrições em eventos.
+# Cada evento tem uma capacidade opcional e um contador de vagas ocupadas. A vaga é reservada com
+# um único UPDATE condicional (vagas_ocupadas < capacidade), então inscrições concorrentes nunca
+# ultrapassam o limite e o lock da linha do evento dura só até o commit da própria inscrição.
+# Quando o evento está lotado, o participante entra na lista de espera. Sempre que sobra vaga com
+# alguém na fila (cancelamento, aumento da capacidade ou entrada na fila concorrente com um
+# cancelamento), a fila é promovida em ordem até preencher as vagas (promover_lista_espera).
+# No caminho comum (evento com vaga) a inscrição é feita em um único comando: o INSERT ... SELECT
+# resolve o evento pelo id_public, grava a inscrição com ON CONFLICT DO NOTHING e (no PostgreSQL,
+# na mesma instrução via CTE) reserva a vaga. Repetir a inscrição não é erro: retorna "ja_inscrito".
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.EventoModels import (
+    Evento,
+    assoc_participante_evento,
+    inscricoes_canceladas_evento,
+    inscricoes_idempotentes,
+    lista_espera_evento,
+)
+from qrcheck.settings import Settings
+
+settings = Settings()
+
+# O UPDATE do contador usa a tabela (Core), não o mapper: não sincroniza objetos da sessão e
+# não invalida o cache da lista pública de eventos, que não exibe as vagas.
+eventos = Evento.__table__
+
+INSCRITO = "inscrito"
+JA_INSCRITO = "ja_inscrito"
+LISTA_ESPERA = "lista_espera"
+
+# INSERT com ON CONFLICT por dialeto (nos demais bancos só o caminho completo é usado)
+_INSERTS_ON_CONFLICT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+async def busca_evento(session: AsyncSession, id_evento: uuid.UUID):
+    evento = (
+        await session.execute(select(Evento.id, Evento.inscricoes_abertas).where(Evento.id_public == id_evento))
+    ).first()
+    if not evento:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Evento não encontrado.")
+    return evento
+
+
+# Condição de vaga disponível no evento (capacidade ilimitada ou contador abaixo do limite).
+def _tem_vaga():
+    return or_(eventos.c.capacidade.is_(None), eventos.c.vagas_ocupadas < eventos.c.capacidade)
+
+
+# Condição de lista de espera vazia: com alguém esperando, a vaga livre (ex.: capacidade aumentada)
+# pertence à fila, não a quem chega depois.
+def _fila_vazia():
+    return ~select(lista_espera_evento.c.participante_id).where(lista_espera_evento.c.evento_id == eventos.c.id).exists()
+
+
+# Reserva uma vaga no evento. Retorna True se havia vaga (contador incrementado na transação atual).
+async def reserva_vaga(session: AsyncSession, evento_id: int) -> bool:
+    reservada = await session.scalar(
+        update(eventos)
+        .where(eventos.c.id == evento_id, eventos.c.inscricoes_abertas.is_(True), _tem_vaga(), _fila_vazia())
+        .values(vagas_ocupadas=eventos.c.vagas_ocupadas + 1)
+        .returning(eventos.c.id)
+    )
+    return reservada is not None
+
+
+# Comando único de inscrição: INSERT ... SELECT (resolve o evento) ... ON CONFLICT DO NOTHING RETURNING.
+# No PostgreSQL a reserva da vaga vai na mesma instrução (CTEs de escrita) e o resultado é
+# (inscrição gravada, vaga reservada); nos demais dialetos a reserva é feita pelo chamador.
+def comando_inscricao(dialeto: str, id_evento: uuid.UUID, participante_id: int):
+    origem = select(literal(participante_id, Integer), eventos.c.id).where(
+        eventos.c.id_public == id_evento,
+        eventos.c.inscricoes_abertas.is_(True),
+        _tem_vaga(),
+        _fila_vazia(),
+        # Quem já está na fila não é inscrito por aqui (ex.: reenvio depois de aumentada a capacidade)
+        ~select(lista_espera_evento.c.participante_id)
+        .where(
+            lista_espera_evento.c.evento_id == eventos.c.id,
+            lista_espera_evento.c.participante_id == participante_id,
+        )
+        .exists(),
+    )
+    comando = (
+        _INSERTS_ON_CONFLICT[dialeto](assoc_participante_evento)
+        .from_select(["participante_id", "evento_id"], origem)
+        .on_conflict_do_nothing()
+        .returning(assoc_participante_evento.c.evento_id)
+    )
+    if dialeto != "postgresql":
+        return comando
+
+    inscricao = comando.cte("inscricao")
+    vaga = (
+        update(eventos)
+        .where(eventos.c.id == inscricao.c.evento_id, _tem_vaga())
+        .values(vagas_ocupadas=eventos.c.vagas_ocupadas + 1)
+        .returning(eventos.c.id)
+        .cte("vaga")
+    )
+    return select(
+        select(func.count()).select_from(inscricao).scalar_subquery(),
+        select(func.count()).select_from(vaga).scalar_subquery(),
+    )
+
+
+# Caminho rápido: tenta inscrever com vaga em um único comando.
+# Retorna True se a inscrição foi gravada e a vaga reservada (transação ainda não confirmada).
+async def _inscricao_rapida(session: AsyncSession, id_evento: uuid.UUID, participante_id: int) -> bool:
+    dialeto = session.get_bind().dialect.name
+    if dialeto not in _INSERTS_ON_CONFLICT:
+        return False
+
+    if dialeto == "postgresql":
+        inserida, reservada = (await session.execute(comando_inscricao(dialeto, id_evento, participante_id))).one()
+    else:
+        evento_id = await session.scalar(comando_inscricao(dialeto, id_evento, participante_id))
+        inserida = evento_id is not None
+        reservada = inserida and await reserva_vaga(session, evento_id)
+
+    if inserida and not reservada:
+        # A última vaga foi ocupada entre a leitura e a reserva: desfaz a inscrição
+        await session.rollback()
+    return bool(inserida and reservada)
+
+
+# Posição do participante na lista de espera do evento (1 = próximo a ser promovido).
+async def posicao_lista_espera(session: AsyncSession, evento_id: int, participante_id: int) -> int | None:
+    entrada = select(lista_espera_evento.c.data_entrada).where(
+        lista_espera_evento.c.evento_id == evento_id,
+        lista_espera_evento.c.participante_id == participante_id,
+    ).scalar_subquery()
+    return await session.scalar(
+        select(func.count()).where(
+            lista_espera_evento.c.evento_id == evento_id,
+            tuple_(lista_espera_evento.c.data_entrada, lista_espera_evento.c.participante_id)
+            <= tuple_(entrada, participante_id),
+        )
+    ) or None
+
+
+# Inscreve o participante no evento ou, se estiver lotado, na lista de espera.
+# Se o caminho rápido não inscrever (evento inexistente, encerrado, lotado ou inscrição repetida),
+# o caminho completo identifica o motivo.
+async def inscrever_participante(session: AsyncSession, id_evento: uuid.UUID, participante_id: int) -> dict:
+    if await _inscricao_rapida(session, id_evento, participante_id):
+        await session.commit()
+        return {"status": INSCRITO, "detail": "Participante associado ao evento com sucesso."}
+
+    evento = await busca_evento(session, id_evento)
+
+    # Verifica se o participante já está inscrito ou na lista de espera (uma consulta)
+    inscrito, em_espera = (
+        await session.execute(
+            select(
+                select(assoc_participante_evento.c.participante_id)
+                .where(
+                    assoc_participante_evento.c.participante_id == participante_id,
+                    assoc_participante_evento.c.evento_id == evento.id,
+                )
+                .exists(),
+                select(lista_espera_evento.c.participante_id)
+                .where(
+                    lista_espera_evento.c.participante_id == participante_id,
+                    lista_espera_evento.c.evento_id == evento.id,
+                )
+                .exists(),
+            )
+        )
+    ).one()
+    if inscrito:
+        return {"status": JA_INSCRITO, "detail": "Participante já está associado a este evento."}
+    if em_espera:
+        return await _resposta_lista_espera(
+            session, evento.id, participante_id, "Participante já está na lista de espera deste evento."
+        )
+    if not evento.inscricoes_abertas:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail="As inscrições para este evento estão encerradas.")
+
+    try:
+        if await reserva_vaga(session, evento.id):
+            await session.execute(
+                insert(assoc_participante_evento).values(participante_id=participante_id, evento_id=evento.id)
+            )
+            await session.commit()
+            return {"status": INSCRITO, "detail": "Participante associado ao evento com sucesso."}
+
+        await session.execute(insert(lista_espera_evento).values(participante_id=participante_id, evento_id=evento.id))
+        await session.commit()
+    except IntegrityError:
+        # Inscrição repetida concorrente (ex.: dois cliques): o rollback também desfaz a vaga reservada
+        await session.rollback()
+        return {"status": JA_INSCRITO, "detail": "Participante já está associado a este evento."}
+
+    return await _resposta_lista_espera(
+        session, evento.id, participante_id, "Evento lotado. Participante adicionado à lista de espera."
+    )
+
+
+# Resposta de quem está na lista de espera. Antes, as vagas livres são passadas à fila (ex.: vaga
+# liberada por um cancelamento enquanto o participante entrava na fila), o que pode incluí-lo.
+async def _resposta_lista_espera(session: AsyncSession, evento_id: int, participante_id: int, detail: str) -> dict:
+    await promover_lista_espera(session, evento_id)
+    await session.commit()
+    posicao = await posicao_lista_espera(session, evento_id, participante_id)
+    if posicao is None:
+        return {"status": INSCRITO, "detail": "Participante associado ao evento com sucesso."}
+    return {"status": LISTA_ESPERA, "detail": detail, "posicao": posicao}
+
+
+# Promove a lista de espera enquanto houver vaga livre e alguém na fila, na ordem de entrada.
+# A linha do evento é travada só se houver vaga (promoções simultâneas não ultrapassam a capacidade) e
+# a fila é lida com SKIP LOCKED. Quem já estava inscrito (dados antigos) sai da fila sem ocupar vaga.
+# Não confirma a transação; retorna quantos participantes foram inscritos.
+async def promover_lista_espera(session: AsyncSession, evento_id: int) -> int:
+    comando_insert = _INSERTS_ON_CONFLICT.get(session.get_bind().dialect.name)
+    promovidos = 0
+    while True:
+        evento = (
+            await session.execute(
+                select(eventos.c.capacidade, eventos.c.vagas_ocupadas)
+                .where(eventos.c.id == evento_id, _tem_vaga())
+                .with_for_update()
+            )
+        ).first()
+        if evento is None:
+            return promovidos
+
+        fila = (
+            select(lista_espera_evento.c.participante_id)
+            .where(lista_espera_evento.c.evento_id == evento_id)
+            .order_by(lista_espera_evento.c.data_entrada, lista_espera_evento.c.participante_id)
+            .with_for_update(skip_locked=True)
+        )
+        if evento.capacidade is not None:
+            fila = fila.limit(evento.capacidade - evento.vagas_ocupadas)
+        participantes = (await session.scalars(fila)).all()
+        if not participantes:
+            return promovidos
+
+        await session.execute(
+            delete(lista_espera_evento).where(
+                lista_espera_evento.c.evento_id == evento_id,
+                lista_espera_evento.c.participante_id.in_(participantes),
+            )
+        )
+        # ON CONFLICT DO NOTHING: se o promovido já estava inscrito, a vaga continua livre para o próximo
+        if comando_insert is None:
+            promocao = insert(assoc_participante_evento)
+        else:
+            promocao = comando_insert(assoc_participante_evento).on_conflict_do_nothing()
+        linhas = [{"participante_id": participante_id, "evento_id": evento_id} for participante_id in participantes]
+        inscritos = (
+            await session.scalars(promocao.values(linhas).returning(assoc_participante_evento.c.participante_id))
+        ).all()
+        if inscritos:
+            await session.execute(
+                update(eventos)
+                .where(eventos.c.id == evento_id)
+                .values(vagas_ocupadas=eventos.c.vagas_ocupadas + len(inscritos))
+            )
+            promovidos += len(inscritos)
+
+
+# Altera a capacidade do evento (None = ilimitada). As vagas abertas vão para a lista de espera.
+# A capacidade não pode ficar abaixo das vagas já ocupadas.
+async def altera_capacidade(session: AsyncSession, id_evento: uuid.UUID, capacidade: int | None) -> dict:
+    evento = await busca_evento(session, id_evento)
+    try:
+        await session.execute(update(eventos).where(eventos.c.id == evento.id).values(capacidade=capacidade))
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail="A capacidade não pode ser menor que o número de inscritos."
+        ) from None
+    promovidos = await promover_lista_espera(session, evento.id)
+    await session.commit()
+    return {"detail": "Capacidade alterada.", "promovidos": promovidos}
+
+
+# Inscrição com Idempotency-Key: reenvios com a mesma chave (ex.: app móvel sem resposta por queda
+# de rede) recebem a mesma resposta da primeira tentativa, sem executar a inscrição de novo.
+# A chave é reservada no banco antes da inscrição (commit próprio): reenvios simultâneos, em qualquer
+# worker, recebem 409 até a primeira tentativa terminar.
+async def inscrever_idempotente(
+    session: AsyncSession, id_evento: uuid.UUID, participante_id: int, chave: str | None
+) -> dict:
+    if not chave:
+        return await inscrever_participante(session, id_evento, participante_id)
+
+    agora = _agora_utc()
+    filtro_chave = (
+        inscricoes_idempotentes.c.participante_id == participante_id,
+        inscricoes_idempotentes.c.chave == chave,
+    )
+    anterior = (
+        await session.execute(
+            select(inscricoes_idempotentes.c.id_evento, inscricoes_idempotentes.c.resposta).where(
+                *filtro_chave, inscricoes_idempotentes.c.expira_em >= agora
+            )
+        )
+    ).first()
+    if anterior is not None:
+        evento_anterior, resposta = anterior
+        if resposta is None:
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT, detail="Requisição com esta Idempotency-Key em andamento."
+            )
+        if evento_anterior != id_evento:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key já utilizada em outra requisição.",
+            )
+        return resposta
+
+    # Reserva a chave (as chaves expiradas do participante são removidas aqui)
+    try:
+        await session.execute(
+            delete(inscricoes_idempotentes).where(
+                inscricoes_idempotentes.c.participante_id == participante_id,
+                inscricoes_idempotentes.c.expira_em < agora,
+            )
+        )
+        await session.execute(
+            insert(inscricoes_idempotentes).values(
+                participante_id=participante_id,
+                chave=chave,
+                id_evento=id_evento,
+                expira_em=agora + timedelta(seconds=settings.IDEMPOTENCIA_ANDAMENTO_SEGUNDOS),
+            )
+        )
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail="Requisição com esta Idempotency-Key em andamento."
+        ) from None
+
+    resposta = None
+    try:
+        resposta = await inscrever_participante(session, id_evento, participante_id)
+    finally:
+        # Erros (404, inscrições encerradas...) não são guardados: o reenvio executa de novo
+        if resposta is None:
+            await session.rollback()
+            await session.execute(delete(inscricoes_idempotentes).where(*filtro_chave))
+        else:
+            await session.execute(
+                update(inscricoes_idempotentes)
+                .where(*filtro_chave)
+                .values(resposta=resposta, expira_em=_agora_utc() + timedelta(seconds=settings.IDEMPOTENCIA_TTL_SEGUNDOS))
+            )
+        await session.commit()
+    return resposta
+
+
+# Horário atual em UTC sem fuso (formato da coluna expira_em, gravada e comparada só pela aplicação).
+def _agora_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Cancela a inscrição (ou a entrada na lista de espera) do participante.
+# A vaga liberada passa para o primeiro da lista de espera; sem ninguém esperando, fica livre.
+# O cancelamento é registrado para que o snapshot incremental dos leitores remova o participante.
+async def cancelar_inscricao(session: AsyncSession, id_evento: uuid.UUID, participante_id: int) -> dict:
+    evento = await busca_evento(session, id_evento)
+
+    removida = await session.scalar(
+        delete(assoc_participante_evento)
+        .where(
+            assoc_participante_evento.c.participante_id == participante_id,
+            assoc_participante_evento.c.evento_id == evento.id,
+        )
+        .returning(assoc_participante_evento.c.participante_id)
+    )
+    if removida is None:
+        saiu_da_espera = await session.scalar(
+            delete(lista_espera_evento)
+            .where(lista_espera_evento.c.participante_id == participante_id, lista_espera_evento.c.evento_id == evento.id)
+            .returning(lista_espera_evento.c.participante_id)
+        )
+        if saiu_da_espera is None:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Inscrição não encontrada.")
+        await session.commit()
+        return {"detail": "Participante removido da lista de espera."}
+
+    await session.execute(
+        insert(inscricoes_canceladas_evento).values(participante_id=participante_id, evento_id=evento.id)
+    )
+
+    # A vaga liberada volta ao contador e é passada ao primeiro da fila, se houver
+    await session.execute(
+        update(eventos).where(eventos.c.id == evento.id).values(vagas_ocupadas=eventos.c.vagas_ocupadas - 1)
+    )
+    promovidos = await promover_lista_espera(session, evento.id)
+    await session.commit()
+
+    return {"detail": "Inscrição cancelada.", "promovido": promovidos > 0}
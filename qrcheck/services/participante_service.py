@@ -7,13 +7,14 @@ import uuid
 from http import HTTPStatus
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import selectinload
 
+from qrcheck.constants import ids_importantes
 from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao, Participante
 from qrcheck.schemas.ParticipanteSchema import ParticipanteSchemaPrivate
-from qrcheck.security import cria_token_acesso, get_senha_hash
+from qrcheck.security import cria_token_acesso, get_senha_hash_async
 from qrcheck.utils.validators_utils import (
     formatar_com_conectivos,
 )
@@ -23,11 +24,8 @@ from qrcheck.utils.validators_utils import (
 # Se "Outra" for selecionada, exige que o campo de ocupação personalizada seja preenchido.
 # Se "Outra" não for selecionada, ignora o campo de ocupação personalizada.
 async def processa_ocupacao(participante, session):
-    # Busca o ID da ocupação "Outra"
-    outra_ocupacao = await session.scalar(
-        select(Ocupacao).where(Ocupacao.nome == "Outra", Ocupacao.is_custom == False)  # noqa: E712
-    )
-    outra_id = outra_ocupacao.id if outra_ocupacao else None
+    # Busca o ID da ocupação "Outra" (em cache)
+    outra_id = await ids_importantes.get_id_ocupacao_outro(session)
 
     # Se o ID informado for "Outra", exige ocupacao_outro preenchido
     if participante.ocupacao_id == outra_id:
@@ -86,14 +84,8 @@ async def processa_ocupacao(participante, session):
 async def processa_necessidades_especificas(participante, session):
     necessidades_ids = []
 
-    # Busca o ID da necessidade "Outra"
-    outra_necessidade = await session.scalar(
-        select(NecessidadeEspecifica).where(
-            NecessidadeEspecifica.nome == "Outra(s)",
-            NecessidadeEspecifica.is_custom == False  # noqa: E712
-        )
-    )
-    outra_necessidade_id = outra_necessidade.id if outra_necessidade else None
+    # Busca o ID da necessidade "Outra(s)" (em cache)
+    outra_necessidade_id = await ids_importantes.get_id_necessidade_outro(session)
 
     necessidades_especificas = participante.necessidades_especificas or []
     necessidades_personalizadas = participante.necessidades_personalizadas or []
@@ -106,51 +98,50 @@ async def processa_necessidades_especificas(participante, session):
                 detail="Informe pelo menos uma necessidade personalizada ao selecionar 'Outra(s)'."
             )
 
-    # Adiciona IDs das necessidades padrão (exceto "Outra(s)")
-    for necessidade_id in necessidades_especificas:
-        if necessidade_id != outra_necessidade_id:
-            necessidade = await session.scalar(
-                select(NecessidadeEspecifica).where(NecessidadeEspecifica.id == necessidade_id)
-            )
-            if necessidade is None:
-                raise HTTPException(
-                    status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
-                    detail="O ID da necessidade não existe."
-                )
-            necessidades_ids.append(necessidade_id)
-
-    # Para cada necessidade personalizada digitada, salva ou vincula
-    for necessidade_outro in necessidades_personalizadas:
-        nome_formatado = formatar_com_conectivos(necessidade_outro.strip())
-        if not nome_formatado:
-            continue
-        # Procura necessidade padrão com esse nome
-        necessidade_existente = await session.scalar(
-            select(NecessidadeEspecifica).where(
-                NecessidadeEspecifica.nome == nome_formatado,
-                NecessidadeEspecifica.is_custom == False  # noqa: E712
+    # Adiciona IDs das necessidades padrão (exceto "Outra(s)"), validando todos em uma única consulta (IN)
+    ids_selecionados = list(dict.fromkeys(n for n in necessidades_especificas if n != outra_necessidade_id))
+    if ids_selecionados:
+        ids_existentes = set(
+            await session.scalars(
+                select(NecessidadeEspecifica.id).where(NecessidadeEspecifica.id.in_(ids_selecionados))
             )
         )
-        if necessidade_existente:
-            necessidades_ids.append(necessidade_existente.id)
-            continue
-        # Procura necessidade personalizada já existente
-        necessidade_custom_existente = await session.scalar(
-            select(NecessidadeEspecifica).where(
-                NecessidadeEspecifica.nome == nome_formatado,
-                NecessidadeEspecifica.is_custom == True  # noqa: E712
+        if len(ids_existentes) != len(ids_selecionados):
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail="O ID da necessidade não existe."
             )
+        necessidades_ids.extend(ids_selecionados)
+
+    # Normaliza as necessidades personalizadas digitadas (sem vazios e sem repetições)
+    nomes_formatados = list(dict.fromkeys(
+        nome for nome in (formatar_com_conectivos(n.strip()) for n in necessidades_personalizadas) if nome
+    ))
+    if nomes_formatados:
+        # Busca de uma vez as necessidades (padrão ou personalizadas) que já existem com esses nomes.
+        # A necessidade padrão tem prioridade sobre a personalizada com o mesmo nome.
+        ids_por_nome = {}
+        existentes = await session.execute(
+            select(NecessidadeEspecifica.nome, NecessidadeEspecifica.id, NecessidadeEspecifica.is_custom)
+            .where(NecessidadeEspecifica.nome.in_(nomes_formatados))
         )
-        if necessidade_custom_existente:
-            necessidades_ids.append(necessidade_custom_existente.id)
-            continue
-        # Cria nova necessidade personalizada
-        nova_necessidade = NecessidadeEspecifica(nome=nome_formatado, is_custom=True)
-        session.add(nova_necessidade)
-        await session.flush()
-        necessidades_ids.append(nova_necessidade.id)
+        for nome, necessidade_id, is_custom in existentes:
+            if nome not in ids_por_nome or not is_custom:
+                ids_por_nome[nome] = necessidade_id
+
+        # Cria as necessidades personalizadas que ainda não existem em um único INSERT
+        nomes_faltantes = [nome for nome in nomes_formatados if nome not in ids_por_nome]
+        if nomes_faltantes:
+            novas_necessidades = await session.execute(
+                insert(NecessidadeEspecifica).returning(NecessidadeEspecifica.nome, NecessidadeEspecifica.id),
+                [{"nome": nome, "is_custom": True} for nome in nomes_faltantes],
+            )
+            ids_por_nome.update(dict(novas_necessidades.all()))
+
+        necessidades_ids.extend(ids_por_nome[nome] for nome in nomes_formatados)
 
-    return necessidades_ids
+    # Remove IDs repetidos (ex.: personalizada igual a uma padrão já selecionada) mantendo a ordem
+    return list(dict.fromkeys(necessidades_ids))
 
 
 async def criar_participante(participante, session, gerar_token=False):
@@ -189,7 +180,7 @@ async def criar_participante(participante, session, gerar_token=False):
         sobrenome=participante.sobrenome,
         cpf=participante.cpf,
         email=participante.email,
-        senha=get_senha_hash(participante.senha),  # Gera o hash da senha
+        senha=await get_senha_hash_async(participante.senha),  # Gera o hash da senha (fora do event loop)
         data_nasc=participante.data_nasc,
         ocupacao_id=ocupacao_id,
         data_criacao=None,
@@ -0,0 +1,145 @@
+# Serviço do snapshot dos inscritos de um evento, baixado pelos leitores de QR Code antes da abertura
+# dos portões (conferência offline das inscrições e alerta das necessidades específicas para a equipe
+# de acessibilidade).
+#
+# O snapshot é gerado em streaming, em NDJSON (uma linha JSON por registro):
+#   - cabeçalho: {"evento", "versao", "desde", "completo"}
+#   - remoções (só nas atualizações incrementais): {"participante", "removido": true}
+#   - inscritos: {"participante", "nome", "necessidades"} (ids do catálogo de necessidades específicas)
+# A versão é o horário do banco no início da geração (microssegundos desde 1970, UTC, o mesmo relógio
+# das datas de inscrição e cancelamento). O leitor a envia em ?desde= para receber só as inscrições
+# feitas e canceladas depois dela. As alterações dos últimos SNAPSHOT_MARGEM_SEGUNDOS antes da versão
+# são repetidas (transações confirmadas depois de lidas), então as linhas devem ser aplicadas de forma
+# idempotente. Alterações de cadastro (nome, necessidades) só
+# aparecem no snapshot completo.
+# O streaming usa uma sessão própria: a sessão da requisição (dependência com yield) pode ser fechada
+# pelo FastAPI antes de o corpo da resposta ser gerado.
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from qrcheck.models.EventoModels import Evento, agora_utc, assoc_participante_evento, inscricoes_canceladas_evento
+from qrcheck.models.ParticipanteModels import Participante, assoc_participante_necessidade
+from qrcheck.settings import Settings
+from qrcheck.utils.json_utils import dumps_json
+
+settings = Settings()
+
+# Linhas buscadas do banco (e comprimidas) por vez
+LINHAS_POR_LOTE = 1000
+
+_EPOCA = datetime(1970, 1, 1)
+
+
+# Versão <-> horário do banco (UTC sem fuso, mesmo formato das colunas de data das inscrições).
+def data_para_versao(data: datetime) -> int:
+    if data.tzinfo is not None:
+        data = data.astimezone(timezone.utc).replace(tzinfo=None)
+    return (data - _EPOCA) // timedelta(microseconds=1)
+
+
+def versao_para_data(versao: int) -> datetime:
+    return _EPOCA + timedelta(microseconds=versao)
+
+
+# Prepara o snapshot dos inscritos do evento (completo ou, com desde, só as alterações posteriores).
+# O evento é conferido antes do streaming (404 ainda pode ser enviado); retorna a versão gerada e as linhas.
+async def snapshot_inscritos(
+    session: AsyncSession, id_evento: uuid.UUID, desde: int | None = None
+) -> tuple[int, AsyncIterator[bytes]]:
+    evento = (await session.execute(select(Evento.id, agora_utc()).where(Evento.id_public == id_evento))).first()
+    if not evento:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Evento não encontrado.")
+
+    evento_id, agora = evento
+    versao = data_para_versao(agora)
+    corte = None
+    if desde is not None:
+        corte = versao_para_data(desde) - timedelta(seconds=settings.SNAPSHOT_MARGEM_SEGUNDOS)
+
+    cabecalho = {"evento": id_evento, "versao": versao, "desde": desde, "completo": desde is None}
+    # Mesma engine da sessão da requisição (réplica ou primário); a conexão dela é devolvida ao pool já aqui
+    engine = session.bind
+    await session.close()
+    return versao, _linhas_snapshot(engine, evento_id, cabecalho, corte)
+
+
+async def _linhas_snapshot(
+    engine: AsyncEngine, evento_id: int, cabecalho: dict, corte: datetime | None
+) -> AsyncIterator[bytes]:
+    session = AsyncSession(engine)
+    try:
+        async for linhas in _gera_linhas_snapshot(session, evento_id, cabecalho, corte):
+            yield linhas
+    finally:
+        await session.close()
+
+
+async def _gera_linhas_snapshot(
+    session: AsyncSession, evento_id: int, cabecalho: dict, corte: datetime | None
+) -> AsyncIterator[bytes]:
+    yield dumps_json(cabecalho) + b"\n"
+
+    if corte is not None:
+        # Cancelados depois do corte que não voltaram a se inscrever
+        inscrito = (
+            select(assoc_participante_evento.c.participante_id)
+            .where(
+                assoc_participante_evento.c.participante_id == inscricoes_canceladas_evento.c.participante_id,
+                assoc_participante_evento.c.evento_id == evento_id,
+            )
+            .exists()
+        )
+        removidos = await session.stream_scalars(
+            select(Participante.id_public)
+            .distinct()
+            .join(inscricoes_canceladas_evento, inscricoes_canceladas_evento.c.participante_id == Participante.id)
+            .where(
+                inscricoes_canceladas_evento.c.evento_id == evento_id,
+                inscricoes_canceladas_evento.c.data_cancelamento >= corte,
+                ~inscrito,
+            )
+            .execution_options(yield_per=LINHAS_POR_LOTE)
+        )
+        async for lote in removidos.partitions():
+            yield b"".join(dumps_json({"participante": participante, "removido": True}) + b"\n" for participante in lote)
+
+    # Uma linha por necessidade (ordenadas por participante): agrupadas aqui em uma linha por participante
+    consulta = (
+        select(
+            Participante.id,
+            Participante.id_public,
+            Participante.nome,
+            Participante.sobrenome,
+            assoc_participante_necessidade.c.necessidade_especifica_id,
+        )
+        .join(assoc_participante_evento, assoc_participante_evento.c.participante_id == Participante.id)
+        .outerjoin(assoc_participante_necessidade, assoc_participante_necessidade.c.participante_id == Participante.id)
+        .where(assoc_participante_evento.c.evento_id == evento_id)
+        .order_by(Participante.id)
+    )
+    if corte is not None:
+        consulta = consulta.where(assoc_participante_evento.c.data_inscricao >= corte)
+
+    atual_id, atual = None, None
+    resultado = await session.stream(consulta.execution_options(yield_per=LINHAS_POR_LOTE))
+    async for lote in resultado.partitions():
+        linhas = []
+        for participante_id, id_public, nome, sobrenome, necessidade_id in lote:
+            if participante_id != atual_id:
+                if atual is not None:
+                    linhas.append(dumps_json(atual) + b"\n")
+                atual_id = participante_id
+                atual = {"participante": id_public, "nome": f"{nome} {sobrenome}", "necessidades": []}
+            if necessidade_id is not None:
+                atual["necessidades"].append(necessidade_id)
+        if linhas:
+            yield b"".join(linhas)
+    if atual is not None:
+        yield dumps_json(atual) + b"\n"
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,7 +10,66 @@ class Settings(BaseSettings):
     DATABASE_URL_SYNC: str
     DATABASE_URL_ASYNC: str
 
+    # Pool de conexões da engine assíncrona (cada worker e cada engine, primária ou réplica, abre até
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW conexões). Tamanho e overflow seguem os padrões do SQLAlchemy;
+    # recycle e pre-ping não (padrões -1 e False): descartam conexões derrubadas por firewall/PgBouncer.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Segundos aguardando uma conexão livre antes de erro
+    DB_POOL_RECYCLE: int = 1800  # Segundos até uma conexão ser recriada (-1 desativa)
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Cache de prepared statements do asyncpg (0 desativa, ex.: com PgBouncer)
+    DB_ECHO: bool = False
+
+    # Réplica somente leitura (opcional). Sem ela, as leituras usam o banco primário.
+    DATABASE_URL_ASYNC_LEITURA: str | None = None
+    DB_LEITURA_STICKY_SEGUNDOS: float = 5.0  # Após uma escrita, o cliente lê do primário por N segundos (0 desativa)
+
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+
+    # Tokens de check-in (QR Code): válidos até N horas depois do fim do evento
+    CHECKIN_TOKEN_MARGEM_HORAS: int = 6
+
+    # Snapshot dos inscritos para os leitores: as atualizações incrementais repetem as alterações dos
+    # últimos N segundos antes da versão do cliente (transações confirmadas depois de lidas)
+    SNAPSHOT_MARGEM_SEGUNDOS: int = 60
+
+    # Hash de senhas (Argon2) executado fora do event loop
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_MAX_WORKERS: int = 4
+    HASH_MAX_FILA: int = 64  # Máximo de hashes pendentes (em execução + aguardando) antes de recusar com 503
+
+    # Importação de participantes em lote (CSV/XLSX). O hash das senhas usa um pool próprio,
+    # para que uma importação grande não atrase os logins
+    IMPORTACAO_MAX_LINHAS: int = 50000
+    IMPORTACAO_LOTE: int = 500  # Linhas validadas, conferidas e inseridas por vez
+    IMPORTACAO_HASH_EXECUTOR: Literal["thread", "process"] = "process"
+    IMPORTACAO_HASH_WORKERS: int = 4
+
+    # Cache dos catálogos públicos (ocupações e necessidades específicas)
+    CATALOGO_CACHE_TTL_SEGUNDOS: float = 300.0  # Limita a defasagem entre workers (a invalidação é por processo)
+    CATALOGO_MAX_AGE_SEGUNDOS: int = 60  # Cache-Control enviado aos navegadores e à CDN
+
+    # Cache da lista pública de eventos (GET /eventos/)
+    EVENTOS_CACHE_TTL_SEGUNDOS: float = 300.0  # Limita a defasagem de alterações feitas fora deste processo
+    EVENTOS_MAX_AGE_SEGUNDOS: int = 30
+
+    # Listas grandes serializadas direto das linhas do banco (sem objetos pydantic intermediários)
+    JSON_RAPIDO: bool = False
+
+    # Idempotency-Key das inscrições em eventos (respostas guardadas no banco por participante + chave)
+    IDEMPOTENCIA_TTL_SEGUNDOS: float = 86400.0
+    IDEMPOTENCIA_ANDAMENTO_SEGUNDOS: float = 60.0  # Chave reservada por uma tentativa que não terminou (ex.: worker caiu)
+
+    # Cache dos usuários autenticados (get_current_user)
+    PRINCIPAL_CACHE_TTL_SEGUNDOS: float = 30.0
+    PRINCIPAL_CACHE_MAX: int = 4096
+
+    # Log de acessos assíncrono (fila em memória + gravação em lotes)
+    LOG_MAX_FILA: int = 10000
+    LOG_TAMANHO_LOTE: int = 256
+    LOG_INTERVALO_FLUSH: float = 1.0  # Segundos
+    LOG_FORMATO: Literal["texto", "json", "msgpack"] = "texto"  # "msgpack" requer o pacote msgpack
@@ -0,0 +1,90 @@
+#  Utils de cache: estruturas de cache em memória (por processo) reutilizadas pela aplicação.
+
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import date
+
+
+# Cache LRU com tempo de expiração (TTL) por item.
+# Quando o limite de itens é atingido, o item usado há mais tempo é descartado.
+class CacheTTL:
+    def __init__(self, max_itens: int = 1024, ttl_segundos: float = 30.0):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self.hits = 0
+        self.misses = 0
+        self._itens: OrderedDict = OrderedDict()
+
+    def get(self, chave, padrao=None):
+        item = self._itens.get(chave)
+        if item is None or item[1] < time.monotonic():
+            if item is not None:
+                del self._itens[chave]
+            self.misses += 1
+            return padrao
+
+        self._itens.move_to_end(chave)
+        self.hits += 1
+        return item[0]
+
+    def set(self, chave, valor):
+        self._itens[chave] = (valor, time.monotonic() + self.ttl_segundos)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+
+    def remove(self, chave):
+        self._itens.pop(chave, None)
+
+    def limpa(self):
+        self._itens.clear()
+
+    def get_metricas(self):
+        return {"itens": len(self._itens), "max_itens": self.max_itens, "hits": self.hits, "misses": self.misses}
+
+
+# Cache versionado de respostas já serializadas (corpo JSON em bytes + ETag).
+# Cada chave tem uma versão incrementada a cada invalidação: um valor carregado enquanto
+# uma escrita invalidava a chave não é guardado, pois a versão mudou no meio da consulta.
+# O ETag é o hash do corpo, então é o mesmo em todos os workers para o mesmo conteúdo.
+class CacheVersionado:
+    def __init__(self, ttl_segundos: float = 300.0):
+        self.ttl_segundos = ttl_segundos
+        self.hits = 0
+        self.misses = 0
+        self._versoes: dict = {}
+        self._itens: dict = {}
+
+    def versao(self, chave) -> int:
+        return self._versoes.get(chave, 0)
+
+    def get(self, chave):
+        item = self._itens.get(chave)
+        if item is None or item[2] < time.monotonic() or (item[3] is not None and date.today() > item[3]):
+            self._itens.pop(chave, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return item[0], item[1]
+
+    # Guarda o corpo carregado na versão informada e retorna (corpo, etag).
+    # valido_ate: última data em que o conteúdo continua correto (ex.: até um evento terminar).
+    def set(self, chave, versao: int, corpo: bytes, valido_ate: date | None = None):
+        etag = f'"{hashlib.blake2b(corpo, digest_size=16).hexdigest()}"'
+        if versao == self.versao(chave):
+            self._itens[chave] = (corpo, etag, time.monotonic() + self.ttl_segundos, valido_ate)
+        return corpo, etag
+
+    def invalidar(self, chave):
+        self._versoes[chave] = self.versao(chave) + 1
+        self._itens.pop(chave, None)
+
+    def get_metricas(self):
+        return {
+            "itens": len(self._itens),
+            "versoes": dict(self._versoes),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
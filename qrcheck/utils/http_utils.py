@@ -0,0 +1,36 @@
+#  Utils HTTP: respostas com cache condicional (ETag / If-None-Match) e streaming comprimido.
+
+import zlib
+from http import HTTPStatus
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import Request, Response
+
+
+# Verifica se algum dos ETags enviados pelo cliente (If-None-Match) corresponde ao atual.
+# ETags fracos (W/"...") são comparados pelo valor, como manda a comparação fraca do RFC 9110.
+def etag_corresponde(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    etags = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+    return "*" in etags or etag in etags
+
+
+# Monta a resposta JSON (corpo já serializado) com ETag e Cache-Control.
+# Se o cliente já tem a versão atual, responde 304 sem corpo.
+def resposta_json_com_etag(request: Request, corpo: bytes, etag: str, cache_control: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_corresponde(request, etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(content=corpo, media_type="application/json", headers=headers)
+
+
+# Comprime em gzip as partes de uma resposta em streaming (para StreamingResponse com Content-Encoding: gzip).
+# Cada parte é comprimida e enviada assim que gera saída, sem montar o corpo inteiro em memória.
+async def comprime_gzip(partes: AsyncIterable[bytes], nivel: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # 16 + MAX_WBITS = formato gzip
+    async for parte in partes:
+        if comprimido := compressor.compress(parte):
+            yield comprimido
+    yield compressor.flush()
@@ -0,0 +1,32 @@
+#  Utils JSON: serialização rápida de listas direto das linhas do banco.
+#  Em vez de criar um objeto pydantic por linha e passar pelo jsonable_encoder do FastAPI,
+#  as linhas (tuplas nomeadas do SQLAlchemy) são convertidas em dicts e serializadas de uma vez
+#  para bytes, com o orjson (se instalado) ou com o serializador do pydantic-core.
+
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic_core import to_json
+
+# Dependência opcional: com ela a serialização é ainda mais rápida
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# Serializa para JSON em bytes (UUID, date e datetime no mesmo formato ISO do pydantic).
+def dumps_json(dados: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(dados)
+    return to_json(dados)
+
+
+# Converte linhas de um select de colunas (Row) em dicts, usando os nomes das colunas como chaves.
+def linhas_para_dicts(linhas: Iterable) -> list[dict]:
+    return [linha._asdict() for linha in linhas]
+
+
+# Resposta JSON a partir de dados já prontos para serializar (sem validação pelo response_model).
+def resposta_json_rapida(dados: Any, status_code: int = 200) -> Response:
+    return Response(content=dumps_json(dados), status_code=status_code, media_type="application/json")
@@ -0,0 +1,29 @@
+#  Utils de paginação: funções para codificar e decodificar os cursores (keyset) usados
+#  nas listagens paginadas. O cursor é opaco para o cliente: ele apenas devolve o valor
+#  recebido em "proximo_cursor" para obter a página seguinte.
+
+import base64
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+# Função para codificar o cursor a partir da última linha da página (data_criacao, id)
+def codificar_cursor(data_criacao: datetime, id: int) -> str:
+    valor = f"{data_criacao.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(valor.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+# Função para decodificar o cursor recebido do cliente em (data_criacao, id)
+def decodificar_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        valor = base64.urlsafe_b64decode(cursor + padding).decode("utf-8")
+        data_criacao, id = valor.split("|")
+        return datetime.fromisoformat(data_criacao), int(id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="O cursor de paginação informado é inválido."
+        )
@@ -6,10 +6,17 @@
 import re
 from datetime import date, datetime
 from http import HTTPStatus
+from typing import Iterable
 
 from fastapi import HTTPException
 from pydantic import ValidationInfo
 
+# Dependência opcional: necessária apenas para a validação de CPFs em lote
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 
 # Função para formatar conectivos em minúsculo
 def formatar_com_conectivos(texto: str) -> str:
@@ -52,6 +59,46 @@ def validar_cpf_util(cpf: str) -> str:
     return cpf
 
 
+_NAO_DIGITOS = re.compile(r"[^0-9]")
+_PONTUACAO_CPF = (".", "-", "/", " ")
+_TAMANHO_CPF = 11
+
+
+# Validação de CPFs em lote (importações e auditorias com muitos registros), com as mesmas regras do
+# validar_cpf_util, mas com os dígitos verificadores calculados para todos os CPFs de uma vez (NumPy).
+# Retorna (mascara, digitos): mascara[i] indica se o CPF i é válido e digitos[i] é o CPF i só com dígitos.
+def validar_cpfs_em_lote(cpfs: Iterable[str]):
+    if np is None:
+        raise RuntimeError("A validação de CPFs em lote requer o pacote 'numpy' instalado.")
+
+    # Remove a pontuação usual de forma vetorizada; só os valores com outros caracteres passam pela regex
+    digitos = np.array([str(cpf) for cpf in cpfs], dtype=str)
+    if not digitos.size:
+        return np.zeros(0, dtype=bool), digitos
+    for caractere in _PONTUACAO_CPF:
+        digitos = np.char.replace(digitos, caractere, "")
+    outros = np.flatnonzero(~np.char.isdecimal(digitos) & (np.char.str_len(digitos) > 0))
+    if outros.size:
+        digitos = digitos.astype(object)
+        digitos[outros] = [_NAO_DIGITOS.sub("", cpf) for cpf in digitos[outros]]
+        digitos = digitos.astype(str)
+    tamanho_valido = np.char.str_len(digitos) == _TAMANHO_CPF
+
+    # Matriz N x 11 com os dígitos, a partir dos code points (CPFs de outro tamanho viram zeros)
+    completos = np.where(tamanho_valido, digitos, "0" * _TAMANHO_CPF).astype(f"U{_TAMANHO_CPF}")
+    matriz = completos.view(np.uint32).reshape(-1, _TAMANHO_CPF).astype(np.int64) - ord("0")
+    so_digitos_ascii = ((matriz >= 0) & (matriz <= 9)).all(axis=1)  # noqa: PLR2004
+
+    digito1 = matriz[:, :9] @ np.arange(10, 1, -1) * 10 % 11 % 10
+    digito2 = matriz[:, :10] @ np.arange(11, 1, -1) * 10 % 11 % 10
+    repetidos = (matriz == matriz[:, :1]).all(axis=1)  # Ex.: "11111111111"
+
+    mascara = (
+        tamanho_valido & so_digitos_ascii & ~repetidos & (digito1 == matriz[:, 9]) & (digito2 == matriz[:, 10])
+    )
+    return mascara, digitos
+
+
 # Função para validar Nome e Sobrenome
 def validar_nome_util(valor: str, info: ValidationInfo) -> str:
     campo = info.field_name  # 'nome' ou 'sobrenome'
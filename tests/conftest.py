@@ -7,8 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from qrcheck import database
 from qrcheck.app import app
-from qrcheck.database import get_session_async
+from qrcheck.database import get_session_async, get_session_leitura_async
 from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.EntityModels import table_registry
 from qrcheck.security import cria_token_acesso
@@ -65,11 +66,24 @@ def client(session: AsyncSession) -> Generator:
         return session
 
     app.dependency_overrides[get_session_async] = override_get_session
+    app.dependency_overrides[get_session_leitura_async] = override_get_session
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+async def engine_leitura_arquivo(tmp_path, monkeypatch) -> AsyncGenerator:
+    """Réplica de leitura em arquivo, com o pool da aplicação, para testes sem os overrides de sessão."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'leitura.db'}"
+    engine_leitura = create_async_engine(url, **database.opcoes_engine_async(url))
+    async with engine_leitura.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    monkeypatch.setattr(database, "engine_leitura", engine_leitura)
+    yield engine_leitura
+    await engine_leitura.dispose()
+
+
 @pytest.fixture
 async def admin_token(session: AsyncSession) -> str:
     """Cria um token de administrador para autenticação nos testes."""
@@ -0,0 +1,242 @@
+import csv
+import io
+import uuid
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.app import app
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.models.EventoModels import Evento, assoc_participante_evento
+from qrcheck.models.ParticipanteModels import (
+    DOCUMENTO_BUSCA_NOME,
+    NecessidadeEspecifica,
+    Ocupacao,
+    Participante,
+    assoc_participante_necessidade,
+)
+from qrcheck.routers import AdminParticipantesRouter
+from qrcheck.security import get_current_user
+from qrcheck.services import exportacao_service
+from qrcheck.services.busca_participante_service import consulta_busca
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def admin_override():
+    admin = Administrador(id=uuid.uuid4(), nome="Admin Teste", email="admin@teste.com", senha="senha123", data_criacao=None)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    yield admin
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+async def cria_participantes(session: AsyncSession, quantidade: int, inicio: int = 0):
+    ocupacao = Ocupacao(nome="Ocupação Paginação")
+    session.add(ocupacao)
+    await session.flush()
+
+    base = datetime(2025, 1, 1, 10, 0, 0, 123456)
+    for i in range(inicio, inicio + quantidade):
+        session.add(
+            Participante(
+                id_public=uuid.uuid4(),
+                nome="Participante",
+                sobrenome=f"Teste {i}",
+                cpf=f"9{i:010d}",
+                email=f"paginacao{i}@teste.com",
+                senha="hash",
+                data_nasc=date(1990, 1, 1),
+                ocupacao_id=ocupacao.id,
+                # Dois participantes por instante para exercitar o desempate por id
+                data_criacao=base + timedelta(minutes=i // 2),
+            )
+        )
+    await session.commit()
+
+
+async def test_lista_participantes_paginacao(client: TestClient, session: AsyncSession, admin_override):
+    await cria_participantes(session, 5)
+
+    # Modo página (LIMIT/OFFSET)
+    response = client.get("/admin/participantes/listar", params={"page": 1, "size": 2})
+    HTTP_OK = 200
+    assert response.status_code == HTTP_OK
+    data = response.json()
+    total = data["total"]
+    assert total >= 5  # noqa: PLR2004
+    assert data["page"] == 1
+    assert len(data["participantes"]) == 2  # noqa: PLR2004
+    assert data["proximo_cursor"]
+
+    # Modo cursor (keyset): percorre todas as páginas sem repetir participantes
+    vistos = [p["id"] for p in data["participantes"]]
+    chaves = [(p["data_criacao"], p["id"]) for p in data["participantes"]]
+    cursor = data["proximo_cursor"]
+    while cursor:
+        response = client.get(
+            "/admin/participantes/listar", params={"cursor": cursor, "size": 2, "incluir_total": False}
+        )
+        assert response.status_code == HTTP_OK
+        data = response.json()
+        assert data["total"] is None
+        assert data["page"] is None
+        vistos += [p["id"] for p in data["participantes"]]
+        chaves += [(p["data_criacao"], p["id"]) for p in data["participantes"]]
+        cursor = data["proximo_cursor"]
+
+    assert len(vistos) == len(set(vistos)) == total
+    assert chaves == sorted(chaves, reverse=True)
+
+
+async def test_lista_participantes_cursor_invalido(client: TestClient, admin_override):
+    response = client.get("/admin/participantes/listar", params={"cursor": "isso-nao-e-um-cursor"})
+    HTTP_BAD_REQUEST = 400
+    assert response.status_code == HTTP_BAD_REQUEST
+
+
+async def test_lista_participantes_json_rapido(client: TestClient, session: AsyncSession, admin_override, monkeypatch):
+    await cria_participantes(session, 3, inicio=100)
+    params = {"page": 1, "size": 5}
+    esperado = client.get("/admin/participantes/listar", params=params).json()
+
+    # O modo rápido (linhas -> bytes) produz o mesmo JSON do caminho com ParticipanteSchemaPrivate
+    monkeypatch.setattr(AdminParticipantesRouter.settings, "JSON_RAPIDO", True)
+    response = client.get("/admin/participantes/listar", params=params)
+    HTTP_OK = 200
+    assert response.status_code == HTTP_OK
+    assert response.json() == esperado
+
+
+async def test_busca_participantes(client: TestClient, session: AsyncSession, admin_override):
+    await cria_participantes(session, 3, inicio=500)
+
+    # Nome parcial: todas as palavras precisam aparecer
+    response = client.get("/admin/participantes/buscar", params={"q": "teste 501"})
+    assert response.status_code == HTTPStatus.OK
+    assert [p["sobrenome"] for p in response.json()] == ["Teste 501"]
+
+    # Prefixo do CPF (pontuação ignorada), em ordem de CPF
+    cpfs = [p["cpf"] for p in client.get("/admin/participantes/buscar", params={"q": "900.000.005"}).json()]
+    assert cpfs == ["90000000500", "90000000501", "90000000502"]
+
+    # CPF completo e e-mail
+    assert [p["cpf"] for p in client.get("/admin/participantes/buscar", params={"q": "90000000502"}).json()] == [
+        "90000000502"
+    ]
+    assert [p["email"] for p in client.get("/admin/participantes/buscar", params={"q": "Paginacao500@"}).json()] == [
+        "paginacao500@teste.com"
+    ]
+
+    assert client.get("/admin/participantes/buscar", params={"q": "x"}).status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_busca_participantes_postgresql_usa_indices():
+    def sql(termo):
+        consulta = consulta_busca(termo, "postgresql")
+        return " ".join(str(consulta.compile(dialect=postgresql.dialect())).split())
+
+    # Mesma expressão do índice GIN do nome completo
+    assert f"WHERE {DOCUMENTO_BUSCA_NOME} @@ to_tsquery('simple'" in sql("maria sil")
+    assert "ORDER BY ts_rank(" in sql("maria sil")
+    assert "participantes.email ILIKE" in sql("ana@exemplo")
+    assert "WHERE participantes.cpf LIKE %(cpf_1)s" in sql("123.456")
+
+
+async def cria_evento_com_inscritos(session: AsyncSession, quantidade: int, inicio: int):
+    await cria_participantes(session, quantidade, inicio=inicio)
+    participantes = (
+        await session.scalars(
+            select(Participante).where(Participante.cpf.in_([f"9{i:010d}" for i in range(inicio, inicio + quantidade)]))
+        )
+    ).all()
+    evento = Evento(
+        id_public=uuid.uuid4(),
+        nome="Evento Exportação",
+        categoria="Tecnologia",
+        subcategoria="Palestra",
+        descricao="Evento exportado",
+        data_inicio=date.today(),
+        data_fim=date.today(),
+        endereco=None,
+        espacos=[],
+    )
+    necessidade = NecessidadeEspecifica(nome=f"Intérprete de Libras {inicio}")
+    session.add_all([evento, necessidade])
+    await session.flush()
+    await session.execute(
+        insert(assoc_participante_evento), [{"participante_id": p.id, "evento_id": evento.id} for p in participantes]
+    )
+    await session.execute(
+        insert(assoc_participante_necessidade).values(
+            participante_id=participantes[0].id, necessidade_especifica_id=necessidade.id
+        )
+    )
+    await session.commit()
+    return evento, necessidade
+
+
+async def test_exporta_inscritos_csv(client: TestClient, session: AsyncSession, admin_override):
+    evento, necessidade = await cria_evento_com_inscritos(session, 3, inicio=600)
+
+    response = client.get(f"/admin/participantes/evento/{evento.id_public}/exportar")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/csv")
+    linhas = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [linha["cpf"] for linha in linhas] == ["90000000600", "90000000601", "90000000602"]
+    assert linhas[0]["necessidades"] == necessidade.nome
+    assert linhas[0]["ocupacao"] == "Ocupação Paginação"
+
+    assert client.get(f"/admin/participantes/evento/{uuid.uuid4()}/exportar").status_code == HTTPStatus.NOT_FOUND
+
+
+async def test_exporta_inscritos_csv_neutraliza_formulas(client: TestClient, session: AsyncSession, admin_override):
+    evento, _ = await cria_evento_com_inscritos(session, 3, inicio=650)
+    formulas = ['=HYPERLINK("http://exemplo.com","x")', "+1+1", "@SOMA(1;1)"]
+    for i, nome in zip(range(650, 653), formulas):
+        await session.execute(update(Participante).where(Participante.cpf == f"9{i:010d}").values(nome=nome))
+    await session.commit()
+
+    response = client.get(f"/admin/participantes/evento/{evento.id_public}/exportar")
+    linhas = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [linha["nome"] for linha in linhas] == [f"'{nome}" for nome in formulas]
+    assert linhas[0]["sobrenome"] == "Teste 650"  # Texto comum não é alterado
+
+
+async def test_exporta_inscritos_parquet(client: TestClient, session: AsyncSession, admin_override, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    evento, _ = await cria_evento_com_inscritos(session, 5, inicio=700)
+    monkeypatch.setattr(exportacao_service, "LINHAS_POR_LOTE", 2)
+
+    response = client.get(f"/admin/participantes/evento/{evento.id_public}/exportar", params={"formato": "parquet"})
+    assert response.status_code == HTTPStatus.OK
+    arquivo = pq.ParquetFile(io.BytesIO(response.content))
+    assert arquivo.metadata.num_row_groups == 3  # Um row group por lote  # noqa: PLR2004
+    tabela = arquivo.read()
+    assert tabela.column("cpf").to_pylist() == [f"9{i:010d}" for i in range(700, 705)]
+    assert tabela.column("data_nasc").to_pylist()[0] == date(1990, 1, 1)
+
+
+async def test_exportacao_devolve_a_conexao_ao_pool(engine_leitura_arquivo, admin_override):
+    async with AsyncSession(engine_leitura_arquivo, expire_on_commit=False) as session:
+        evento, _ = await cria_evento_com_inscritos(session, 3, inicio=800)
+
+    # Sem override: a sessão da requisição vem de get_session_leitura_async, como em produção
+    with TestClient(app) as client:
+        response = client.get(f"/admin/participantes/evento/{evento.id_public}/exportar")
+    assert response.status_code == HTTPStatus.OK
+    linhas = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [linha["cpf"] for linha in linhas] == ["90000000800", "90000000801", "90000000802"]
+    assert engine_leitura_arquivo.pool.checkedout() == 0
+
+    # Como no FastAPI 0.115: a sessão da requisição já foi fechada quando o corpo começa a ser gerado
+    async with AsyncSession(engine_leitura_arquivo) as session:
+        partes = await exportacao_service.exporta_inscritos(session, evento.id_public, exportacao_service.FORMATO_CSV)
+    corpo = b"".join([parte async for parte in partes])
+    assert corpo.decode("utf-8-sig").count("\n") == 4  # Cabeçalho + 3 inscritos  # noqa: PLR2004
+    assert engine_leitura_arquivo.pool.checkedout() == 0
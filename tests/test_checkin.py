@@ -0,0 +1,282 @@
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from qrcheck.app import app
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.models.EventoModels import Evento, agora_utc, assoc_participante_evento, inscricoes_canceladas_evento
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao, Participante, assoc_participante_necessidade
+from qrcheck.security import get_current_user
+from qrcheck.services import snapshot_service
+from qrcheck.services.checkin_service import gera_token_checkin
+from qrcheck.services.inscricao_service import cancelar_inscricao
+
+pytestmark = pytest.mark.asyncio
+
+HTTP_OK = 200
+HTTP_UNAUTHORIZED = 401
+HTTP_CONFLICT = 409
+
+
+async def cria_inscricao(session: AsyncSession, quantidade: int = 1, inicio: int = 0):
+    ocupacao = Ocupacao(nome="Ocupação Check-in")
+    evento = Evento(
+        id_public=uuid.uuid4(),
+        nome="Evento Check-in",
+        categoria="Tecnologia",
+        subcategoria="Palestra",
+        descricao="Evento com check-in",
+        data_inicio=date.today(),
+        data_fim=date.today(),
+        endereco=None,
+        espacos=[],
+    )
+    session.add_all([ocupacao, evento])
+    await session.flush()
+    participantes = [
+        Participante(
+            id_public=uuid.uuid4(),
+            nome="Check",
+            sobrenome=f"In {i}",
+            cpf=f"6{i:010d}",
+            email=f"checkin{i}@teste.com",
+            senha="hash",
+            data_nasc=date(1990, 1, 1),
+            ocupacao_id=ocupacao.id,
+            data_criacao=None,
+        )
+        for i in range(inicio, inicio + quantidade)
+    ]
+    session.add_all(participantes)
+    await session.flush()
+    await session.execute(
+        insert(assoc_participante_evento),
+        [{"participante_id": p.id, "evento_id": evento.id} for p in participantes],
+    )
+    await session.commit()
+    return participantes, evento
+
+
+async def test_checkin_com_qrcode(client: TestClient, session: AsyncSession):
+    (participante,), evento = await cria_inscricao(session)
+    admin = Administrador(id=uuid.uuid4(), nome="Portaria", email="portaria@teste.com", senha="hash", data_criacao=None)
+
+    try:
+        app.dependency_overrides[get_current_user] = lambda: participante
+        response = client.get(f"/checkin/{evento.id_public}/qrcode")
+        assert response.status_code == HTTP_OK
+        token = response.json()["token"]
+        assert len(token) < 80  # noqa: PLR2004
+
+        app.dependency_overrides[get_current_user] = lambda: admin
+
+        # Primeiro check-in: assinatura conferida em memória e um único comando no banco
+        comandos = []
+
+        def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+            comandos.append(statement)
+
+        sync_engine = session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", conta_comandos)
+        try:
+            response = client.post(f"/checkin/{evento.id_public}", json={"token": token})
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", conta_comandos)
+        assert response.status_code == HTTP_OK
+        assert response.json()["status"] == "registrado"
+        assert len(comandos) == 1
+
+        # Leitura repetida do mesmo QR Code: nada gravado, nenhum commit
+        commits = []
+
+        def conta_commits(sessao):
+            commits.append(sessao)
+
+        event.listen(session.sync_session, "after_commit", conta_commits)
+        try:
+            response = client.post(f"/checkin/{evento.id_public}", json={"token": token})
+        finally:
+            event.remove(session.sync_session, "after_commit", conta_commits)
+        assert response.json()["status"] == "ja_registrado"
+        assert not commits
+
+        # Token adulterado, de outro evento ou expirado
+        adulterado = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+        assert client.post(f"/checkin/{evento.id_public}", json={"token": adulterado}).status_code == HTTP_UNAUTHORIZED
+        assert client.post(f"/checkin/{uuid.uuid4()}", json={"token": token}).status_code == HTTP_CONFLICT
+        expirado = gera_token_checkin(
+            participante.id_public, evento.id_public, datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+        assert client.post(f"/checkin/{evento.id_public}", json={"token": expirado}).status_code == HTTP_UNAUTHORIZED
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+async def test_checkin_em_lote(client: TestClient, session: AsyncSession):
+    participantes, evento = await cria_inscricao(session, quantidade=4, inicio=100)
+    admin = Administrador(id=uuid.uuid4(), nome="Portaria", email="portaria@teste.com", senha="hash", data_criacao=None)
+    expira_em = datetime.now(timezone.utc) + timedelta(days=1)
+    tokens = [gera_token_checkin(p.id_public, evento.id_public, expira_em) for p in participantes]
+    # Horário da leitura no leitor (com fuso): gravado em UTC
+    lido_em = (datetime.now(timezone.utc) - timedelta(minutes=5)).replace(microsecond=0)
+
+    try:
+        app.dependency_overrides[get_current_user] = lambda: admin
+        # Participante 0 já fez check-in pela rota individual
+        client.post(f"/checkin/{evento.id_public}", json={"token": tokens[0]})
+
+        leituras = [
+            {"token": tokens[0]},  # já registrado
+            # Registrado com o horário da leitura
+            {"token": tokens[1], "lido_em": lido_em.astimezone(timezone(timedelta(hours=-3))).isoformat()},
+            {"token": tokens[1]},  # repetido no mesmo lote
+            {"token": tokens[2]},  # registrado
+            {"token": "invalido"},
+            {"token": gera_token_checkin(participantes[3].id_public, uuid.uuid4(), expira_em)},  # outro evento
+            {"token": gera_token_checkin(uuid.uuid4(), evento.id_public, expira_em)},  # não inscrito
+        ]
+        response = client.post(f"/checkin/{evento.id_public}/lote", json={"leituras": leituras})
+        assert response.status_code == HTTP_OK
+        data = response.json()
+        assert [item["status"] for item in data["itens"]] == [
+            "ja_registrado", "registrado", "duplicado", "registrado", "invalido", "outro_evento", "nao_inscrito",
+        ]
+        assert data["registrados"] == 2  # noqa: PLR2004
+
+        data_checkin = await session.scalar(
+            select(assoc_participante_evento.c.data_checkin).where(
+                assoc_participante_evento.c.participante_id == participantes[1].id
+            )
+        )
+        assert data_checkin == lido_em.replace(tzinfo=None)
+
+        # Lote só com check-ins novos: um único comando no banco
+        comandos = []
+
+        def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+            comandos.append(statement)
+
+        sync_engine = session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", conta_comandos)
+        try:
+            response = client.post(f"/checkin/{evento.id_public}/lote", json={"leituras": [{"token": tokens[3]}]})
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", conta_comandos)
+        assert response.json()["itens"][0]["status"] == "registrado"
+        assert len(comandos) == 1
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+async def test_checkin_em_lote_limita_horario_da_leitura(client: TestClient, session: AsyncSession):
+    participantes, evento = await cria_inscricao(session, quantidade=3, inicio=300)
+    admin = Administrador(id=uuid.uuid4(), nome="Portaria", email="portaria@teste.com", senha="hash", data_criacao=None)
+    agora = datetime.now(timezone.utc)
+    vencido = gera_token_checkin(participantes[0].id_public, evento.id_public, agora - timedelta(days=30))
+    valido = gera_token_checkin(participantes[1].id_public, evento.id_public, agora + timedelta(days=1))
+    futuro = gera_token_checkin(participantes[2].id_public, evento.id_public, agora + timedelta(days=1))
+
+    try:
+        app.dependency_overrides[get_current_user] = lambda: admin
+        leituras = [
+            # Leituras retroativas (antes do início do evento) não ressuscitam tokens vencidos
+            {"token": vencido, "lido_em": (agora - timedelta(days=31)).isoformat()},
+            {"token": valido, "lido_em": (agora - timedelta(days=31)).isoformat()},
+            # Relógio do leitor adiantado: vale o horário do servidor
+            {"token": futuro, "lido_em": (agora + timedelta(days=365)).isoformat()},
+        ]
+        response = client.post(f"/checkin/{evento.id_public}/lote", json={"leituras": leituras})
+        assert [item["status"] for item in response.json()["itens"]] == ["expirado", "expirado", "registrado"]
+
+        data_checkin = await session.scalar(
+            select(assoc_participante_evento.c.data_checkin).where(
+                assoc_participante_evento.c.participante_id == participantes[2].id
+            )
+        )
+        assert data_checkin <= datetime.now(timezone.utc).replace(tzinfo=None)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+async def test_snapshot_dos_inscritos(client: TestClient, session: AsyncSession):
+    participantes, evento = await cria_inscricao(session, quantidade=3, inicio=200)
+    necessidade = NecessidadeEspecifica(nome="Cadeira de rodas (snapshot)")
+    session.add(necessidade)
+    await session.flush()
+    await session.execute(
+        insert(assoc_participante_necessidade).values(
+            participante_id=participantes[0].id, necessidade_especifica_id=necessidade.id
+        )
+    )
+    await session.commit()
+    admin = Administrador(id=uuid.uuid4(), nome="Portaria", email="portaria@teste.com", senha="hash", data_criacao=None)
+
+    def linhas(response):
+        return [json.loads(linha) for linha in response.text.splitlines()]
+
+    try:
+        app.dependency_overrides[get_current_user] = lambda: admin
+        response = client.get(f"/checkin/{evento.id_public}/snapshot")
+        assert response.status_code == HTTP_OK
+        assert response.headers["content-encoding"] == "gzip"
+        cabecalho, *inscritos = linhas(response)
+        assert cabecalho["completo"]
+        assert cabecalho["versao"] == int(response.headers["x-snapshot-versao"])
+        assert {i["participante"]: i["necessidades"] for i in inscritos} == {
+            str(participantes[0].id_public): [necessidade.id],
+            str(participantes[1].id_public): [],
+            str(participantes[2].id_public): [],
+        }
+        assert inscritos[0]["nome"] == "Check In 200"
+
+        # Atualização incremental: o cancelamento chega como remoção
+        await cancelar_inscricao(session, evento.id_public, participantes[1].id)
+        response = client.get(f"/checkin/{evento.id_public}/snapshot", params={"desde": cabecalho["versao"]})
+        cabecalho_delta, *alteracoes = linhas(response)
+        assert not cabecalho_delta["completo"]
+        assert {"participante": str(participantes[1].id_public), "removido": True} in alteracoes
+        assert str(participantes[1].id_public) not in [a["participante"] for a in alteracoes if "removido" not in a]
+
+        # Evento inexistente: 404 antes do streaming
+        assert client.get(f"/checkin/{uuid.uuid4()}/snapshot").status_code == 404  # noqa: PLR2004
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+async def test_snapshot_devolve_a_conexao_ao_pool(engine_leitura_arquivo):
+    async with AsyncSession(engine_leitura_arquivo, expire_on_commit=False) as session:
+        _, evento = await cria_inscricao(session, quantidade=2, inicio=300)
+    admin = Administrador(id=uuid.uuid4(), nome="Portaria", email="portaria.pool@teste.com", senha="hash", data_criacao=None)
+
+    try:
+        # Sem override: a sessão da requisição vem de get_session_leitura_async, como em produção
+        app.dependency_overrides[get_current_user] = lambda: admin
+        with TestClient(app) as client:
+            response = client.get(f"/checkin/{evento.id_public}/snapshot")
+        assert response.status_code == HTTP_OK
+        assert len(response.text.splitlines()) == 3  # Cabeçalho + 2 inscritos  # noqa: PLR2004
+        assert engine_leitura_arquivo.pool.checkedout() == 0
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    # Como no FastAPI 0.115: a sessão da requisição já foi fechada quando o corpo começa a ser gerado
+    async with AsyncSession(engine_leitura_arquivo) as session:
+        _, linhas = await snapshot_service.snapshot_inscritos(session, evento.id_public)
+    assert len(b"".join([parte async for parte in linhas]).splitlines()) == 3  # noqa: PLR2004
+    assert engine_leitura_arquivo.pool.checkedout() == 0
+
+
+def test_datas_das_inscricoes_em_utc_no_postgresql():
+    # Mesmo relógio (UTC, sem fuso) na versão do snapshot e nas datas gravadas pelo banco,
+    # independente do TimeZone da sessão do PostgreSQL
+    dialeto = postgresql.dialect()
+    assert str(select(agora_utc()).compile(dialect=dialeto)) == "SELECT timezone('utc', now()) AS anon_1"
+    ddl = str(CreateTable(inscricoes_canceladas_evento).compile(dialect=dialeto))
+    assert "data_cancelamento TIMESTAMP WITHOUT TIME ZONE DEFAULT timezone('utc', now()) NOT NULL" in ddl
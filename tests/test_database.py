@@ -0,0 +1,80 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from qrcheck import database
+from qrcheck.app import app
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.security import get_current_user
+
+pytestmark = pytest.mark.asyncio
+
+
+def requisicao(sub=None):
+    payload = {"sub": sub} if sub else None
+    return SimpleNamespace(state=SimpleNamespace(token_payload=payload), client=SimpleNamespace(host="10.0.0.1"))
+
+
+async def test_leitura_usa_primario_apos_escrita(monkeypatch):
+    replica = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(database, "engine_leitura", replica)
+    database.escritas_recentes.limpa()
+
+    async for session in database.get_session_leitura_async(requisicao("usuario-1")):
+        assert session.bind is replica
+
+    # Escrita confirmada no primário: o mesmo cliente passa a ler do primário
+    async for session in database.get_session_async(requisicao("usuario-1")):
+        await session.commit()
+
+    async for session in database.get_session_leitura_async(requisicao("usuario-1")):
+        assert session.bind is database.engine_async
+
+    # Outros clientes continuam na réplica
+    async for session in database.get_session_leitura_async(requisicao("usuario-2")):
+        assert session.bind is replica
+
+    database.escritas_recentes.limpa()
+
+
+async def test_leitura_sem_replica_usa_primario():
+    assert database.engine_leitura is database.engine_async
+    async for session in database.get_session_leitura_async(requisicao()):
+        assert session.bind is database.engine_async
+
+
+async def test_metricas_do_pool(client: TestClient, tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    engine = create_async_engine(url, **database.opcoes_engine_async(url))
+    assert isinstance(engine.pool, database.PoolComMetricas)
+    url_leitura = f"sqlite+aiosqlite:///{tmp_path / 'pool_leitura.db'}"
+    engine_leitura = create_async_engine(url_leitura, **database.opcoes_engine_async(url_leitura))
+    monkeypatch.setattr(database, "engine_async", engine)
+    monkeypatch.setattr(database, "engine_leitura", engine)
+    admin = Administrador(id=uuid.uuid4(), nome="Admin", email="admin.pool@teste.com", senha="hash", data_criacao=None)
+
+    # Uma conexão além do pool_size: entra no overflow
+    conexoes = [await engine.connect() for _ in range(database.settings.DB_POOL_SIZE + 1)]
+    try:
+        app.dependency_overrides[get_current_user] = lambda: admin
+        assert client.get("/admin/metricas/banco").json()["leitura"] is None  # Sem réplica
+
+        monkeypatch.setattr(database, "engine_leitura", engine_leitura)
+        async with engine_leitura.connect():
+            pools = client.get("/admin/metricas/banco").json()
+        estatisticas = pools["primario"]
+        assert pools["leitura"]["em_uso"] == 1
+        assert pools["leitura"]["checkouts"] == 1
+        assert estatisticas["em_uso"] == database.settings.DB_POOL_SIZE + 1
+        assert estatisticas["overflow"] == 1
+        assert estatisticas["checkouts"] == database.settings.DB_POOL_SIZE + 1
+        assert estatisticas["timeouts"] == 0
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        for conexao in conexoes:
+            await conexao.close()
+        await engine.dispose()
+        await engine_leitura.dispose()
@@ -0,0 +1,86 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.EventoModels import Evento
+from qrcheck.services import evento_service
+from qrcheck.services.evento_service import invalidar_eventos
+from qrcheck.utils import cache_utils
+
+pytestmark = pytest.mark.asyncio
+
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+
+
+def cria_evento(nome: str, data_fim: date) -> Evento:
+    return Evento(
+        id_public=uuid.uuid4(),
+        nome=nome,
+        categoria="Tecnologia",
+        subcategoria="Palestra",
+        descricao="Evento de teste",
+        data_inicio=date.today(),
+        data_fim=data_fim,
+        endereco=None,
+        espacos=[],
+    )
+
+
+def nomes(response) -> list[str]:
+    return [evento["nome"] for evento in response.json()]
+
+
+async def test_listar_eventos_cache(client: TestClient, session: AsyncSession, monkeypatch):
+    invalidar_eventos()
+    evento = cria_evento("Evento Cache", date.today() + timedelta(days=1))
+    session.add(evento)
+    await session.commit()
+
+    response = client.get("/eventos/")
+    assert response.status_code == HTTP_OK
+    assert "Evento Cache" in nomes(response)
+    etag = response.headers["etag"]
+
+    # Requisição em cache: nenhum comando SQL
+    comandos = []
+
+    def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+        comandos.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", conta_comandos)
+    try:
+        response = client.get("/eventos/", headers={"If-None-Match": etag})
+        assert response.status_code == HTTP_NOT_MODIFIED
+        assert comandos == []
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", conta_comandos)
+
+    # Alteração em um evento confirmada: o cache é renovado
+    evento.inscricoes_abertas = False
+    await session.commit()
+    response = client.get("/eventos/", headers={"If-None-Match": etag})
+    assert response.status_code == HTTP_OK
+    assert "Evento Cache" not in nomes(response)
+
+    # Virada de data: o evento que terminou sai da lista sem nenhuma escrita
+    evento.inscricoes_abertas = True
+    await session.commit()
+    assert "Evento Cache" in nomes(client.get("/eventos/"))
+
+    class Amanha(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=2)
+
+    monkeypatch.setattr(cache_utils, "date", Amanha)
+    monkeypatch.setattr(evento_service, "date", Amanha)
+    assert "Evento Cache" not in nomes(client.get("/eventos/"))
+
+    await session.delete(evento)
+    await session.commit()
@@ -0,0 +1,38 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from qrcheck.services.hash_service import ServicoHash
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_servico_hash_gera_e_verifica():
+    servico = ServicoHash(max_workers=2, max_fila=8)
+    try:
+        senha_hash = await servico.gera_hash("Miojo*123")
+        assert await servico.verifica_senha("Miojo*123", senha_hash)
+        assert not await servico.verifica_senha("Outra*123", senha_hash)
+
+        metricas = servico.get_metricas()
+        assert metricas["total"] == 3  # noqa: PLR2004
+        assert metricas["pendentes"] == 0
+        assert metricas["duracao_max_ms"] > 0
+    finally:
+        servico.encerrar()
+
+
+async def test_servico_hash_fila_cheia():
+    servico = ServicoHash(max_workers=1, max_fila=1)
+    try:
+        resultados = await asyncio.gather(
+            servico.gera_hash("Miojo*123"), servico.gera_hash("Miojo*123"), return_exceptions=True
+        )
+        recusadas = [r for r in resultados if isinstance(r, HTTPException)]
+        assert len(recusadas) == 1
+        assert recusadas[0].status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert servico.get_metricas()["rejeitadas"] == 1
+    finally:
+        servico.encerrar()
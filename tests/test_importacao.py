@@ -0,0 +1,156 @@
+import asyncio
+import io
+import uuid
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from qrcheck.app import app
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.models.EntityModels import table_registry
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao, Participante
+from qrcheck.security import get_current_user
+from qrcheck.services import importacao_service
+from qrcheck.services.hash_service import ServicoHash
+
+pytestmark = pytest.mark.asyncio
+
+CABECALHO = ["nome", "sobrenome", "cpf", "email", "senha", "data_nasc", "ocupacao_id", "necessidades_especificas"]
+
+
+# CPF válido (dígitos verificadores calculados) a partir dos 9 primeiros dígitos
+def gera_cpf(base: str) -> str:
+    for _ in range(2):
+        soma = sum(int(digito) * peso for digito, peso in zip(base, range(len(base) + 1, 1, -1)))
+        base += str((soma * 10) % 11 % 10)
+    return base
+
+
+@pytest.fixture
+def importacao(monkeypatch):
+    admin = Administrador(id=uuid.uuid4(), nome="Admin", email="admin.importacao@teste.com", senha="hash", data_criacao=None)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    # Nos testes o hash roda em threads (sem criar processos)
+    monkeypatch.setattr(importacao_service, "servico_hash_importacao", ServicoHash("thread", 2, 500))
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+async def cria_catalogos(session: AsyncSession, sufixo: str):
+    ocupacao = Ocupacao(nome=f"Ocupação Importação {sufixo}")
+    necessidade = NecessidadeEspecifica(nome=f"Necessidade Importação {sufixo}")
+    session.add_all([ocupacao, necessidade])
+    await session.commit()
+    return ocupacao, necessidade
+
+
+async def test_importa_participantes_csv(client: TestClient, session: AsyncSession, importacao):
+    ocupacao, necessidade = await cria_catalogos(session, "csv")
+    existente = Participante(
+        id_public=uuid.uuid4(),
+        nome="Já",
+        sobrenome="Cadastrado",
+        cpf=gera_cpf("811000001"),
+        email="ja.cadastrado@teste.com",
+        senha="hash",
+        data_nasc=date(1990, 1, 1),
+        ocupacao_id=ocupacao.id,
+        data_criacao=None,
+    )
+    session.add(existente)
+    await session.commit()
+
+    linhas = [
+        [
+            "Ana", "Importada", gera_cpf("811000002"), "ana.importada@teste.com", "Senha*123", "1990-05-01",
+            ocupacao.id, necessidade.id,
+        ],
+        ["Bruno", "Importado", gera_cpf("811000003"), "bruno.importado@teste.com", "Senha*123", "15/03/1995", ocupacao.id, ""],
+        ["Carla", "Invalida", "12345678900", "carla@teste.com", "Senha*123", "1990-01-01", ocupacao.id, ""],
+        ["Davi", "Repetido", gera_cpf("811000002"), "davi@teste.com", "Senha*123", "1990-01-01", ocupacao.id, ""],
+        ["Eva", "Existente", gera_cpf("811000004"), "ja.cadastrado@teste.com", "Senha*123", "1990-01-01", ocupacao.id, ""],
+        ["Fabio", "Sem Ocupacao", gera_cpf("811000005"), "fabio@teste.com", "Senha*123", "1990-01-01", 999999, ""],
+    ]
+    conteudo = "\n".join(";".join(str(valor) for valor in linha) for linha in [CABECALHO, *linhas])
+    # Linha em branco no meio do arquivo: os erros apontam a linha real do arquivo
+    conteudo = conteudo.replace("\nCarla;", "\n\nCarla;")
+
+    response = client.post(
+        "/admin/participantes/importar", files={"arquivo": ("parceiros.csv", conteudo.encode(), "text/csv")}
+    )
+    assert response.status_code == HTTPStatus.OK
+    resultado = response.json()
+    assert resultado["total"] == len(linhas)
+    assert resultado["importados"] == 2  # noqa: PLR2004
+    assert {erro["linha"]: erro["erros"] for erro in resultado["erros"]} == {
+        5: ["O CPF informado é inválido."],
+        6: ["CPF repetido no arquivo."],
+        7: ["Email já cadastrado."],
+        8: ["O ID da ocupação não existe."],
+    }
+
+    ana = await session.scalar(select(Participante).where(Participante.email == "ana.importada@teste.com"))
+    await session.refresh(ana, ["necessidades_especificas"])
+    assert [n.id for n in ana.necessidades_especificas] == [necessidade.id]
+    assert ana.senha.startswith("$argon2")
+    bruno = await session.scalar(select(Participante).where(Participante.email == "bruno.importado@teste.com"))
+    assert bruno.data_nasc == date(1995, 3, 15)
+
+
+async def test_importa_participantes_xlsx(client: TestClient, session: AsyncSession, importacao):
+    openpyxl = pytest.importorskip("openpyxl")
+    ocupacao, _ = await cria_catalogos(session, "xlsx")
+
+    planilha = openpyxl.Workbook()
+    aba = planilha.active
+    aba.append(CABECALHO)
+    cpf = gera_cpf("011000006")
+    # CPF numérico (sem o zero à esquerda) e data como célula de data
+    aba.append(["Gil", "Planilha", int(cpf), "gil.planilha@teste.com", "Senha*123", date(1992, 7, 9), ocupacao.id, None])
+    aba.append([])  # Linha vazia: pulada, sem deslocar o número das seguintes
+    aba.append(["Hugo", "Planilha", "12345678900", "hugo.planilha@teste.com", "Senha*123", date(1992, 7, 9), ocupacao.id])
+    arquivo = io.BytesIO()
+    planilha.save(arquivo)
+
+    response = client.post(
+        "/admin/participantes/importar", files={"arquivo": ("parceiros.xlsx", arquivo.getvalue(), "application/octet-stream")}
+    )
+    assert response.json() == {"total": 2, "importados": 1, "erros": [{"linha": 4, "erros": ["O CPF informado é inválido."]}]}
+    assert await session.scalar(select(Participante.cpf).where(Participante.email == "gil.planilha@teste.com")) == cpf
+
+
+async def test_importacoes_simultaneas_nao_sao_recusadas(tmp_path, monkeypatch):
+    # Pool de hash com fila de exatamente um lote: as importações simultâneas esperam a vez
+    lote = 3
+    monkeypatch.setattr(importacao_service.settings, "IMPORTACAO_LOTE", lote)
+    monkeypatch.setattr(importacao_service, "servico_hash_importacao", ServicoHash("thread", 2, lote))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'importacao.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            ocupacao, _ = await cria_catalogos(session, "simultanea")
+
+        async def importa(prefixo: str, sobrenome: str):
+            linhas = [
+                ["Pessoa", sobrenome, gera_cpf(f"{prefixo}{i:06d}"), f"{prefixo}.{i}@teste.com", "Senha*123",
+                 "1990-01-01", ocupacao.id, ""]
+                for i in range(2 * lote)
+            ]
+            conteudo = "\n".join(";".join(str(valor) for valor in linha) for linha in [CABECALHO, *linhas])
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                return await importacao_service.importa_participantes(
+                    session, io.BytesIO(conteudo.encode()), importacao_service.FORMATO_CSV
+                )
+
+        resultados = await asyncio.gather(importa("821", "Primeira"), importa("822", "Segunda"))
+        assert [r["importados"] for r in resultados] == [2 * lote, 2 * lote]
+        assert all(not r["erros"] for r in resultados)
+        async with AsyncSession(engine) as session:
+            assert await session.scalar(select(func.count()).select_from(Participante)) == 4 * lote
+    finally:
+        await engine.dispose()
@@ -0,0 +1,120 @@
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from qrcheck.models.EntityModels import table_registry
+from qrcheck.models.EventoModels import Evento, assoc_participante_evento
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao, Participante
+
+pytestmark = pytest.mark.asyncio
+
+# Banco PostgreSQL descartável (ex.: postgresql+asyncpg://...): as tabelas são criadas e removidas pelo teste
+URL_POSTGRESQL = os.getenv("TEST_DATABASE_URL_POSTGRESQL")
+
+
+# Os testes no SQLite cobrem só os índices equivalentes do fallback (sem INCLUDE e, no parcial, com
+# sqlite_where). Os índices do PostgreSQL (INCLUDE, parcial) são conferidos com EXPLAIN em
+# test_consultas_frequentes_usam_indice_no_postgresql, que só roda com TEST_DATABASE_URL_POSTGRESQL.
+
+
+# Plano de execução (EXPLAIN QUERY PLAN do SQLite) de uma consulta
+async def plano(session: AsyncSession, consulta) -> str:
+    sql = consulta.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    conn = await session.connection()
+    linhas = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+    return "\n".join(linha[-1] for linha in linhas)
+
+
+@pytest.mark.parametrize(
+    ("consulta", "uso_do_indice"),
+    [
+        (
+            select(assoc_participante_evento.c.participante_id).where(assoc_participante_evento.c.evento_id == 1),
+            "INDEX ix_assoc_participante_evento_evento",
+        ),
+        (
+            select(Participante.id).order_by(Participante.data_criacao.desc(), Participante.id.desc()).limit(20),
+            "INDEX ix_participantes_data_criacao_id",
+        ),
+        (
+            select(Evento.id).where(Evento.inscricoes_abertas.is_(True), Evento.data_fim >= date(2026, 1, 1)),
+            "INDEX ix_eventos_abertos_data_fim",
+        ),
+        (
+            select(Ocupacao.id).where(Ocupacao.nome == "Estudante", Ocupacao.is_custom.is_(True)),
+            "INDEX ix_ocupacoes_nome_is_custom",
+        ),
+        (
+            select(NecessidadeEspecifica.nome, NecessidadeEspecifica.id, NecessidadeEspecifica.is_custom).where(
+                NecessidadeEspecifica.nome.in_(["Libras", "Braille"])
+            ),
+            "SEARCH necessidades_especificas USING INDEX",  # Índice do UNIQUE(nome)
+        ),
+    ],
+    ids=["inscritos_do_evento", "listagem_admin", "eventos_abertos", "ocupacao_por_nome", "necessidades_por_nome"],
+)
+async def test_consultas_frequentes_usam_indice(session: AsyncSession, consulta, uso_do_indice):
+    resultado = await plano(session, consulta)
+    assert uso_do_indice in resultado
+    assert "TEMP B-TREE" not in resultado
+
+
+@pytest.fixture
+async def engine_postgresql():
+    if not URL_POSTGRESQL:
+        pytest.skip("TEST_DATABASE_URL_POSTGRESQL não configurada")
+    engine = create_async_engine(URL_POSTGRESQL)
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+    await engine.dispose()
+
+
+# Plano de execução (EXPLAIN do PostgreSQL). Sem seq scan: as tabelas do teste são pequenas demais para
+# o planejador preferir um índice, e o que se confere é que existe um índice que atende a consulta.
+async def plano_postgresql(engine, consulta) -> str:
+    sql = consulta.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        linhas = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+        return "\n".join(linha[0] for linha in linhas)
+
+
+@pytest.mark.postgresql
+@pytest.mark.parametrize(
+    ("consulta", "uso_do_indice"),
+    [
+        (
+            # INCLUDE (data_inscricao, data_checkin): a consulta é respondida só pelo índice
+            select(
+                assoc_participante_evento.c.participante_id,
+                assoc_participante_evento.c.data_inscricao,
+                assoc_participante_evento.c.data_checkin,
+            ).where(assoc_participante_evento.c.evento_id == 1),
+            "Index Only Scan using ix_assoc_participante_evento_evento",
+        ),
+        (
+            select(Participante.id).order_by(Participante.data_criacao.desc(), Participante.id.desc()).limit(20),
+            "Scan Backward using ix_participantes_data_criacao_id",
+        ),
+        (
+            # Índice parcial (WHERE inscricoes_abertas)
+            select(Evento.id).where(Evento.inscricoes_abertas.is_(True), Evento.data_fim >= date(2026, 1, 1)),
+            "ix_eventos_abertos_data_fim",
+        ),
+        (
+            select(Ocupacao.id).where(Ocupacao.nome == "Estudante", Ocupacao.is_custom.is_(True)),
+            "ix_ocupacoes_nome_is_custom",
+        ),
+    ],
+    ids=["inscritos_do_evento", "listagem_admin", "eventos_abertos", "ocupacao_por_nome"],
+)
+async def test_consultas_frequentes_usam_indice_no_postgresql(engine_postgresql, consulta, uso_do_indice):
+    resultado = await plano_postgresql(engine_postgresql, consulta)
+    assert uso_do_indice in resultado
+    assert "Sort" not in resultado
@@ -0,0 +1,253 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from qrcheck.models.EntityModels import table_registry
+from qrcheck.models.EventoModels import (
+    Evento,
+    assoc_participante_evento,
+    inscricoes_idempotentes,
+    lista_espera_evento,
+)
+from qrcheck.models.ParticipanteModels import Ocupacao, Participante
+from qrcheck.services.inscricao_service import (
+    INSCRITO,
+    JA_INSCRITO,
+    LISTA_ESPERA,
+    altera_capacidade,
+    cancelar_inscricao,
+    comando_inscricao,
+    inscrever_idempotente,
+    inscrever_participante,
+)
+
+pytestmark = pytest.mark.asyncio
+
+CAPACIDADE = 10
+PARTICIPANTES = 60
+
+
+@pytest.fixture
+async def engine_arquivo(tmp_path):
+    # Banco em arquivo com várias conexões: as inscrições concorrem de verdade pelo contador
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'inscricoes.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def cria_evento_e_participantes(engine, capacidade: int, quantidade: int):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        ocupacao = Ocupacao(nome="Ocupação Inscrição")
+        evento = Evento(
+            id_public=uuid.uuid4(),
+            nome="Evento Lotado",
+            categoria="Tecnologia",
+            subcategoria="Palestra",
+            descricao="Evento com vagas limitadas",
+            data_inicio=date.today(),
+            data_fim=date.today(),
+            endereco=None,
+            espacos=[],
+            capacidade=capacidade,
+        )
+        session.add_all([ocupacao, evento])
+        await session.flush()
+        participantes = [
+            Participante(
+                id_public=uuid.uuid4(),
+                nome="Participante",
+                sobrenome=f"Concorrente {i}",
+                cpf=f"7{i:010d}",
+                email=f"concorrente{i}@teste.com",
+                senha="hash",
+                data_nasc=date(1990, 1, 1),
+                ocupacao_id=ocupacao.id,
+                data_criacao=None,
+            )
+            for i in range(quantidade)
+        ]
+        session.add_all(participantes)
+        await session.commit()
+        return evento, [p.id for p in participantes]
+
+
+async def test_inscricoes_concorrentes_respeitam_capacidade(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, CAPACIDADE, PARTICIPANTES)
+
+    async def inscreve(participante_id):
+        async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+            return await inscrever_participante(session, evento.id_public, participante_id)
+
+    resultados = await asyncio.gather(*(inscreve(i) for i in ids))
+    status = [r["status"] for r in resultados]
+    assert status.count(INSCRITO) == CAPACIDADE
+    assert status.count(LISTA_ESPERA) == PARTICIPANTES - CAPACIDADE
+
+    async with AsyncSession(engine_arquivo) as session:
+        vagas = await session.scalar(select(Evento.vagas_ocupadas).where(Evento.id == evento.id))
+        inscritos = await session.scalar(select(func.count()).select_from(assoc_participante_evento))
+        em_espera = await session.scalar(select(func.count()).select_from(lista_espera_evento))
+    assert vagas == inscritos == CAPACIDADE
+    assert em_espera == PARTICIPANTES - CAPACIDADE
+
+    # A posição é uma fotografia da fila no momento da resposta
+    posicoes = [r["posicao"] for r in resultados if r["status"] == LISTA_ESPERA]
+    assert all(1 <= posicao <= PARTICIPANTES - CAPACIDADE for posicao in posicoes)
+
+
+async def test_cancelamento_promove_lista_de_espera(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, 1, 3)
+
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        for participante_id in ids:
+            await inscrever_participante(session, evento.id_public, participante_id)
+
+        # Repetir a inscrição não é erro
+        assert (await inscrever_participante(session, evento.id_public, ids[0]))["status"] == JA_INSCRITO
+
+        # O primeiro cancela: o primeiro da fila assume a vaga
+        assert (await cancelar_inscricao(session, evento.id_public, ids[0]))["promovido"]
+        inscritos = (await session.scalars(select(assoc_participante_evento.c.participante_id))).all()
+        assert inscritos == [ids[1]]
+
+        # Sem ninguém na fila, o cancelamento libera a vaga no contador
+        await cancelar_inscricao(session, evento.id_public, ids[2])  # sai da lista de espera
+        assert not (await cancelar_inscricao(session, evento.id_public, ids[1]))["promovido"]
+        assert await session.scalar(select(Evento.vagas_ocupadas).where(Evento.id == evento.id)) == 0
+
+
+async def test_inscricao_rapida_e_idempotente(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, 5, 2)
+
+    comandos = []
+
+    def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+        comandos.append(statement)
+
+    event.listen(engine_arquivo.sync_engine, "before_cursor_execute", conta_comandos)
+    try:
+        async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+            assert (await inscrever_participante(session, evento.id_public, ids[1]))["status"] == INSCRITO
+            # INSERT ... ON CONFLICT (resolve o evento) + UPDATE da vaga; no PostgreSQL é um único comando
+            assert len(comandos) == 2  # noqa: PLR2004
+    finally:
+        event.remove(engine_arquivo.sync_engine, "before_cursor_execute", conta_comandos)
+
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        resposta = await inscrever_idempotente(session, evento.id_public, ids[0], "chave-1")
+        assert resposta["status"] == INSCRITO
+
+    # Reenvio com a mesma chave em outra sessão (ex.: outro worker): mesma resposta, sem nova inscrição
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        assert await inscrever_idempotente(session, evento.id_public, ids[0], "chave-1") == resposta
+
+        # Mesma chave para outro evento é rejeitada
+        with pytest.raises(HTTPException) as erro:
+            await inscrever_idempotente(session, uuid.uuid4(), ids[0], "chave-1")
+        assert erro.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+        # Sem chave, a repetição é identificada como já inscrito
+        assert (await inscrever_idempotente(session, evento.id_public, ids[0], None))["status"] == JA_INSCRITO
+
+        # Erros não são guardados: a chave fica livre para o reenvio
+        with pytest.raises(HTTPException):
+            await inscrever_idempotente(session, uuid.uuid4(), ids[1], "chave-erro")
+        chaves = (await session.scalars(select(inscricoes_idempotentes.c.chave))).all()
+        assert chaves == ["chave-1"]
+
+
+async def test_idempotency_key_em_andamento(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, 5, 1)
+
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        # Chave reservada por uma tentativa em andamento (outro worker)
+        await session.execute(
+            insert(inscricoes_idempotentes).values(
+                participante_id=ids[0],
+                chave="chave-1",
+                id_evento=evento.id_public,
+                expira_em=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=1),
+            )
+        )
+        await session.commit()
+
+        with pytest.raises(HTTPException) as erro:
+            await inscrever_idempotente(session, evento.id_public, ids[0], "chave-1")
+        assert erro.value.status_code == HTTPStatus.CONFLICT
+
+        # Reserva abandonada (expirada): o reenvio executa a inscrição
+        await session.execute(update(inscricoes_idempotentes).values(expira_em=datetime(2000, 1, 1)))
+        await session.commit()
+        assert (await inscrever_idempotente(session, evento.id_public, ids[0], "chave-1"))["status"] == INSCRITO
+
+
+def test_comando_inscricao_postgresql_em_uma_instrucao():
+    sql = " ".join(str(comando_inscricao("postgresql", uuid.uuid4(), 1).compile(dialect=postgresql.dialect())).split())
+    assert sql.startswith("WITH inscricao AS (INSERT INTO assoc_participante_evento")
+    assert "ON CONFLICT DO NOTHING RETURNING" in sql
+    assert "vaga AS (UPDATE eventos SET vagas_ocupadas" in sql
+
+
+async def test_vaga_livre_com_fila_vai_para_o_primeiro_da_fila(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, 1, 4)
+
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        for participante_id in ids[:3]:
+            await inscrever_participante(session, evento.id_public, participante_id)
+
+        async def inscritos():
+            return (
+                await session.scalars(
+                    select(assoc_participante_evento.c.participante_id).order_by(assoc_participante_evento.c.participante_id)
+                )
+            ).all()
+
+        # Vaga livre com a fila cheia (ex.: cancelamento concorrente com uma entrada na fila):
+        # o reenvio do segundo da fila passa a vaga ao primeiro, e não a si mesmo
+        await session.execute(update(Evento).where(Evento.id == evento.id).values(capacidade=2))
+        await session.commit()
+        resposta = await inscrever_participante(session, evento.id_public, ids[2])
+        assert resposta["status"] == LISTA_ESPERA
+        assert resposta["posicao"] == 1
+        assert await inscritos() == ids[:2]
+
+        # Aumento da capacidade: a vaga nova vai para a fila
+        assert (await altera_capacidade(session, evento.id_public, 3))["promovidos"] == 1
+        assert await inscritos() == ids[:3]
+        with pytest.raises(HTTPException) as erro:
+            await altera_capacidade(session, evento.id_public, 2)
+        assert erro.value.status_code == HTTPStatus.CONFLICT
+
+        # Lotado de novo: o recém-chegado entra na fila e assume a próxima vaga liberada
+        assert (await inscrever_participante(session, evento.id_public, ids[3]))["status"] == LISTA_ESPERA
+        assert (await cancelar_inscricao(session, evento.id_public, ids[0]))["promovido"]
+        assert await inscritos() == ids[1:]
+        assert await session.scalar(select(Evento.vagas_ocupadas).where(Evento.id == evento.id)) == 3  # noqa: PLR2004
+        assert await session.scalar(select(func.count()).select_from(lista_espera_evento)) == 0
+
+
+async def test_promocao_de_quem_ja_esta_inscrito_nao_falha(engine_arquivo):
+    evento, ids = await cria_evento_e_participantes(engine_arquivo, 2, 2)
+
+    async with AsyncSession(engine_arquivo, expire_on_commit=False) as session:
+        for participante_id in ids:
+            await inscrever_participante(session, evento.id_public, participante_id)
+        # Dados antigos: inscrito e também na lista de espera
+        await session.execute(insert(lista_espera_evento).values(participante_id=ids[1], evento_id=evento.id))
+        await session.commit()
+
+        # A promoção não duplica a inscrição: a vaga liberada volta ao contador
+        assert not (await cancelar_inscricao(session, evento.id_public, ids[0]))["promovido"]
+        inscritos = (await session.scalars(select(assoc_participante_evento.c.participante_id))).all()
+        assert inscritos == [ids[1]]
+        assert await session.scalar(select(Evento.vagas_ocupadas).where(Evento.id == evento.id)) == 1
+        assert await session.scalar(select(func.count()).select_from(lista_espera_evento)) == 0
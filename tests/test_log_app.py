@@ -0,0 +1,103 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qrcheck.log_app import (
+    EscritorLogAssincrono,
+    LoggerParticipante,
+    RegistroParticipantes,
+    le_registros_msgpack,
+    serializa_registro_json,
+    serializa_registro_msgpack,
+)
+
+REGISTRO = {
+    "ts": 1754438086.469918,
+    "ip": "127.0.0.1",
+    "user": "Não registrado",
+    "method": "GET",
+    "path": "/eventos/",
+    "query": "",
+    "status": 200,
+    "duration_ms": 4.2,
+    "ua_browser": "Chrome 139.0.0",
+    "ua_os": "Windows 10",
+    "ua_device": "PC",
+    "referer": "",
+}
+
+
+def test_escritor_log_grava_em_lotes_e_no_encerramento(tmp_path):
+    caminho = tmp_path / "acessos.log"
+    escritor = EscritorLogAssincrono(str(caminho), tamanho_lote=10, intervalo_flush=60)
+
+    for i in range(25):
+        escritor.escreve(f"linha {i}\n")
+    escritor.encerrar()
+
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    assert linhas == [f"linha {i}" for i in range(25)]
+    assert escritor.get_metricas()["escritas"] == 25  # noqa: PLR2004
+    assert escritor.get_metricas()["lotes"] == 3  # noqa: PLR2004
+
+    # Depois de encerrado, o escritor volta a funcionar no próximo uso
+    escritor.escreve("linha 25\n")
+    escritor.encerrar()
+    assert caminho.read_text(encoding="utf-8").splitlines()[-1] == "linha 25"
+
+
+def test_escritor_log_descarta_com_fila_cheia(tmp_path, monkeypatch):
+    escritor = EscritorLogAssincrono(str(tmp_path / "acessos.log"), max_fila=1)
+    # Sem a thread de gravação a fila não é consumida
+    monkeypatch.setattr(escritor, "_garante_thread", lambda: None)
+
+    for i in range(3):
+        escritor.escreve(f"linha {i}\n")
+
+    assert escritor.get_metricas()["descartadas"] == 2  # noqa: PLR2004
+    assert escritor.get_metricas()["fila"] == 1
+
+
+def test_registro_json_lines():
+    linha = serializa_registro_json(REGISTRO)
+    assert linha.endswith("\n")
+    assert "\n" not in linha[:-1]
+    assert json.loads(linha) == REGISTRO
+
+
+def test_registro_msgpack_prefixado(tmp_path):
+    pytest.importorskip("msgpack")
+    caminho = tmp_path / "acessos.msgpack"
+    escritor = EscritorLogAssincrono(str(caminho), binario=True)
+    for status in (200, 404):
+        escritor.escreve(serializa_registro_msgpack({**REGISTRO, "status": status}))
+    escritor.encerrar()
+
+    registros = list(le_registros_msgpack(str(caminho)))
+    assert [r["status"] for r in registros] == [200, 404]
+    assert registros[0] == REGISTRO
+
+    # Último registro cortado no meio da gravação (ex.: queda do processo): ignorado
+    completo = caminho.read_bytes()
+    for corte in (2, 10):
+        caminho.write_bytes(completo + serializa_registro_msgpack(REGISTRO)[:corte])
+        assert [r["status"] for r in le_registros_msgpack(str(caminho))] == [200, 404]
+
+
+def test_registro_participantes_lru_de_arquivos(tmp_path):
+    registro = RegistroParticipantes(log_dir=str(tmp_path), max_arquivos=2)
+
+    def escreve(i):
+        LoggerParticipante(registro, i % 3).info(f"mensagem {i}")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(escreve, range(30)))
+
+    assert len(registro._arquivos) == 2  # noqa: PLR2004
+    registro.encerrar()
+
+    for participante_id in range(3):
+        linhas = (tmp_path / f"participante_{participante_id}_registry.log").read_text(encoding="utf-8").splitlines()
+        assert len(linhas) == 10  # noqa: PLR2004
+        assert all(linha.split(" | ")[1].strip() == "INFO" for linha in linhas)
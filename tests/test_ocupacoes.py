@@ -1,8 +1,13 @@
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from qrcheck.app import app
+from qrcheck.models.AdministradorModels import Administrador
 from qrcheck.models.ParticipanteModels import Ocupacao
+from qrcheck.security import get_current_user
 
 pytestmark = pytest.mark.asyncio
 
@@ -26,6 +31,49 @@ async def test_lista_ocupacoes(client: TestClient, session: AsyncSession):
     assert any(ocupacao["nome"] == "Designer" for ocupacao in data)
 
 
+@pytest.fixture
+def admin_override():
+    admin = Administrador(id=uuid.uuid4(), nome="Admin", email="admin.catalogo@teste.com", senha="hash", data_criacao=None)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    yield admin
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+# As escritas dos routers invalidam o catálogo em cache: o ETag antigo deixa de valer (sem 304)
+@pytest.mark.parametrize("prefixo", ["/ocupacoes", "/necessidades"])
+async def test_lista_catalogo_etag_muda_com_as_escritas(client: TestClient, admin_override, prefixo: str):
+    HTTP_OK = 200
+    HTTP_NOT_MODIFIED = 304
+
+    def lista(etag):
+        response = client.get(f"{prefixo}/listar", headers={"If-None-Match": etag})
+        assert response.status_code == HTTP_OK
+        assert response.headers["etag"] != etag
+        return response.headers["etag"], {item["nome"] for item in response.json()}
+
+    response = client.get(f"{prefixo}/listar")
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    # Mesma versão do catálogo: 304 sem corpo
+    response = client.get(f"{prefixo}/listar", headers={"If-None-Match": etag})
+    assert response.status_code == HTTP_NOT_MODIFIED
+    assert response.content == b""
+
+    item_id = client.post(f"{prefixo}/cadastrar", json={"nome": "Item ETag"}).json()["id"]
+    etag, nomes = lista(etag)
+    assert "Item ETag" in nomes
+
+    client.put(f"{prefixo}/atualizar/{item_id}", json={"nome": "Item ETag Atualizado"})
+    etag, nomes = lista(etag)
+    assert "Item ETag Atualizado" in nomes
+    assert "Item ETag" not in nomes
+
+    client.delete(f"{prefixo}/deletar/{item_id}")
+    _, nomes = lista(etag)
+    assert "Item ETag Atualizado" not in nomes
+
+
 async def test_acessa_ocupacao(client: TestClient, session: AsyncSession):
     # Criar uma ocupação de teste
     ocupacao = Ocupacao(nome="Teste Acesso")
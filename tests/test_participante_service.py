@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.constants import IdsImportantes
+from qrcheck.models.ParticipanteModels import NecessidadeEspecifica, Ocupacao
+from qrcheck.services.participante_service import processa_necessidades_especificas
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_ids_importantes_cache(session: AsyncSession):
+    cache = IdsImportantes()
+
+    # Sem o catálogo populado, nada é armazenado e a busca é refeita no próximo acesso
+    assert await cache.get_id_ocupacao_outro(session) is None
+
+    ocupacao = Ocupacao(nome="Outra")
+    necessidade = NecessidadeEspecifica(nome="Outra(s)")
+    session.add_all([ocupacao, necessidade])
+    await session.commit()
+
+    assert await cache.get_id_ocupacao_outro(session) == ocupacao.id
+    assert await cache.get_id_necessidade_outro(session) == necessidade.id
+
+    # Com o valor em cache, a remoção só é percebida após a invalidação
+    await session.execute(delete(Ocupacao).where(Ocupacao.id == ocupacao.id))
+    await session.execute(delete(NecessidadeEspecifica).where(NecessidadeEspecifica.id == necessidade.id))
+    await session.commit()
+    assert await cache.get_id_ocupacao_outro(session) == ocupacao.id
+
+    cache.invalidar()
+    assert await cache.get_id_ocupacao_outro(session) is None
+
+
+async def test_processa_necessidades_consultas_constantes(session: AsyncSession):
+    padroes = [NecessidadeEspecifica(nome=f"Necessidade Padrão {i}") for i in range(8)]
+    personalizada = NecessidadeEspecifica(nome="Cão Guia Existente", is_custom=True)
+    session.add_all([*padroes, personalizada])
+    await session.commit()
+
+    participante = SimpleNamespace(
+        necessidades_especificas=[n.id for n in padroes],
+        necessidades_personalizadas=["cão guia existente", "leitor de tela", "Leitor de Tela", "necessidade padrão 0"],
+    )
+
+    comandos = []
+
+    def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+        comandos.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", conta_comandos)
+    try:
+        necessidades_ids = await processa_necessidades_especificas(participante, session)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", conta_comandos)
+
+    nova = await session.scalar(select(NecessidadeEspecifica).where(NecessidadeEspecifica.nome == "Leitor de Tela"))
+    assert nova.is_custom
+    assert necessidades_ids == [n.id for n in padroes] + [personalizada.id, nova.id]
+    # "Outra(s)" (cache) + IDs (IN) + nomes (IN) + INSERT das novas, independente da quantidade de necessidades
+    assert len(comandos) <= 4  # noqa: PLR2004
+    await session.rollback()
+
+
+async def test_processa_necessidades_id_inexistente(session: AsyncSession):
+    participante = SimpleNamespace(necessidades_especificas=[999999], necessidades_personalizadas=[])
+    with pytest.raises(HTTPException):
+        await processa_necessidades_especificas(participante, session)
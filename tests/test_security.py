@@ -0,0 +1,97 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from qrcheck.models.AdministradorModels import Administrador
+from qrcheck.models.ParticipanteModels import Ocupacao, Participante
+from qrcheck.security import cache_principais, cria_token_acesso, get_current_user, invalida_principal
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_current_user_cache(session: AsyncSession):
+    ocupacao = Ocupacao(nome="Ocupação Cache")
+    session.add(ocupacao)
+    await session.flush()
+    participante = Participante(
+        id_public=uuid.uuid4(),
+        nome="Cache",
+        sobrenome="Teste",
+        cpf="81234567890",
+        email="cache@teste.com",
+        senha="hash",
+        data_nasc=date(1990, 1, 1),
+        ocupacao_id=ocupacao.id,
+        data_criacao=None,
+    )
+    session.add(participante)
+    await session.commit()
+
+    cache_principais.limpa()
+    token = cria_token_acesso(data={"sub": str(participante.id_public), "is_admin": False})
+
+    comandos = []
+
+    def conta_comandos(conn, cursor, statement, parameters, context, executemany):  # noqa: PLR0913, PLR0917
+        comandos.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", conta_comandos)
+    try:
+        user = await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)
+        assert user.id_public == participante.id_public
+        assert len(comandos) == 1
+
+        # Segunda requisição com o mesmo token: sem consulta ao banco, com um objeto próprio
+        em_cache = await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)
+        assert len(comandos) == 1
+        assert em_cache is not user
+        assert isinstance(em_cache, Participante)
+        assert (em_cache.id, em_cache.id_public, em_cache.email) == (user.id, user.id_public, user.email)
+
+        # Após a invalidação, o usuário é buscado novamente
+        invalida_principal(participante.id_public)
+        await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)
+        assert len(comandos) == 2  # noqa: PLR2004
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", conta_comandos)
+        cache_principais.limpa()
+
+
+async def test_exclusao_revoga_token_ainda_valido(session: AsyncSession):
+    administrador = Administrador(
+        id=uuid.uuid4(), nome="Admin Excluído", email="excluido@teste.com", senha="hash", data_criacao=None
+    )
+    session.add(administrador)
+    await session.commit()
+
+    cache_principais.limpa()
+    token = cria_token_acesso(data={"sub": str(administrador.id), "is_admin": True})
+    try:
+        assert (await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)).id == administrador.id
+
+        # Excluído pelo ORM: o token (ainda não expirado) deixa de autenticar, sem esperar o TTL do cache
+        await session.delete(administrador)
+        await session.commit()
+        with pytest.raises(HTTPException):
+            await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)
+    finally:
+        cache_principais.limpa()
+
+
+async def test_get_current_user_admin_inexistente(session: AsyncSession):
+    token = cria_token_acesso(data={"sub": str(uuid.uuid4()), "is_admin": True})
+    with pytest.raises(HTTPException):
+        await get_current_user(SimpleNamespace(state=SimpleNamespace()), session, token)
+
+
+async def test_get_current_user_reaproveita_claims_do_middleware(session: AsyncSession):
+    # Token decodificado pelo middleware como expirado/inválido: não é decodificado de novo
+    request = SimpleNamespace(state=SimpleNamespace(token="token", token_payload=None, token_erro="Token expirado"))
+    with pytest.raises(HTTPException):
+        await get_current_user(request, session, "token")
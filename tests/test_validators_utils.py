@@ -0,0 +1,44 @@
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from qrcheck.utils.validators_utils import validar_cpf_util, validar_cpfs_em_lote
+
+
+def valida_um(cpf: str) -> bool:
+    try:
+        validar_cpf_util(cpf)
+    except HTTPException:
+        return False
+    return True
+
+
+def test_validar_cpfs_em_lote_igual_ao_validador_individual():
+    pytest.importorskip("numpy")
+    aleatorio = random.Random(42)
+    cpfs = [
+        "529.982.247-25",  # válido com pontuação
+        "52998224724",  # dígito verificador errado
+        "11111111111",  # dígitos repetidos
+        "00000000000",
+        "123",
+        "529982247250",  # 12 dígitos
+        "",
+        "abc.def.ghi-jk",
+    ]
+    # CPFs aleatórios: alguns com os dígitos verificadores corretos, outros não
+    for _ in range(2000):
+        base = "".join(aleatorio.choice("0123456789") for _ in range(9))
+        for peso_inicial in (10, 11):
+            soma = sum(int(d) * p for d, p in zip(base, range(peso_inicial, 1, -1)))
+            base += str(soma * 10 % 11 % 10)
+        cpfs.append(base if aleatorio.random() < 0.5 else base[:-1] + str((int(base[-1]) + 1) % 10))  # noqa: PLR2004
+
+    mascara, digitos = validar_cpfs_em_lote(cpfs)
+    assert mascara.tolist() == [valida_um(cpf) for cpf in cpfs]
+    assert digitos[0] == "52998224725"
+    assert 800 < mascara.sum() < 1200  # noqa: PLR2004
+
+    mascara, digitos = validar_cpfs_em_lote([])
+    assert mascara.shape == digitos.shape == (0,)